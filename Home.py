@@ -1,25 +1,27 @@
 import streamlit as st
-import pandas as pd
 import os
-import json
-import plotly.express as px
-import plotly.graph_objects as go
+import pandas as pd
+from utils.tracker_store import init_store, count_applications, query_applications
+from utils.tracker_cache import load_tracker_summaries
+from utils.dashboard_figures import dashboard_figure
+from utils.tracker_view import view_controls, pager
+from utils.cover_letter import common_info_file
+from utils import file_store
+from utils.tenants import require_tenant
+
+# Every file below belongs to the signed-in user (see utils/tenants.py)
+require_tenant()
 
 # ========== 🛠 Setup Paths ==========
-DATA_DIR = "data"
-TRACKER_FILE = os.path.join(DATA_DIR, "application_tracker.csv")
-INFO_FILE = os.path.join(DATA_DIR, "common_info.json")
+INFO_FILE = common_info_file()
 
 # ========== 📂 Ensure Files Exist ==========
-os.makedirs(DATA_DIR, exist_ok=True)
-
 if not os.path.exists(INFO_FILE):
-    with open(INFO_FILE, "w") as f:
-        json.dump({}, f, indent=2)
+    # Under the file's lock, so info saved meanwhile by another session is kept
+    file_store.update_json(INFO_FILE, lambda info: info, default={})
 
-if not os.path.exists(TRACKER_FILE):
-    # Create an empty CSV with appropriate columns
-    pd.DataFrame(columns=["Date", "Position", "Company", "Status", "Notes"]).to_csv(TRACKER_FILE, index=False)
+# Create the tracker database (imports an existing CSV tracker once)
+init_store()
 
 # ========== 🖼️ Streamlit UI ==========
 st.set_page_config(page_title="Job Hunt Home", layout="wide")
@@ -60,6 +62,8 @@ You can:
 - Generate customized cover letters using AI
 - Tailor them with your personal info and job details
 - Save or copy generated letters for your applications
+- Generate letters for many job postings at once on the **Batch Cover Letters** page
+- Find any earlier letter or job description on the **Search Cover Letters** page
 """)
 
 st.markdown("#### 4. 📑 Track Job Applications")
@@ -80,38 +84,24 @@ As you log more applications, this dashboard will update with visual charts to h
 """)
 
 # ========== 📊 Application Status ==========
-df = pd.read_csv(TRACKER_FILE)
+status_counts = load_tracker_summaries()["status"]
 
-if not df.empty:
+if not status_counts.empty:
     st.subheader("📊 Current Application Status Overview")
 
-    status_counts = df["Status"].value_counts().reset_index()
-    status_counts.columns = ["Status", "Count"]
-
-    fig = px.pie(
-        status_counts,
-        names="Status",
-        values="Count",
-        title="Applications by Status",
-        hole=0.4,
-    )
-    fig.update_traces(textinfo='label+value')
-
-    fig.add_annotation(
-        dict(
-            text=f"<b>{status_counts['Count'].sum()}</b><br>Total",
-            x=0.5,
-            y=0.5,
-            font_size=20,
-            showarrow=False,
-            font=dict(color="black"),
-            bgcolor="white",
-        )
-    )
-
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(dashboard_figure("status_pie"), use_container_width=True)
     with st.expander("📋 View Recent Applications"):
-        st.dataframe(df.sort_values("Date", ascending=False), use_container_width=True)
+        # Only the visible page is read and sent to the browser
+        filters, sort_column, descending, page_size, _ = view_controls("home")
+        offset = pager("home", count_applications(filters), page_size)
+        df = query_applications(filters, sort_column, descending, offset, page_size)
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce", format="%Y-%m-%d")
+        st.dataframe(
+            df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={"Date": st.column_config.DateColumn(format="YYYY-MM-DD")},
+        )
 else:
     st.info("No applications tracked yet. Head to **'Application Tracker'** to get started.")
 
@@ -1,19 +1,19 @@
 import streamlit as st
-import json
-import os
 from datetime import datetime
+from utils import file_store
+from utils.cover_letter import common_info_file
+from utils.tenants import require_tenant
 
-INFO_FILE = "data/common_info.json"
+require_tenant()
+INFO_FILE = common_info_file()
 
 def load_info():
-    if os.path.exists(INFO_FILE):
-        with open(INFO_FILE, "r") as f:
-            return json.load(f)
-    return {}
+    return file_store.read_json(INFO_FILE, {})
 
+# Written to a temporary file and renamed, so a crash or a second session
+# saving at the same time never leaves a half-written file
 def save_info(info):
-    with open(INFO_FILE, "w") as f:
-        json.dump(info, f, indent=2)
+    file_store.write_json(INFO_FILE, info)
 
 def parse_date(date_str):
     try:
@@ -1,39 +1,74 @@
 import streamlit as st
-import os
-
-RESUME_FOLDER = "resumes"
-os.makedirs(RESUME_FOLDER, exist_ok=True)
+import datetime
+from utils import resume_store
+from utils.tenants import require_tenant
 
+require_tenant()
 st.title("📤 Manage Uploaded Resumes")
 
 uploaded_file = st.file_uploader("Upload Resume (PDF)", type=["pdf"])
 
+# The uploader returns the same file on every rerun; store each upload once.
+# Text extraction runs in the background (see utils/resume_store.py).
 if uploaded_file is not None:
-    save_path = os.path.join(RESUME_FOLDER, uploaded_file.name)
-    with open(save_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
-    st.success(f"Saved resume: {uploaded_file.name}")
+    if st.session_state.get("saved_upload", {}).get("file_id") != uploaded_file.file_id:
+        entry, duplicate = resume_store.save_upload(uploaded_file)
+        st.session_state["saved_upload"] = {"file_id": uploaded_file.file_id, "name": entry["name"], "duplicate": duplicate}
+    saved = st.session_state["saved_upload"]
+    if saved["duplicate"]:
+        st.info(f"'{uploaded_file.name}' is identical to the stored resume '{saved['name']}'; nothing was added.")
+    elif saved["name"] != uploaded_file.name:
+        st.success(f"Saved resume as {saved['name']} (a different file named {uploaded_file.name} already exists).")
+    else:
+        st.success(f"Saved resume: {saved['name']}")
 
 st.markdown("---")
 st.subheader("Your Uploaded Resumes")
 
-resume_files = os.listdir(RESUME_FOLDER)
-if not resume_files:
-    st.info("No resumes uploaded yet.")
-else:
-    resume_to_delete = None
 
-    for resume_name in resume_files:
+def describe(entry):
+    parts = [f"{entry['size'] / 1024:,.0f} KB"]
+    if entry["pages"]:
+        parts.append(f"{entry['pages']} page{'s' if entry['pages'] != 1 else ''}")
+    parts.append(f"uploaded {datetime.datetime.fromtimestamp(entry['uploaded_at']):%Y-%m-%d %H:%M}")
+    if entry["status"] == "processing":
+        parts.append("⏳ extracting text...")
+    elif entry["status"] == "failed":
+        parts.append(f"❌ could not read the PDF: {entry['error']}")
+    elif "digest_tokens" in entry:
+        parts.append(f"prompt digest ~{entry['digest_tokens']} tokens (full text ~{entry['text_tokens']})")
+    elif "text_tokens" in entry:
+        parts.append(f"~{entry['text_tokens']} tokens")
+    parts.append(f"SHA-256 {entry['sha256'][:12]}")
+    return " · ".join(parts)
+
+
+def any_processing(resumes):
+    return any(entry["status"] == "processing" for entry in resumes)
+
+
+# Refresh the listing every second while text is being extracted
+polling = any_processing(resume_store.list_resumes())
+
+@st.fragment(run_every=1.0 if polling else None)
+def show_resumes():
+    resumes = resume_store.list_resumes()
+    if not resumes:
+        st.info("No resumes uploaded yet.")
+        return
+
+    resume_to_delete = None
+    for entry in resumes:
+        resume_name = entry["name"]
         col1, col2, col3 = st.columns([6, 1, 1])
         with col1:
             st.write(resume_name)
+            st.caption(describe(entry))
         with col2:
-            pdf_path = os.path.join(RESUME_FOLDER, resume_name)
-            with open(pdf_path, "rb") as pdf_file:
-                pdf_bytes = pdf_file.read()
+            # The PDF is read only when the button is clicked
             st.download_button(
                 label="View",
-                data=pdf_bytes,
+                data=resume_store.reader(resume_name),
                 file_name=resume_name,
                 mime="application/pdf",
                 key=f"download_{resume_name}"
@@ -43,5 +78,11 @@ else:
                 resume_to_delete = resume_name
 
     if resume_to_delete:
-        os.remove(os.path.join(RESUME_FOLDER, resume_to_delete))
-        st.info(f"Resume '{resume_to_delete}' deleted. Please refresh the page.")
+        resume_store.delete_resume(resume_to_delete)
+        st.rerun()
+
+    if polling and not any_processing(resumes):
+        st.rerun()  # everything processed, rerun once without polling
+
+
+show_resumes()
@@ -1,34 +1,42 @@
 import streamlit as st
 import os
-import re
-from openai import OpenAI
-from dotenv import load_dotenv
-import PyPDF2
 import datetime
-from fpdf import FPDF
+from dotenv import load_dotenv
 
-import json
+from utils import jobs
+from utils.tenants import require_tenant
+from utils.resume_cache import resume_folder
+from utils.llm_backend import get_backend
+from utils.cover_letter import (
+    common_info_file,
+    output_folder,
+    load_user_info,
+    extract_title_and_company,
+    create_job_folder,
+    finalize_partial,
+    max_letter_pages,
+)
+from utils.pdf_renderer import load_template, LINE_HEIGHT
+
+require_tenant()
 
 # Load user info from common_info.json
-COMMON_INFO_FILE = "data/common_info.json"
-if not os.path.exists(COMMON_INFO_FILE):
-    st.error(f"Missing `{COMMON_INFO_FILE}`. Please create it with required fields.")
+if not os.path.exists(common_info_file()):
+    st.error(f"Missing `{common_info_file()}`. Please create it with required fields.")
     st.stop()
 
-with open(COMMON_INFO_FILE, "r", encoding="utf-8") as f:
-    common_info = json.load(f)
-
-USER_FIRST_NAME = common_info.get("first_name", "").strip()
-USER_LAST_NAME = common_info.get("last_name", "").strip()
-USER_NAME = f"{USER_FIRST_NAME} {USER_LAST_NAME}".strip()
-USER_EMAIL = common_info.get("email", "").strip()
-USER_WEBSITE = common_info.get("link", "").strip()
+user = load_user_info()
+USER_NAME = user["name"]
+USER_EMAIL = user["email"]
+USER_WEBSITE = user["website"]
 
 # Load .env variables
 load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+# Read from .env each run so a key or backend saved on the settings page is picked up
+backend = get_backend()
+backend_ready, _ = backend.check()
 
-if not api_key:
+if not backend_ready:
     st.warning(
         """
         ⚠️ **OpenAI API Key Required**  
@@ -37,6 +45,8 @@ if not api_key:
         """
     )
     st.stop()  # Stop app if no API key
+elif backend.name != "openai":
+    st.info(f"🧪 Using {backend.describe()}. No OpenAI credits are used.")
 else:
     st.info(
         """
@@ -66,27 +76,18 @@ else:
     
     
 
-openai = OpenAI(api_key=api_key)
-
 # Folder where resumes are saved
-RESUME_FOLDER = "resumes"
+RESUME_FOLDER = resume_folder()
 os.makedirs(RESUME_FOLDER, exist_ok=True)
 
 # Base folder to save cover letters + job descriptions
-BASE_OUTPUT_FOLDER = "cover_letters"
-os.makedirs(BASE_OUTPUT_FOLDER, exist_ok=True)
+os.makedirs(output_folder(), exist_ok=True)
 
 # Streamlit Page Setup
 st.set_page_config(page_title="Cover Letter Generator", layout="wide")
 st.title("📄 AI Cover Letter Generator")
 
 
-
-# Combine name for use in the letter
-USER_NAME = f"{USER_FIRST_NAME.strip()} {USER_LAST_NAME.strip()}".strip()
-
-
-
 # List resumes in resumes folder
 resume_files = [f for f in os.listdir(RESUME_FOLDER) if f.lower().endswith(".pdf")]
 if not resume_files:
@@ -104,27 +105,30 @@ explicit_company = st.text_input("Company Name (leave empty to auto-extract)")
 # Text area for pasting job description
 job_description_text = st.text_area("Paste Job Description Here")
 
-# Function to extract PDF text
-def extract_text_from_pdf(file_path):
-    with open(file_path, "rb") as f:
-        reader = PyPDF2.PdfReader(f)
-        return "\n".join(page.extract_text() or "" for page in reader.pages)
+stream_output = st.checkbox("Stream the cover letter as it is generated", value=True)
+force_regenerate = st.checkbox(
+    "Force regenerate",
+    help="Identical requests (same resume, job description, title, company and model) are served from the local cache. Tick this to make a new API call instead."
+)
+
+# Jobs submitted from this session, newest first
+if "cover_letter_jobs" not in st.session_state:
+    st.session_state["cover_letter_jobs"] = []
 
-# Extract info from job description text
-def extract_title_and_company(job_description):
-    title_match = re.search(r'(?i)(Position|Title|Job Title)[:\s]*(.*)', job_description)
-    company_match = re.search(r'(?i)(Company|Organization)[:\s]*(.*)', job_description)
+def submit_job(payload):
+    job_id = jobs.submit("cover_letter", payload)
+    st.session_state["cover_letter_jobs"].insert(0, job_id)
+    return job_id
 
-    title = title_match.group(2).strip() if title_match else "Unknown_Position"
-    company = company_match.group(2).strip() if company_match else "Unknown_Company"
-    return title, company
+# Create the job folder and queue the generation job
+def start_generation(request):
+    session_folder = create_job_folder(request["company"], request["title"], request["job_description"])
+    job_desc_path = os.path.join(session_folder, "job_description.txt")
+    st.success(f"Job description saved to `{job_desc_path}`")
 
-# Sanitize strings for folder/file names
-def sanitize_filename(s):
-    s = s.lower()
-    s = re.sub(r'\s+', '_', s)
-    s = re.sub(r'[^\w\-]', '', s)  # remove everything except letters, digits, underscore, hyphen
-    return s
+    # Generation runs in the background; the page stays usable meanwhile
+    job_id = submit_job(dict(request, folder=session_folder))
+    st.info(f"🕒 Cover letter job `{job_id[:8]}` queued. You can keep working or switch pages, it keeps running.")
 
 # Button to generate cover letter
 if st.button("Generate Cover Letter"):
@@ -132,142 +136,177 @@ if st.button("Generate Cover Letter"):
         st.error("Please select a resume and paste the job description.")
     else:
         # Extract or override title and company first (to build folder name)
-        if explicit_title.strip():
-            title = explicit_title.strip()
-        else:
-            title, _ = extract_title_and_company(job_description_text)
-
-        if explicit_company.strip():
-            company = explicit_company.strip()
+        parsed_title, parsed_company = extract_title_and_company(job_description_text)
+        title = explicit_title.strip() or parsed_title
+        company = explicit_company.strip() or parsed_company
+
+        request = {
+            "resume_path": os.path.join(RESUME_FOLDER, selected_resume),
+            "job_description": job_description_text,
+            "title": title,
+            "company": company,
+            "stream": stream_output,
+            "force_regenerate": force_regenerate,
+        }
+
+        # A posting seen before (reposted or lightly edited) is flagged before
+        # any API call is made
+        from utils.near_duplicates import find_duplicates
+
+        matches = [] if force_regenerate else find_duplicates(job_description_text, company, title)
+        if matches:
+            st.session_state["duplicate_check"] = {"request": request, "matches": matches}
         else:
-            _, company = extract_title_and_company(job_description_text)
-
-        # Sanitize company and title for safe folder naming
-        safe_company = sanitize_filename(company)
-        safe_title = sanitize_filename(title)
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-
-        folder_name = f"{safe_company}_{safe_title}_{timestamp}"
-        session_folder = os.path.join(BASE_OUTPUT_FOLDER, folder_name)
-        os.makedirs(session_folder, exist_ok=True)
-
-        # Save the pasted job description
-        job_desc_path = os.path.join(session_folder, "job_description.txt")
-        with open(job_desc_path, "w", encoding="utf-8") as f:
-            f.write(job_description_text)
-
-        st.success(f"Job description saved to `{job_desc_path}`")
-
-        # Extract text from selected resume PDF
-        resume_path = os.path.join(RESUME_FOLDER, selected_resume)
-        resume_text = extract_text_from_pdf(resume_path)
-
-        # Prepare prompt
-        role_description = (
-            f"You are a cover letter generator with 20 years of experience. "
-            f"Your task is to create a professional and concise cover letter body only, starting with the salutation (e.g., 'Dear Hiring Committee,') and ending before the signature or any closing formalities. "
-            f"Do NOT include your name, contact information, date, enclosure lines, or signature. "
-            f"Focus only on the core letter content tailored for the position of '{title}' at '{company}'."
+            st.session_state.pop("duplicate_check", None)
+            start_generation(request)
+
+STATUS_ICONS = {"queued": "🕒", "running": "⏳", "done": "✅", "failed": "❌"}
+
+# PDF bytes rendered in memory; the header part of the key picks up
+# changes to common_info.json, the date a letter downloaded after midnight
+@st.cache_data(max_entries=20, show_spinner=False)
+def render_pdf(cover_letter, company, header, line_height, date):
+    return load_template().render(cover_letter, company, date=date, line_height=line_height)
+
+# Show the letter, PDF download and text for a finished job
+def show_result(job):
+    result = job["result"]
+    company = job["payload"]["company"]
+    if result["cached"]:
+        st.info("♻️ Loaded an identical earlier result from the cache. Tick **Force regenerate** for a fresh letter.")
+    if "pages" in result:
+        st.caption(
+            f"{result['pages']} page(s) · {result['api_calls']} API round-trip(s) · "
+            f"{result['render_passes']} render pass(es)"
         )
+    if result.get("line_height", LINE_HEIGHT) != LINE_HEIGHT:
+        st.caption("Line spacing was tightened to keep the letter within the page limit.")
+
+    # ---- Show PDF download button ----
+    template = load_template()
+    st.download_button(
+        label="📄 Download Final Cover Letter PDF",
+        data=render_pdf(result["cover_letter"], company, tuple(template.header), result.get("line_height", LINE_HEIGHT), datetime.date.today()),
+        file_name=template.pdf_filename(company),
+        mime="application/pdf",
+        key=f"download_{job['id']}"
+    )
 
-        structure = (
-            "To compose a compelling cover letter, scrutinize the job description for key qualifications. "
-            "Begin with a succinct introduction about the candidate's identity and career goals. "
-            "Highlight skills aligned with the job, underpinned by tangible examples. "
-            "Incorporate details about the company, emphasizing its mission or unique aspects that align with the candidate's values. "
-            "Conclude by reaffirming the candidate's suitability, inviting further discussion. "
-            "Do not make anything up, but feel free to use neighboring examples based on my resume. "
-            "Use job-specific terminology and maintain a professional style suitable for the job role. "
-            "Please provide your response in under 250 words."
-        )
-
-        content = f"{role_description}\n\n{structure}\n\nJob Description:\n{job_description_text}\n\nResume:\n{resume_text}"
-
-        # Call OpenAI
-        response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": role_description},
-                   {"role": "user", "content": content + "\n\nPlease do NOT include any placeholders like '[Your Name]' or signature lines."}
-                
-            ]
+    # Display generated cover letter
+    st.markdown ("You can manually edit and copy the text below if needed.")
+    st.text_area("Cover Letter", result["cover_letter"], height=300, key=f"letter_{job['id']}")
+
+# A failed job keeps the text received so far, offer to continue or use it
+def show_failure(job):
+    payload = job["payload"]
+    st.error(f"Cover letter generation failed: {job['error']}")
+    if not job["partial"]:
+        return
+
+    st.warning("⚠️ The partial letter below was saved and can be continued or used as-is.")
+    st.text_area("Partial Cover Letter", job["partial"], height=200, disabled=True, key=f"partial_{job['id']}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("▶️ Continue Generating", key=f"continue_{job['id']}"):
+            submit_job(dict(payload, prefix=job["partial"]))
+            jobs.delete_job(job["id"])
+            st.rerun()
+    with col2:
+        if st.button("✅ Use Partial Letter", key=f"use_{job['id']}"):
+            pdf_path = finalize_partial(payload["folder"], payload["company"], job["partial"])
+            jobs.resolve_failed_job(job["id"], {
+                "folder": payload["folder"],
+                "pdf_path": pdf_path,
+                "cover_letter": job["partial"],
+                "cached": False,
+            })
+            st.rerun(scope="fragment")
+
+def load_session_jobs():
+    return jobs.list_jobs("cover_letter", job_ids=st.session_state["cover_letter_jobs"], limit=5)
+
+def any_active(job_list):
+    return any(job["status"] in ("queued", "running") for job in job_list)
+
+# Near-duplicate warning: reuse the earlier letter or generate anyway
+def set_duplicate_action(action):
+    st.session_state["duplicate_action"] = action
+
+def show_duplicate_check(check):
+    request = check["request"]
+    st.warning("⚠️ This posting looks like one you have seen before:")
+    for match in check["matches"]:
+        where = "cover letter archive" if match["source"] == "archive" else "application tracker"
+        st.markdown(f"- **{match['label']}** ({where}, {match['similarity']:.0%} similar)")
+
+    previous = [
+        m["key"] for m in check["matches"]
+        if m["source"] == "archive" and os.path.exists(os.path.join(m["key"], "cover_letter.txt"))
+    ]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if previous and st.button("♻️ Reuse Previous Letter"):
+            check["reuse"] = previous[0]
+    with col2:
+        st.button("✍️ Generate Anyway", on_click=set_duplicate_action, args=("generate",))
+    with col3:
+        st.button("Dismiss", on_click=set_duplicate_action, args=("dismiss",))
+
+    if check.get("reuse"):
+        with open(os.path.join(check["reuse"], "cover_letter.txt"), "r", encoding="utf-8") as f:
+            cover_letter = f.read()
+        template = load_template()
+        st.caption(f"Reusing the letter from `{check['reuse']}` (no API call).")
+        st.download_button(
+            label="📄 Download Cover Letter PDF",
+            data=render_pdf(cover_letter, request["company"], tuple(template.header), LINE_HEIGHT, datetime.date.today()),
+            file_name=template.pdf_filename(request["company"]),
+            mime="application/pdf",
+            key="download_reused"
         )
-        cover_letter = response.choices[0].message.content
-
-        # Save generated cover letter in same folder
-        cover_letter_path = os.path.join(session_folder, "cover_letter.txt")
-        with open(cover_letter_path, "w", encoding="utf-8") as f:
-            f.write(cover_letter)
-            
-            # ---- USER INFO (EDIT TO MATCH YOURS) TODO ADD PULL FROM COMMON INFORMATION----
-            ##USER_NAME = "John Doe" 
-            #USER_EMAIL = ""
-            #USER_WEBSITE = ""
-
-
-            def generate_pdf(cover_letter_body, output_path, company, title):
-                pdf = FPDF()
-                pdf.add_page()
-                pdf.set_auto_page_break(auto=True, margin=15)
-
-                # Header
-                pdf.set_font("Times", size=12)
-                today = datetime.datetime.now().strftime("%B %d, %Y")
-                if USER_EMAIL:
-                    pdf.cell(0, 10, USER_NAME, ln=True)
-                if USER_EMAIL:
-                    pdf.cell(0, 10, USER_EMAIL, ln=True)
-                if USER_WEBSITE:
-                    pdf.set_text_color(0, 0, 255)
-                    pdf.set_font("Times", size=12, style='U')  # Specify family, size, and underline style
-                    pdf.write(10, USER_WEBSITE, USER_WEBSITE)  # clickable link
-                    pdf.set_text_color(0, 0, 0)                # reset color
-                    pdf.set_font("Times", size=12, style='')  # reset font style to normal
-                    pdf.ln(10)
-                pdf.cell(0, 10, today, ln=True)
-                pdf.cell(0, 10, company, ln=True)
-                pdf.ln(10)
-
-                # Body
-                pdf.set_font("Times", size=12)
-                for paragraph in cover_letter_body.split('\n'):
-                    if paragraph.strip() != "":
-                        pdf.multi_cell(0, 10, paragraph.strip())
-                        pdf.ln(1)
-
-                # Footer / Signature
-                pdf.cell(0, 10, USER_NAME, ln=True)
-
-                pdf.output(output_path)
-
-            # ---- Create PDF path ----
-            safe_user = sanitize_filename(USER_NAME)
-            pdf_filename = f"{safe_user}_{safe_company}_cover_letter.pdf"
-            pdf_path = os.path.join(session_folder, pdf_filename)
-
-            # ---- Generate PDF ----
-            generate_pdf(cover_letter, pdf_path, company, title)
-
-            # ---- Show PDF download button ----
-            with open(pdf_path, "rb") as f:
-                st.download_button(
-                    label="📄 Download Final Cover Letter PDF",
-                    data=f,
-                    file_name=pdf_filename,
-                    mime="application/pdf"
-                )
-        
-        st.markdown ("---")
-
-        # Display generated cover letter
-        st.subheader("📨 Generated Cover Letter")
-        st.markdown ("You can manually edit and copy the text below if needed.")
-        st.text_area("Cover Letter", cover_letter, height=300)
-
-
-st.warning(
-        """
-        If PDF cover letter is more than 2 pages please re-generate until desired result is created.
-        """
-    )
+        st.text_area("Cover Letter", cover_letter, height=300, key="letter_reused")
+
+duplicate_action = st.session_state.pop("duplicate_action", None)
+if duplicate_action and "duplicate_check" in st.session_state:
+    check = st.session_state.pop("duplicate_check")
+    if duplicate_action == "generate":
+        start_generation(check["request"])
+
+if "duplicate_check" in st.session_state:
+    show_duplicate_check(st.session_state["duplicate_check"])
+
+# Refresh the job list every second while something is queued or running
+polling = any_active(load_session_jobs())
+
+@st.fragment(run_every=1.0 if polling else None)
+def show_jobs():
+    session_jobs = load_session_jobs()
+    if not session_jobs:
+        return
+
+    st.markdown ("---")
+    st.subheader("📨 Generated Cover Letters")
+    for i, job in enumerate(session_jobs):
+        payload = job["payload"]
+        label = f"{STATUS_ICONS[job['status']]} {payload['company']} – {payload['title']} ({job['status']})"
+        with st.expander(label, expanded=(i == 0)):
+            if job["status"] == "done":
+                show_result(job)
+            elif job["status"] == "failed":
+                show_failure(job)
+            elif job["partial"]:
+                st.markdown(job["partial"])
+            else:
+                st.caption("Waiting for the first tokens...")
+
+    if polling and not any_active(session_jobs):
+        st.rerun()  # everything finished, rerun once without polling
+
+show_jobs()
+
+st.caption(
+    f"Letters longer than {max_letter_pages()} page(s) are shortened automatically "
+    "(change the limit on the Settings page)."
+)
        
\ No newline at end of file
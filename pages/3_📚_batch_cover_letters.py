@@ -0,0 +1,136 @@
+import streamlit as st
+import io
+import os
+import asyncio
+import zipfile
+from dotenv import load_dotenv
+
+from utils.resume_digest import resume_for_prompt
+from utils.cover_letter import common_info_file, output_folder, load_user_info
+from utils.resume_cache import resume_folder
+from utils.tenants import require_tenant
+from utils.batch import parse_pasted_jobs, parse_uploaded_jobs, run_batch, batch_report
+from utils.llm_backend import get_backend
+
+st.set_page_config(page_title="Batch Cover Letters", layout="wide")
+st.title("📚 Batch Cover Letter Generator")
+require_tenant()
+
+# Load user info from common_info.json
+if not os.path.exists(common_info_file()):
+    st.error(f"Missing `{common_info_file()}`. Please create it with required fields.")
+    st.stop()
+user = load_user_info()
+
+# Load .env variables
+load_dotenv()
+backend = get_backend()
+backend_ready, _ = backend.check()
+
+if not backend_ready:
+    st.warning(
+        """
+        ⚠️ **OpenAI API Key Required**  
+        To generate cover letters, you must configure your OpenAI API key in the `.env` file or the app's ⚙️settings.  
+        """
+    )
+    st.stop()
+
+if not user["name"] or not user["email"] or not user["website"]:
+    st.warning("⚠️ Complete your name, email, and website on the **Required Information** page before generating cover letters.")
+
+RESUME_FOLDER = resume_folder()
+os.makedirs(RESUME_FOLDER, exist_ok=True)
+os.makedirs(output_folder(), exist_ok=True)
+
+st.markdown("""
+Generate cover letters for many job postings at once. Each letter is saved to its own
+`cover_letters/<company>_<title>_<timestamp>` folder, just like the single generator.
+
+Note: every posting is a separate API call and consumes API credits.
+""")
+
+resume_files = [f for f in os.listdir(RESUME_FOLDER) if f.lower().endswith(".pdf")]
+if not resume_files:
+    st.warning("No resumes found! Please upload a resume on the Upload Resume page.")
+    st.stop()
+selected_resume = st.selectbox("Select Resume to Use", resume_files)
+
+# ========== 📥 Job Postings ==========
+st.markdown("### Job Postings")
+source = st.radio("Input", ["Paste postings", "Upload CSV/JSONL"], horizontal=True)
+
+if source == "Paste postings":
+    pasted = st.text_area(
+        "Paste job descriptions, separated by a line containing only `---`",
+        height=300,
+    )
+    jobs = parse_pasted_jobs(pasted)
+else:
+    st.caption("Each row needs a `job_description` column and may include `title` and `company`.")
+    uploaded = st.file_uploader("Upload postings", type=["csv", "jsonl"])
+    jobs = []
+    if uploaded is not None:
+        try:
+            jobs = parse_uploaded_jobs(uploaded.name, uploaded.getvalue())
+        except (ValueError, KeyError) as e:
+            st.error(f"Could not read `{uploaded.name}`: {e}")
+
+st.write(f"**{len(jobs)}** posting(s) ready.")
+
+# ========== ⚙️ Throughput ==========
+col1, col2 = st.columns(2)
+with col1:
+    concurrency = st.number_input("Max concurrent requests", min_value=1, max_value=20, value=5)
+with col2:
+    per_minute = st.number_input("Max requests per minute", min_value=1, max_value=500, value=60)
+force_regenerate = st.checkbox(
+    "Force regenerate",
+    help="Postings that were already generated with the same resume are served from the local cache. Tick this to make new API calls instead."
+)
+
+# ========== 🚀 Generate ==========
+if st.button("Generate Cover Letters", disabled=not jobs):
+    resume_text = resume_for_prompt(os.path.join(RESUME_FOLDER, selected_resume))
+
+    progress = st.progress(0.0, text="Starting...")
+
+    def on_result(done, total, result):
+        label = f"{result['company']} – {result['title']}"
+        status = "failed" if result["error"] else "done"
+        progress.progress(done / total, text=f"{done}/{total} finished ({label}: {status})")
+
+    results = asyncio.run(run_batch(
+        jobs,
+        resume_text,
+        concurrency=int(concurrency),
+        per_minute=int(per_minute),
+        force_regenerate=force_regenerate,
+        on_result=on_result,
+    ))
+
+    failed = [r for r in results if r["error"]]
+    if failed:
+        st.error(f"{len(failed)} of {len(results)} cover letter(s) failed.")
+    else:
+        st.success(f"All {len(results)} cover letters generated.")
+    cached = sum(1 for r in results if r["cached"])
+    if cached:
+        st.info(f"♻️ {cached} letter(s) were served from the cache without an API call.")
+
+    st.dataframe(batch_report(results), use_container_width=True, hide_index=True)
+
+    # All PDFs in one download, built in memory
+    finished = [r for r in results if not r["error"]]
+    if finished:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for r in finished:
+                name = os.path.basename(r["folder"]) + ".pdf"
+                archive.writestr(name, r["pdf_bytes"])
+        st.download_button(
+            label="📦 Download All PDFs (.zip)",
+            data=buffer.getvalue(),
+            file_name="cover_letters.zip",
+            mime="application/zip"
+        )
@@ -1,36 +1,47 @@
 import streamlit as st 
-import pandas as pd
-import os
 import datetime
-
-# File location
-TRACKER_FILE = "data/application_tracker.csv"
-
-# Ensure file exists
-if not os.path.exists(TRACKER_FILE):
-    df_init = pd.DataFrame(columns=["Date", "Position", "Company", "Location", "Status", "Notes"])
-    df_init.to_csv(TRACKER_FILE, index=False)
-
-# Load existing data
-df = pd.read_csv(TRACKER_FILE)
+from utils.tracker_store import add_application, apply_changes, count_applications, query_applications, TrackerConflictError
+from utils.tracker_view import view_controls, pager
+from utils.tenants import require_tenant, current_tenant, use_tenant
 
 # Streamlit config
 st.set_page_config(page_title="Application Tracker", layout="wide")
+require_tenant()
 st.title("📊 Job Application Tracker")
 
+# Pre-fill the add form from a pasted job posting
+def fill_from_posting():
+    from utils.jd_parser import parse_job_description, summary_line
+
+    parsed = parse_job_description(st.session_state["prefill_posting"])
+    st.session_state["add_position"] = parsed["title"] or ""
+    st.session_state["add_company"] = parsed["company"] or ""
+    st.session_state["add_location"] = parsed["location"] or ""
+    st.session_state["add_notes"] = summary_line(parsed)
+    st.session_state["prefill_confidence"] = parsed["confidence"]
+
+with st.expander("📋 Pre-fill from a job posting"):
+    st.text_area("Paste the job description", key="prefill_posting", height=150)
+    st.button("Fill Form", on_click=fill_from_posting)
+    confidence = st.session_state.get("prefill_confidence")
+    if confidence:
+        unsure = [f"{field} ({score:.0%})" for field, score in confidence.items() if field in ("title", "company", "location") and score < 0.7]
+        if unsure:
+            st.caption(f"Please double-check: {', '.join(unsure)}")
+
 # Add new application form
 with st.form("add_application_form", clear_on_submit=True):
     st.subheader("➕ Add New Application")
 
     col1, col2 = st.columns(2)
     with col1:
-        position = st.text_input("Position")
-        company = st.text_input("Company")
-        location = st.text_input("Location")
+        position = st.text_input("Position", key="add_position")
+        company = st.text_input("Company", key="add_company")
+        location = st.text_input("Location", key="add_location")
     with col2:
         date_applied = st.date_input("Date Applied", value=datetime.date.today())
         status = st.selectbox("Status", ["Applied", "Interviewing", "Offer", "Rejected"])
-        notes = st.text_area("Notes (optional)")
+        notes = st.text_area("Notes (optional)", key="add_notes")
 
     submitted = st.form_submit_button("Add Application")
     if submitted:
@@ -42,20 +53,169 @@ with st.form("add_application_form", clear_on_submit=True):
             "Status": status,
             "Notes": notes.strip()
         }
-        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-        df.to_csv(TRACKER_FILE, index=False)
+        add_application(new_row)
         st.success(f"✅ Application to {company} for '{position}' added!")
 
-# Editable Data Table
+EDITOR_KEY = "editable_applications"
+PENDING_KEY = "tracker_pending"
+
+def has_editor_edits():
+    state = st.session_state.get(EDITOR_KEY)
+    return bool(state and (state["edited_rows"] or state["added_rows"] or state["deleted_rows"]))
+
+# Edits from pages that are no longer shown, keyed by application id:
+# updates {id: (loaded_version, {column: value})}, inserts [row], deletes {id: loaded_version}
+def pending_changes():
+    if PENDING_KEY not in st.session_state:
+        st.session_state[PENDING_KEY] = {"updates": {}, "inserts": [], "deletes": {}}
+    return st.session_state[PENDING_KEY]
+
+def has_pending_edits():
+    pending = pending_changes()
+    return has_editor_edits() or bool(pending["updates"] or pending["inserts"] or pending["deletes"])
+
+# Turn the editor's deltas into row-level changes for the store
+def collect_changes(df, state):
+    deleted = set(state["deleted_rows"])
+    updates = {}
+    for position, changes in state["edited_rows"].items():
+        position = int(position)
+        if position in deleted:
+            continue
+        updates[int(df["id"].iloc[position])] = (int(df["version"].iloc[position]), changes)
+    deletes = {int(df["id"].iloc[p]): int(df["version"].iloc[p]) for p in deleted}
+    inserts = [row for row in state["added_rows"] if any(v not in (None, "") for v in row.values())]
+    return updates, inserts, deletes
+
+# Move the edits made on the shown page into the pending changes. The version
+# an application was first loaded with is kept, so a save still detects
+# changes made by someone else in between.
+def stash_editor_edits():
+    state = st.session_state.get(EDITOR_KEY)
+    df = st.session_state.get("tracker_snapshot")
+    if state and df is not None:
+        updates, inserts, deletes = collect_changes(df, state)
+        pending = pending_changes()
+        for row_id, (version, changes) in updates.items():
+            if row_id in pending["updates"]:
+                pending["updates"][row_id][1].update(changes)
+            else:
+                pending["updates"][row_id] = (version, dict(changes))
+        for row_id, version in deletes.items():
+            pending["deletes"][row_id] = pending["updates"].pop(row_id, (version, None))[0]
+        pending["inserts"].extend(inserts)
+    st.session_state.pop(EDITOR_KEY, None)
+
+def reset_editor():
+    st.session_state.pop("tracker_snapshot", None)
+    st.session_state.pop("tracker_view", None)
+    st.session_state.pop(EDITOR_KEY, None)
+    st.session_state.pop(PENDING_KEY, None)
+
+# One page of applications with the pending edits applied, so rows edited or
+# deleted on another page show up as the user left them. The editor needs a
+# range index to add rows, so ids become a hidden column.
+def load_page(filters, sort_column, descending, offset, page_size):
+    df = query_applications(filters, sort_column, descending, offset, page_size, versions=True).reset_index()
+    pending = pending_changes()
+    df = df[~df["id"].isin(list(pending["deletes"]))].reset_index(drop=True)
+    for position, row_id in enumerate(df["id"]):
+        if int(row_id) in pending["updates"]:
+            for column, value in pending["updates"][int(row_id)][1].items():
+                df.at[position, column] = value
+    return df
+
+# Editable Data Table (only the current page is loaded and sent to the browser)
 st.subheader("📄 Tracked Applications")
-edited_df = st.data_editor(
+filters, sort_column, descending, page_size, signature = view_controls("tracker")
+offset = pager("tracker", count_applications(filters), page_size)
+view = signature + (offset,)
+
+# A different page or filter: keep the shown page's edits and load the new
+# one. On the same page, reload only while nothing is edited, so the editor's
+# row positions keep pointing at the same applications.
+if st.session_state.get("tracker_view") != view:
+    stash_editor_edits()
+    st.session_state["tracker_snapshot"] = load_page(filters, sort_column, descending, offset, page_size)
+    st.session_state["tracker_view"] = view
+elif not has_editor_edits():
+    st.session_state["tracker_snapshot"] = load_page(filters, sort_column, descending, offset, page_size)
+df = st.session_state["tracker_snapshot"]
+
+st.data_editor(
     df,
     use_container_width=True,
+    hide_index=True,
     num_rows="dynamic",
-    key="editable_applications"
+    column_config={"id": None, "version": None},
+    key=EDITOR_KEY
+)
+
+pending = pending_changes()
+if pending["updates"] or pending["inserts"] or pending["deletes"]:
+    st.caption(
+        f"Unsaved changes (all pages): {len(pending['updates'])} edited, "
+        f"{len(pending['inserts'])} added, {len(pending['deletes'])} deleted."
+    )
+
+# Every application matching the filters (not just this page) as CSV. Read
+# when the button is clicked, from the columnar snapshot when that backend is
+# selected in settings. The download runs outside the script run, so the
+# tenant is passed along.
+def export_csv(tenant, filters):
+    from utils.tracker_columnar import read_applications
+
+    with use_tenant(tenant):
+        return read_applications(filters).to_csv(date_format="%Y-%m-%d").encode("utf-8")
+
+st.download_button(
+    "⬇️ Export to CSV",
+    data=lambda tenant=current_tenant(), filters=dict(filters): export_csv(tenant, filters),
+    file_name="applications.csv",
+    mime="text/csv",
+    help="All applications matching the filters above, saved changes only.",
 )
 
-# Save changes
-if st.button("💾 Save Changes"):
-    edited_df.to_csv(TRACKER_FILE, index=False)
-    st.success("✅ Changes saved to application tracker!")
+if "tracker_saved" in st.session_state:
+    st.success(st.session_state.pop("tracker_saved"))
+
+# Save changes (only the rows that were edited, added or deleted, on any page)
+col1, col2 = st.columns([1, 5])
+with col1:
+    save_clicked = st.button("💾 Save Changes")
+with col2:
+    if has_pending_edits() and st.button("↩️ Discard Unsaved Changes"):
+        reset_editor()
+        st.rerun()
+
+if save_clicked:
+    if not has_pending_edits():
+        st.info("No changes to save.")
+    else:
+        stash_editor_edits()
+        updates, inserts, deletes = pending["updates"], pending["inserts"], pending["deletes"]
+        try:
+            apply_changes(updates, inserts, deletes)
+        except TrackerConflictError as e:
+            st.session_state["tracker_conflict"] = e.row_ids
+            # The stashed edits are shown again on the reloaded page
+            st.session_state.pop("tracker_view", None)
+            st.rerun()
+        else:
+            st.session_state.pop("tracker_conflict", None)
+            st.session_state["tracker_saved"] = (
+                f"✅ Changes saved to application tracker! "
+                f"({len(updates)} edited, {len(inserts)} added, {len(deletes)} deleted)"
+            )
+            reset_editor()
+            st.rerun()
+
+if "tracker_conflict" in st.session_state:
+    st.error(
+        f"⚠️ Nothing was saved: application(s) {st.session_state['tracker_conflict']} were changed "
+        "or deleted in another session since you loaded this table. Reload to see the latest data, then redo your edits."
+    )
+    if st.button("🔄 Discard My Edits and Reload"):
+        st.session_state.pop("tracker_conflict")
+        reset_editor()
+        st.rerun()
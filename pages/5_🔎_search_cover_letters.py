@@ -0,0 +1,88 @@
+import streamlit as st
+import os
+import time
+
+from utils import archive_index
+from utils.cover_letter import output_folder
+from utils.tenants import require_tenant
+
+require_tenant()
+st.title("🔎 Search Cover Letters")
+st.markdown("Search the job descriptions and letters saved in `cover_letters/`.")
+
+# Pick up folders added, edited or removed outside the app (only changed
+# folders are read again). This runs when the page is opened and when
+# cover_letters/ itself changed, not on every keystroke in the search box;
+# the refresh button catches edits inside existing folders.
+def archive_stamp():
+    folder = output_folder()
+    return folder, os.stat(folder).st_mtime_ns if os.path.isdir(folder) else None
+
+
+refresh = st.button("🔄 Refresh index", help="Re-read folders that were changed outside the app.")
+if refresh or st.session_state.get("archive_synced") != archive_stamp():
+    changed, removed = archive_index.sync_index()
+    st.session_state["archive_synced"] = archive_stamp()
+    if changed or removed:
+        st.caption(f"Index updated: {changed} folder(s) added or changed, {removed} removed.")
+
+total = archive_index.count_letters()
+if not total:
+    st.info("No cover letters yet. Generated letters show up here automatically.")
+    st.stop()
+
+col1, col2 = st.columns([3, 1])
+with col1:
+    query = st.text_input("Search", placeholder="e.g. kubernetes fintech, data engineer")
+with col2:
+    company = st.selectbox("Company", ["All"] + archive_index.list_companies())
+
+start = time.perf_counter()
+results = archive_index.search(query, company=None if company == "All" else company)
+elapsed_ms = (time.perf_counter() - start) * 1000
+
+if query.strip():
+    st.caption(f"{len(results)} result(s) from {total} letters in {elapsed_ms:.1f} ms")
+else:
+    st.caption(f"Most recent of {total} letters")
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+# Files are only read when their toggle is switched on or the download
+# button is clicked
+for i, result in enumerate(results):
+    folder = result["folder"]
+    label = f"{result['company']} – {result['title']} ({result['created_at'] or 'unknown date'})"
+    with st.expander(label):
+        if result["snippet"]:
+            st.markdown(result["snippet"])
+        st.caption(f"`{folder}`")
+
+        letter_path = os.path.join(folder, archive_index.COVER_LETTER_FILE)
+        job_path = os.path.join(folder, archive_index.JOB_DESCRIPTION_FILE)
+        pdf_files = [f for f in os.listdir(folder) if f.lower().endswith(".pdf")] if os.path.isdir(folder) else []
+
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            show_letter = st.toggle("Show letter", key=f"letter_{i}_{folder}", disabled=not os.path.exists(letter_path))
+        with c2:
+            show_job = st.toggle("Show job description", key=f"job_{i}_{folder}", disabled=not os.path.exists(job_path))
+        with c3:
+            if pdf_files:
+                pdf_path = os.path.join(folder, pdf_files[0])
+                st.download_button(
+                    "📄 Download PDF",
+                    data=lambda path=pdf_path: read_bytes(path),
+                    file_name=pdf_files[0],
+                    mime="application/pdf",
+                    key=f"pdf_{i}_{folder}",
+                )
+
+        if show_letter:
+            with open(letter_path, "r", encoding="utf-8") as f:
+                st.text_area("Cover Letter", f.read(), height=300, key=f"letter_text_{i}_{folder}")
+        if show_job:
+            with open(job_path, "r", encoding="utf-8") as f:
+                st.text_area("Job Description", f.read(), height=200, key=f"job_text_{i}_{folder}")
@@ -1,43 +1,21 @@
 import streamlit as st
-from pathlib import Path
+from utils.env_settings import load_env_value, save_env_value, load_int, load_float
+from utils.openai_client import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT, DEFAULT_MAX_RETRIES
+from utils.llm_backend import BACKENDS, DEFAULT_LOCAL_URL, DEFAULT_LOCAL_MODEL, backend_name
+from utils.tenants import require_tenant, tenants_enabled
 
 st.set_page_config(page_title="Settings")
+require_tenant()
 
 st.title("⚙️ Settings")
 
-# Path to .env file
-env_path = Path(".env")
-
 # Function to load key from .env
 def load_api_key():
-    if env_path.exists():
-        with open(env_path, "r") as f:
-            lines = f.readlines()
-        for line in lines:
-            if line.startswith("OPENAI_API_KEY="):
-                return line.strip().split("=", 1)[1]
-    return ""
+    return load_env_value("OPENAI_API_KEY")
 
 # Function to save key to .env (overwrite or add)
 def save_api_key(key):
-    lines = []
-    if env_path.exists():
-        with open(env_path, "r") as f:
-            lines = f.readlines()
-
-    key_line = f"OPENAI_API_KEY={key}\n"
-    key_written = False
-    for i, line in enumerate(lines):
-        if line.startswith("OPENAI_API_KEY="):
-            lines[i] = key_line
-            key_written = True
-            break
-
-    if not key_written:
-        lines.append(key_line)
-
-    with open(env_path, "w") as f:
-        f.writelines(lines)
+    save_env_value("OPENAI_API_KEY", key)
 
 # Load existing key but do NOT show it in the input field (security)
 stored_key = load_api_key()
@@ -58,9 +36,129 @@ if st.button("Save API Key"):
         st.error("Please enter a valid API key.")
     else:
         save_api_key(api_key_input.strip())
-        st.success("API key saved to `.env` file securely! PLEASE REFRESH PAGE TO SEE CHANGES")
+        st.success("API key saved to `.env` file securely! The cover letter generator will use it on its next run.")
 
 if stored_key:
     st.info("You have an API key saved. For security, the value is hidden.")
 else:
     st.warning("No API key found. Please enter your key to use OpenAI features.")
+
+# ========== 🤖 Language Model ==========
+st.markdown("### 🤖 Language Model")
+# On a multi-user server the backend and its URL are set by the server
+# (LLM_BACKEND, LLM_BASE_URL in its environment), not per user
+if tenants_enabled():
+    st.caption(f"Cover letters use the {BACKENDS[backend_name()][0]}, as set up by the server administrator.")
+else:
+    backend_names = list(BACKENDS)
+    selected_backend = st.selectbox(
+        "Backend",
+        backend_names,
+        index=backend_names.index(backend_name()),
+        format_func=lambda name: BACKENDS[name][0],
+    )
+    if selected_backend == "local":
+        st.caption(
+            "Any server that speaks the OpenAI chat-completions protocol. For offline testing start the bundled "
+            "mock server with `python scripts/mock_llm_server.py`."
+        )
+        local_url = st.text_input("Server URL", value=load_env_value("LLM_BASE_URL", DEFAULT_LOCAL_URL))
+        local_model = st.text_input("Model", value=load_env_value("LLM_MODEL", DEFAULT_LOCAL_MODEL))
+    if st.button("Save Backend"):
+        save_env_value("LLM_BACKEND", selected_backend)
+        if selected_backend == "local":
+            save_env_value("LLM_BASE_URL", local_url.strip())
+            save_env_value("LLM_MODEL", local_model.strip())
+        st.success(f"Using {BACKENDS[selected_backend][0]} for cover letters.")
+
+# ========== 🗄️ Archive ==========
+st.markdown("### 🗄️ Cover Letter Archive")
+archive_pdfs = st.checkbox(
+    "Save a PDF copy of every cover letter in `cover_letters/`",
+    value=load_env_value("ARCHIVE_PDFS", "1") == "1",
+    help="PDFs are always available for download. When this is off they are only kept in memory; the letter text is still saved."
+)
+if archive_pdfs != (load_env_value("ARCHIVE_PDFS", "1") == "1"):
+    save_env_value("ARCHIVE_PDFS", "1" if archive_pdfs else "0")
+    st.success("Archive setting saved.")
+
+max_pages = st.number_input(
+    "Maximum pages per cover letter", min_value=1, max_value=5,
+    value=min(5, max(1, load_int("MAX_LETTER_PAGES", 2))),
+    help="Longer letters are sent back to the model to be shortened, then the line spacing is tightened if needed."
+)
+if max_pages != load_int("MAX_LETTER_PAGES", 2):
+    save_env_value("MAX_LETTER_PAGES", max_pages)
+    st.success("Page limit saved.")
+
+# ========== 🧮 Prompt Size ==========
+st.markdown("### 🧮 Prompt Size")
+use_digest = st.checkbox(
+    "Send a compact resume digest instead of the full resume text",
+    value=load_env_value("RESUME_DIGEST", "0") == "1",
+    help="The digest is built once per resume: section headings, skills and experience are kept, contact details, duplicates and hobbies are dropped."
+)
+if use_digest != (load_env_value("RESUME_DIGEST", "0") == "1"):
+    save_env_value("RESUME_DIGEST", "1" if use_digest else "0")
+    st.success("Resume digest setting saved.")
+
+from utils.resume_digest import MIN_PROMPT_BUDGET
+
+prompt_budget = st.number_input(
+    "Prompt token budget (0 = no limit)", min_value=0, max_value=32000, step=250,
+    value=min(32000, max(0, load_int("PROMPT_TOKEN_BUDGET", 0))),
+    help=(
+        "When resume plus job description would go over this, the least important resume sections are trimmed first. "
+        f"Needs at least {MIN_PROMPT_BUDGET} tokens to leave room for the instructions, resume and job description."
+    )
+)
+if 0 < prompt_budget < MIN_PROMPT_BUDGET:
+    st.error(f"A prompt token budget must be 0 (no limit) or at least {MIN_PROMPT_BUDGET}. Not saved.")
+elif prompt_budget != load_int("PROMPT_TOKEN_BUDGET", 0):
+    save_env_value("PROMPT_TOKEN_BUDGET", prompt_budget)
+    st.success("Prompt token budget saved.")
+
+# ========== 🗃️ Tracker Storage ==========
+st.markdown("### 🗃️ Tracker Storage")
+TRACKER_BACKENDS = {
+    "sqlite": "SQLite (default)",
+    "parquet": "Columnar snapshot (Parquet) for very large trackers",
+}
+tracker_backend = load_env_value("TRACKER_BACKEND", "sqlite")
+selected_tracker_backend = st.radio(
+    "Tracker exports read applications from",
+    list(TRACKER_BACKENDS),
+    index=list(TRACKER_BACKENDS).index(tracker_backend) if tracker_backend in TRACKER_BACKENDS else 0,
+    format_func=TRACKER_BACKENDS.get,
+    help="Edits are always saved to SQLite, and the dashboards use its summary tables. The columnar snapshot is rebuilt by the first export after a change and reads many rows much faster.",
+)
+if selected_tracker_backend == "parquet":
+    # Imported here so the settings page doesn't load pandas when SQLite is used
+    from utils.tracker_columnar import columnar_available
+
+    if not columnar_available():
+        st.warning("The columnar snapshot needs pyarrow (`pip install pyarrow`). SQLite is used until it is installed.")
+if selected_tracker_backend != tracker_backend:
+    save_env_value("TRACKER_BACKEND", selected_tracker_backend)
+    st.success("Tracker storage saved.")
+
+# ========== 🔌 Connection ==========
+with st.expander("🔌 OpenAI Connection"):
+    st.markdown("Timeouts and retries for OpenAI requests. Rate-limit (429) and server (5xx) errors are retried with jittered exponential backoff.")
+    connect_timeout = st.number_input(
+        "Connect timeout (seconds)", min_value=1.0, max_value=60.0,
+        value=min(60.0, max(1.0, load_float("OPENAI_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT))),
+    )
+    read_timeout = st.number_input(
+        "Read timeout (seconds)", min_value=5.0, max_value=600.0,
+        value=min(600.0, max(5.0, load_float("OPENAI_READ_TIMEOUT", DEFAULT_READ_TIMEOUT))),
+    )
+    max_retries = st.number_input(
+        "Max retries", min_value=0, max_value=10,
+        value=min(10, max(0, load_int("OPENAI_MAX_RETRIES", DEFAULT_MAX_RETRIES))),
+    )
+    if st.button("Save Connection Settings"):
+        save_env_value("OPENAI_CONNECT_TIMEOUT", connect_timeout)
+        save_env_value("OPENAI_READ_TIMEOUT", read_timeout)
+        save_env_value("OPENAI_MAX_RETRIES", max_retries)
+        st.success("Connection settings saved to `.env`.")
@@ -0,0 +1,129 @@
+import streamlit as st
+import pandas as pd
+from utils import metrics
+from utils.env_settings import save_env_value
+from utils.tenants import require_tenant
+
+st.set_page_config(page_title="Performance Metrics", layout="wide")
+require_tenant()
+st.title("⏱️ Performance Metrics")
+st.markdown(
+    "Time spent in each stage of cover letter generation, the application tracker and the analytics page. "
+    "Measurements are kept in `data/metrics.jsonl`; the oldest are dropped as it rotates."
+)
+
+# Stages in pipeline order; anything else recorded is listed after them
+STAGE_LABELS = {
+    "job.cover_letter": "Whole generation job",
+    "resume.load": "Resume text for the prompt",
+    "resume.extract_pdf": "PDF text extraction (cache miss)",
+    "job.resume_text": "Resume upload processing (background)",
+    "job.tracker_duplicates": "Tracker duplicate indexing (background)",
+    "prompt.build": "Prompt assembly",
+    "llm.request": "Model request",
+    "letter.fit_pages": "Page-limit fitting",
+    "pdf.render": "PDF rendering",
+    "pdf.render_batch": "PDF rendering (batch)",
+    "letter.write": "Disk writes",
+    "archive.index": "Search index update",
+    "batch.run": "Whole batch",
+    "tracker.load": "Tracker load",
+    "tracker.save": "Tracker save",
+    "tracker.summaries": "Dashboard summaries",
+    "tracker.snapshot": "Columnar snapshot rebuild",
+    "dashboard.figure": "Dashboard chart build (cache miss)",
+    "analytics.render": "Analytics page",
+}
+
+WINDOWS = {
+    "Last hour": pd.Timedelta(hours=1),
+    "Last 24 hours": pd.Timedelta(days=1),
+    "Last 7 days": pd.Timedelta(days=7),
+    "All": None,
+}
+
+
+# Re-read only when a metrics file changed
+@st.cache_data(max_entries=2, show_spinner=False)
+def load(signature):
+    return metrics.load_metrics()
+
+
+recording = st.toggle("Record performance metrics", value=metrics.metrics_enabled())
+if recording != metrics.metrics_enabled():
+    save_env_value("METRICS", "1" if recording else "0")
+    st.rerun()
+
+df = load(metrics.metrics_signature())
+if df.empty:
+    st.info("Nothing recorded yet. Generate a cover letter or open the tracker to collect measurements.")
+    st.stop()
+
+window = st.selectbox("Time window", list(WINDOWS), index=1)
+if WINDOWS[window] is not None:
+    now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+    df = df[df["ts"] >= now - WINDOWS[window]]
+if df.empty:
+    st.info(f"No measurements in the {window.lower()}.")
+    st.stop()
+
+# ========== 📋 Per-stage summary ==========
+st.subheader("📋 Stages")
+summary = metrics.stage_summary(df)
+order = {stage: i for i, stage in enumerate(STAGE_LABELS)}
+summary = summary.assign(
+    Description=summary["Stage"].map(lambda stage: STAGE_LABELS.get(stage, "")),
+    order=summary["Stage"].map(lambda stage: order.get(stage, len(order))),
+).sort_values(["order", "Stage"]).drop(columns="order")
+st.dataframe(
+    summary[["Stage", "Description", "Count", "p50 ms", "p95 ms", "Max ms", "Failed"]],
+    hide_index=True,
+    use_container_width=True,
+    column_config={name: st.column_config.NumberColumn(format="%.1f") for name in ["p50 ms", "p95 ms", "Max ms"]},
+)
+
+# ========== 📈 Over time ==========
+st.subheader("📈 p50 / p95 Over Time")
+stages = list(summary["Stage"])
+stage = st.selectbox(
+    "Stage", stages,
+    index=stages.index("llm.request") if "llm.request" in stages else 0,
+    format_func=lambda s: f"{s} – {STAGE_LABELS[s]}" if s in STAGE_LABELS else s,
+)
+covered = df["ts"].max() - df["ts"].min()
+freq = "10min" if covered <= pd.Timedelta(hours=3) else "h" if covered <= pd.Timedelta(days=2) else "D"
+stage_rows = df[df["stage"] == stage]
+over_time = (
+    stage_rows.groupby(pd.Grouper(key="ts", freq=freq))["ms"]
+    .quantile([0.5, 0.95]).unstack()
+    .rename(columns={0.5: "p50 ms", 0.95: "p95 ms"})
+    .dropna()
+)
+st.line_chart(over_time)
+st.caption(f"Buckets of {'10 minutes' if freq == '10min' else 'one hour' if freq == 'h' else 'one day'} (UTC).")
+
+# ========== 🔢 Tokens ==========
+requests = df[df["stage"] == "llm.request"]
+if not requests.empty:
+    st.subheader("🔢 Model Requests and Tokens")
+    prompt_tokens = requests["prompt_tokens"] if "prompt_tokens" in requests else pd.Series(dtype=float)
+    completion_tokens = requests["completion_tokens"] if "completion_tokens" in requests else pd.Series(dtype=float)
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Requests", len(requests))
+    c2.metric("Prompt tokens", f"{int(prompt_tokens.sum()):,}")
+    c3.metric("Completion tokens", f"{int(completion_tokens.sum()):,}")
+    if "first_token_ms" in requests and requests["first_token_ms"].notna().any():
+        c4.metric("First token p50 / p95", f"{requests['first_token_ms'].quantile(0.5):.0f} / {requests['first_token_ms'].quantile(0.95):.0f} ms")
+
+    if prompt_tokens.notna().any():
+        tokens = requests.assign(**{"Prompt tokens": prompt_tokens, "Completion tokens": completion_tokens})
+        per_bucket = tokens.groupby(pd.Grouper(key="ts", freq=freq))[["Prompt tokens", "Completion tokens"]].sum()
+        st.bar_chart(per_bucket)
+    else:
+        st.caption("The model server did not report token usage.")
+
+st.markdown("---")
+if st.button("🗑️ Clear Metrics"):
+    metrics.clear_metrics()
+    load.clear()
+    st.rerun()
@@ -0,0 +1,147 @@
+"""Job description parser benchmark: accuracy and throughput.
+
+Runs utils/jd_parser.py over the labeled postings in
+scripts/data/jd_parser_corpus.jsonl and reports per-field accuracy, skill
+precision/recall and postings parsed per second. The old two-regex
+title/company extraction is measured alongside as a baseline.
+
+    python scripts/bench_jd_parser.py                     # table of results
+    python scripts/bench_jd_parser.py --repeat 500        # longer throughput run
+    python scripts/bench_jd_parser.py --min-accuracy 0.9  # exit 1 if any field is below
+    python scripts/bench_jd_parser.py --verbose           # list every mismatch
+
+Run it from the repository root.
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.jd_parser import parse_job_description
+
+CORPUS = os.path.join(ROOT, "scripts", "data", "jd_parser_corpus.jsonl")
+FIELDS = ["title", "company", "location", "seniority", "salary"]
+
+
+# The extraction the generator used before the parser
+def legacy_extract(job_description):
+    title_match = re.search(r'(?i)(Position|Title|Job Title)[:\s]*(.*)', job_description)
+    company_match = re.search(r'(?i)(Company|Organization)[:\s]*(.*)', job_description)
+    title = title_match.group(2).strip() if title_match else "Unknown_Position"
+    company = company_match.group(2).strip() if company_match else "Unknown_Company"
+    return title, company
+
+
+def normalize(value):
+    return re.sub(r'[^a-z0-9]+', ' ', (value or "").lower()).strip()
+
+
+# Locations count when one contains the other ("Austin, TX" vs "Austin, TX (Hybrid)")
+def location_matches(expected, actual):
+    expected, actual = normalize(expected), normalize(actual)
+    if not expected or not actual:
+        return expected == actual
+    return expected in actual or actual in expected
+
+
+def field_matches(field, expected, parsed):
+    if field == "salary":
+        salary = parsed["salary"] or {}
+        return (salary.get("min"), salary.get("max")) == (expected["salary_min"], expected["salary_max"])
+    if field == "location":
+        return location_matches(expected["location"], parsed["location"])
+    return normalize(expected[field]) == normalize(parsed[field])
+
+
+def throughput(fn, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return repeat * len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=CORPUS)
+    parser.add_argument("--repeat", type=int, default=100, help="passes over the corpus for the throughput numbers")
+    parser.add_argument("--min-accuracy", type=float, default=None)
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    with open(args.corpus, "r", encoding="utf-8") as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+    texts = [item["text"] for item in corpus]
+
+    correct = {field: 0 for field in FIELDS}
+    legacy_correct = {"title": 0, "company": 0}
+    true_pos = false_pos = false_neg = 0
+    mismatches = []
+    for item in corpus:
+        expected = item["expected"]
+        parsed = parse_job_description(item["text"])
+        for field in FIELDS:
+            if field_matches(field, expected, parsed):
+                correct[field] += 1
+            else:
+                mismatches.append((item["text"].splitlines()[0], field, expected.get(field, expected.get("salary_min")), parsed[field]))
+
+        skills, expected_skills = set(parsed["skills"]), set(expected["skills"])
+        true_pos += len(skills & expected_skills)
+        false_pos += len(skills - expected_skills)
+        false_neg += len(expected_skills - skills)
+
+        legacy_title, legacy_company = legacy_extract(item["text"])
+        legacy_correct["title"] += normalize(legacy_title) == normalize(expected["title"])
+        legacy_correct["company"] += normalize(legacy_company) == normalize(expected["company"])
+
+    n = len(corpus)
+    precision = true_pos / (true_pos + false_pos) if true_pos + false_pos else 0.0
+    recall = true_pos / (true_pos + false_neg) if true_pos + false_neg else 0.0
+    results = {
+        "postings": n,
+        "accuracy": {field: correct[field] / n for field in FIELDS},
+        "skills": {
+            "precision": precision,
+            "recall": recall,
+            "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        },
+        "legacy_accuracy": {field: legacy_correct[field] / n for field in legacy_correct},
+        "postings_per_second": throughput(parse_job_description, texts, args.repeat),
+        "legacy_postings_per_second": throughput(legacy_extract, texts, args.repeat),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{n} labeled postings\n")
+        print(f"{'field':<12}{'parser':>10}{'legacy':>10}")
+        for field in FIELDS:
+            legacy = results["legacy_accuracy"].get(field)
+            legacy_text = f"{legacy:>10.0%}" if legacy is not None else f"{'-':>10}"
+            print(f"{field:<12}{results['accuracy'][field]:>10.0%}{legacy_text}")
+        skills = results["skills"]
+        print(f"{'skills':<12}  precision {skills['precision']:.0%}  recall {skills['recall']:.0%}  F1 {skills['f1']:.2f}")
+        print(f"\nthroughput  parser {results['postings_per_second']:,.0f} postings/s, "
+              f"legacy {results['legacy_postings_per_second']:,.0f} postings/s (title + company only)")
+
+    if args.verbose:
+        print("\nMismatches:")
+        for first_line, field, expected, actual in mismatches:
+            print(f"  {first_line[:40]:<40} {field:<10} expected {expected!r} got {actual!r}")
+
+    if args.min_accuracy is not None:
+        failing = [f for f, acc in results["accuracy"].items() if acc < args.min_accuracy]
+        if failing:
+            print(f"\nBelow {args.min_accuracy:.0%}: {', '.join(failing)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
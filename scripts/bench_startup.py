@@ -0,0 +1,150 @@
+"""Startup benchmark: cold-start and first-render time for every page.
+
+Each page is rendered with Streamlit's AppTest in a fresh Python process
+(so nothing is imported yet) against a throwaway data folder seeded with
+sample applications, a resume and user info. The first render in that
+process is the cold number, the second one is the warm rerun.
+
+    python scripts/bench_startup.py                  # table of results
+    python scripts/bench_startup.py --repeat 5       # median of 5 runs
+    python scripts/bench_startup.py --max-cold-ms 3000
+        # exit with status 1 if any page's cold render is slower
+
+Run it from the repository root.
+"""
+import os
+import sys
+import json
+import glob
+import random
+import argparse
+import datetime
+import statistics
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the child process: time the interpreter-level imports and two
+# renders of one page
+CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+framework = time.perf_counter() - start
+
+modules_before = len(sys.modules)
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+start = time.perf_counter()
+at.run()
+cold = time.perf_counter() - start
+modules_loaded = len(sys.modules) - modules_before
+
+start = time.perf_counter()
+at.run()
+warm = time.perf_counter() - start
+
+print(json.dumps({
+    "framework_s": framework,
+    "cold_s": cold,
+    "warm_s": warm,
+    "modules": modules_loaded,
+    "errors": [str(e.value) for e in at.exception],
+}))
+"""
+
+
+# Sample data so pages render their real content instead of empty states
+def seed(workdir, applications):
+    sys.path.insert(0, ROOT)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        from utils import tracker_store
+
+        os.makedirs("data", exist_ok=True)
+        with open("data/common_info.json", "w") as f:
+            json.dump({"first_name": "Bench", "last_name": "Mark", "email": "bench@example.com", "link": "https://example.com"}, f)
+
+        tracker_store.init_store()
+        rng = random.Random(0)
+        statuses = ["Applied", "Interviewing", "Offer", "Rejected"]
+        inserts = []
+        for _ in range(applications):
+            date = datetime.date(2024, 1, 1) + datetime.timedelta(days=rng.randint(0, 700))
+            inserts.append({
+                "Date": date.isoformat(),
+                "Position": f"Position {rng.randint(1, 60)}",
+                "Company": f"Company {rng.randint(1, 400)}",
+                "Location": rng.choice(["Remote", "NYC", "Austin"]),
+                "Status": rng.choice(statuses),
+                "Notes": "",
+            })
+        tracker_store.apply_changes(inserts=inserts)
+
+        os.makedirs("resumes", exist_ok=True)
+        from fpdf import FPDF
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_font("Times", size=12)
+        for i in range(120):
+            pdf.multi_cell(0, 8, f"Experience item {i}: built data pipelines in Python and SQL.")
+        pdf.output("resumes/bench_resume.pdf")
+    finally:
+        os.chdir(cwd)
+
+
+def run_page(page, workdir):
+    env = dict(os.environ, PYTHONPATH=ROOT, OPENAI_API_KEY="sk-bench")
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, page],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per page, the median is reported")
+    parser.add_argument("--applications", type=int, default=2000, help="sample tracker rows")
+    parser.add_argument("--max-cold-ms", type=float, help="fail if any page's cold render is slower")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    pages = [os.path.join(ROOT, "Home.py")] + sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        seed(workdir, args.applications)
+        for page in pages:
+            runs = [run_page(page, workdir) for _ in range(args.repeat)]
+            results[os.path.basename(page)] = {
+                "framework_ms": statistics.median(r["framework_s"] for r in runs) * 1000,
+                "cold_ms": statistics.median(r["cold_s"] for r in runs) * 1000,
+                "warm_ms": statistics.median(r["warm_s"] for r in runs) * 1000,
+                "modules": runs[-1]["modules"],
+                "errors": runs[-1]["errors"],
+            }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'page':<40} {'cold ms':>9} {'warm ms':>9} {'modules':>8}")
+        for name, r in results.items():
+            flag = "  ERROR" if r["errors"] else ""
+            print(f"{name:<40} {r['cold_ms']:>9.1f} {r['warm_ms']:>9.1f} {r['modules']:>8}{flag}")
+        framework = statistics.median(r["framework_ms"] for r in results.values())
+        print(f"\nStreamlit import (not counted above): {framework:.1f} ms")
+
+    failed = False
+    for name, r in results.items():
+        if r["errors"]:
+            print(f"{name}: {r['errors']}", file=sys.stderr)
+            failed = True
+        if args.max_cold_ms is not None and r["cold_ms"] > args.max_cold_ms:
+            print(f"{name}: cold render {r['cold_ms']:.1f} ms exceeds {args.max_cold_ms} ms", file=sys.stderr)
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Tracker backend benchmark: SQLite vs the columnar (Parquet) snapshot.
+
+Seeds a throwaway tracker with many applications, then times the row reads
+the columnar backend serves and the memory of the loaded frames:
+
+  load         every application as a DataFrame (the tracker page's CSV export
+               with no filters)
+  date range   one quarter of applications (the tracker page's CSV export
+               with a date filter), Date/Company/Status only
+  snapshot     rebuilding the Parquet file, done by the first read after a change
+
+The dashboard summaries always come from SQLite's materialized tables; their
+time is shown for reference.
+
+    python scripts/bench_tracker_backends.py                  # 100k applications
+    python scripts/bench_tracker_backends.py --rows 500000 --repeat 5
+
+Needs pyarrow. Run it from the repository root.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import datetime
+import statistics
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def seed(rows):
+    from utils import tracker_store
+
+    tracker_store.init_store()
+    rng = random.Random(0)
+    statuses = ["Applied", "Interviewing", "Offer", "Rejected", "Ghosted"]
+    locations = ["Remote", "New York, NY", "Austin, TX", "London, UK", "Berlin"]
+    batch = []
+    for _ in range(rows):
+        date = datetime.date(2020, 1, 1) + datetime.timedelta(days=rng.randint(0, 5 * 365))
+        batch.append({
+            "Date": date.isoformat(),
+            "Position": f"Position {rng.randint(1, 300)}",
+            "Company": f"Company {rng.randint(1, 5000)}",
+            "Location": rng.choice(locations),
+            "Status": rng.choice(statuses),
+            "Notes": "",
+        })
+        if len(batch) == 20000:
+            tracker_store.apply_changes(inserts=batch)
+            batch = []
+    if batch:
+        tracker_store.apply_changes(inserts=batch)
+
+
+def timed(fn, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, result
+
+
+def megabytes(df):
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="applications to seed")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the median is reported")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            from utils import tracker_store, tracker_columnar
+
+            start = time.perf_counter()
+            seed(args.rows)
+            seed_s = time.perf_counter() - start
+            version = tracker_store.data_version()
+
+            # The SQLite rows with the snapshot's column types, so the memory
+            # comparison is like for like
+            def sqlite_load():
+                df = tracker_store.load_applications()
+                df["Date"] = pd.to_datetime(df["Date"], errors="coerce", format="%Y-%m-%d")
+                for column in tracker_columnar.CATEGORICAL_COLUMNS:
+                    df[column] = df[column].astype("category")
+                return df
+
+            quarter = {"date_from": "2022-01-01", "date_to": "2022-03-31"}
+
+            def sqlite_range():
+                return tracker_store.load_applications(filters=quarter, columns=["Date", "Company", "Status"])
+
+            def rebuild():
+                os.remove(tracker_columnar.snapshot_file())
+                tracker_columnar.ensure_snapshot(version)
+
+            tracker_columnar.ensure_snapshot(version)
+
+            results = {"rows": args.rows, "seed_s": seed_s, "snapshot_bytes": os.path.getsize(tracker_columnar.snapshot_file())}
+            results["sqlite_load_ms"], sqlite_df = timed(sqlite_load, args.repeat)
+            results["parquet_load_ms"], parquet_df = timed(lambda: tracker_columnar.load_applications(version), args.repeat)
+            results["plain_load_mb"] = megabytes(tracker_store.load_applications())
+            results["sqlite_load_mb"] = megabytes(sqlite_df)
+            results["parquet_load_mb"] = megabytes(parquet_df)
+            results["sqlite_summaries_ms"], _ = timed(tracker_store.load_summaries, args.repeat)
+            results["sqlite_range_ms"], sqlite_quarter = timed(sqlite_range, args.repeat)
+            results["parquet_range_ms"], parquet_quarter = timed(
+                lambda: tracker_columnar.load_applications(version, columns=["Date", "Company", "Status"], filters=quarter), args.repeat
+            )
+            results["range_rows"] = len(parquet_quarter)
+            results["range_rows_match"] = len(sqlite_quarter) == len(parquet_quarter)
+            results["snapshot_rebuild_ms"], _ = timed(rebuild, args.repeat)
+        finally:
+            os.chdir(cwd)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.rows:,} applications (seeded in {seed_s:.1f} s), snapshot {results['snapshot_bytes'] / 1024 / 1024:.1f} MB\n")
+        print(f"{'':<22}{'SQLite':>12}{'Parquet':>12}")
+        print(f"{'load ms':<22}{results['sqlite_load_ms']:>12.1f}{results['parquet_load_ms']:>12.1f}")
+        print(f"{'load MB':<22}{results['sqlite_load_mb']:>12.1f}{results['parquet_load_mb']:>12.1f}"
+              f"   (plain object columns: {results['plain_load_mb']:.1f} MB)")
+        print(f"{'summaries ms':<22}{results['sqlite_summaries_ms']:>12.1f}{'-':>12}   (always SQLite)")
+        print(f"{'date range ms':<22}{results['sqlite_range_ms']:>12.1f}{results['parquet_range_ms']:>12.1f}"
+              f"   ({results['range_rows']:,} rows{'' if results['range_rows_match'] else ', MISMATCH'})")
+        print(f"{'snapshot rebuild ms':<22}{'':>12}{results['snapshot_rebuild_ms']:>12.1f}")
+    sys.exit(0 if results["range_rows_match"] else 1)
+
+
+if __name__ == "__main__":
+    main()
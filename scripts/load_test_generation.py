@@ -0,0 +1,224 @@
+"""Generation load test: end-to-end throughput and tail latency, offline.
+
+Starts scripts/mock_llm_server.py on a free port, points the "local" backend
+at it and pushes cover letters through the real pipeline (prompt building,
+model call, page fitting, PDF rendering, saving and indexing) in a throwaway
+data folder seeded with user info and a resume.
+
+    python scripts/load_test_generation.py                        # 20 letters, 4 at a time
+    python scripts/load_test_generation.py -n 100 --concurrency 10
+    python scripts/load_test_generation.py --mode batch -n 50     # through utils/batch.py
+    python scripts/load_test_generation.py --error-rate 0.05 --rate-limit-rate 0.05
+    python scripts/load_test_generation.py --mode batch --error-rate 1 --retries 0   # every letter fails
+    python scripts/load_test_generation.py --max-p95-ms 5000      # exit 1 if slower
+
+--mode jobs runs run_cover_letter_job (what the generator page's background
+jobs run) on a thread pool, one letter per job. --mode batch runs one
+run_batch call, and latency is the time until each letter came back; it
+also builds the batch page's results table, which must work even when every
+letter failed.
+Server options (--latency-ms, --jitter-ms, --tokens-per-second, --words,
+--error-rate, --rate-limit-rate, --disconnect-rate) are passed through.
+
+Run it from the repository root.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+import subprocess
+import tempfile
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER = os.path.join(ROOT, "scripts", "mock_llm_server.py")
+SERVER_OPTIONS = ["latency_ms", "jitter_ms", "tokens_per_second", "words", "error_rate", "rate_limit_rate", "disconnect_rate", "seed"]
+
+JOB_DESCRIPTION = """Job Title: {title}
+Company: {company}
+Location: Austin, TX (Hybrid)
+
+{company} is looking for a {title} to build data pipelines and services in
+Python, SQL and AWS. You will work with product and analytics teams, own
+reliability of our platform and mentor other engineers.
+"""
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def seed(workdir, base_url, retries):
+    os.makedirs(os.path.join(workdir, "data"), exist_ok=True)
+    with open(os.path.join(workdir, "data", "common_info.json"), "w") as f:
+        json.dump({"first_name": "Load", "last_name": "Test", "email": "load@example.com", "link": "https://example.com"}, f)
+    with open(os.path.join(workdir, ".env"), "w") as f:
+        f.write(f"LLM_BACKEND=local\nLLM_BASE_URL={base_url}\nOPENAI_MAX_RETRIES={retries}\n")
+
+    from fpdf import FPDF
+    os.makedirs(os.path.join(workdir, "resumes"), exist_ok=True)
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Times", size=12)
+    pdf.multi_cell(0, 8, "Load Test\nload@example.com\n\nEXPERIENCE")
+    for i in range(40):
+        pdf.multi_cell(0, 8, f"- Built data pipeline {i} in Python and SQL on AWS, cutting costs by {i % 9 + 1}0%.")
+    path = os.path.join(workdir, "resumes", "load_test_resume.pdf")
+    pdf.output(path)
+    return path
+
+
+def start_server(args):
+    command = [sys.executable, SERVER, "--port", "0"]
+    for name in SERVER_OPTIONS:
+        value = getattr(args, name)
+        if value is not None:
+            command += [f"--{name.replace('_', '-')}", str(value)]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    line = server.stdout.readline()
+    if "http://" not in line:
+        server.kill()
+        raise SystemExit(f"Mock server did not start: {server.stderr.read()}")
+    return server, line.split()[4]
+
+
+def jobs(n):
+    return [{"title": f"Data Engineer {i}", "company": f"Loadtest Co {i}"} for i in range(n)]
+
+
+def run_jobs(args, resume_path):
+    from utils.cover_letter import run_cover_letter_job, create_job_folder
+
+    def one(job):
+        job_description = JOB_DESCRIPTION.format(**job)
+        payload = {
+            "folder": create_job_folder(job["company"], job["title"], job_description),
+            "resume_path": resume_path,
+            "job_description": job_description,
+            "title": job["title"],
+            "company": job["company"],
+            "stream": not args.no_stream,
+            "force_regenerate": True,
+        }
+        start = time.perf_counter()
+        try:
+            result = run_cover_letter_job(payload, lambda text: None)
+            return time.perf_counter() - start, None, result["api_calls"]
+        except Exception as e:
+            return time.perf_counter() - start, f"{type(e).__name__}: {e}", 0
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        return list(pool.map(one, jobs(args.n)))
+
+
+def run_batch_mode(args, resume_path):
+    from utils.batch import run_batch, batch_report
+    from utils.resume_digest import resume_for_prompt
+
+    batch_jobs = [dict(job, job_description=JOB_DESCRIPTION.format(**job)) for job in jobs(args.n)]
+    outcomes = []
+    start = time.perf_counter()
+
+    def on_result(done, total, result):
+        outcomes.append((time.perf_counter() - start, result["error"], result["api_calls"]))
+
+    results = asyncio.run(run_batch(batch_jobs, resume_for_prompt(resume_path), concurrency=args.concurrency, per_minute=0,
+                                    force_regenerate=True, on_result=on_result))
+    report = batch_report(results)
+    if len(report) != len(batch_jobs) or report["error"].notna().sum() != sum(1 for r in results if r["error"]):
+        raise RuntimeError("Batch results table does not match the results")
+    return outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["jobs", "batch"], default="jobs")
+    parser.add_argument("-n", type=int, default=20, help="letters to generate")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--no-stream", action="store_true", help="jobs mode: request whole replies instead of streams")
+    parser.add_argument("--retries", type=int, default=2, help="OPENAI_MAX_RETRIES for the run")
+    parser.add_argument("--latency-ms", type=float, default=None)
+    parser.add_argument("--jitter-ms", type=float, default=None)
+    parser.add_argument("--tokens-per-second", type=float, default=None)
+    parser.add_argument("--words", type=int, default=None)
+    parser.add_argument("--error-rate", type=float, default=None)
+    parser.add_argument("--rate-limit-rate", type=float, default=None)
+    parser.add_argument("--disconnect-rate", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-p95-ms", type=float, help="fail if the p95 latency is higher")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    server, base_url = start_server(args)
+    cwd = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            resume_path = seed(workdir, base_url, args.retries)
+            os.chdir(workdir)
+            start = time.perf_counter()
+            outcomes = run_jobs(args, resume_path) if args.mode == "jobs" else run_batch_mode(args, resume_path)
+            wall = time.perf_counter() - start
+            os.chdir(cwd)
+        with urllib.request.urlopen(f"{base_url}/stats", timeout=10) as response:
+            server_counts = json.load(response)
+    finally:
+        os.chdir(cwd)
+        server.terminate()
+        server.wait(timeout=10)
+
+    latencies = [seconds for seconds, error, _ in outcomes if error is None]
+    errors = [error for _, error, _ in outcomes if error is not None]
+    results = {
+        "mode": args.mode,
+        "letters": args.n,
+        "concurrency": args.concurrency,
+        "ok": len(latencies),
+        "failed": len(errors),
+        "wall_s": wall,
+        "letters_per_second": len(latencies) / wall if wall else 0.0,
+        "api_calls": sum(calls for _, _, calls in outcomes),
+        "latency_ms": {
+            "mean": statistics.mean(latencies) * 1000 if latencies else None,
+            "p50": percentile(latencies, 0.50) * 1000 if latencies else None,
+            "p95": percentile(latencies, 0.95) * 1000 if latencies else None,
+            "p99": percentile(latencies, 0.99) * 1000 if latencies else None,
+            "max": max(latencies) * 1000 if latencies else None,
+        },
+        "errors": sorted(set(errors)),
+        "server": server_counts,
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.n} letters, mode {args.mode}, concurrency {args.concurrency}")
+        print(f"ok {results['ok']}, failed {results['failed']}, {results['api_calls']} model calls, wall {wall:.2f} s")
+        print(f"throughput {results['letters_per_second']:.2f} letters/s")
+        if latencies:
+            latency = results["latency_ms"]
+            print(f"latency ms  mean {latency['mean']:.0f}  p50 {latency['p50']:.0f}  p95 {latency['p95']:.0f}  "
+                  f"p99 {latency['p99']:.0f}  max {latency['max']:.0f}")
+        if results["server"]:
+            print(f"server {results['server']}")
+        for error in results["errors"]:
+            print(f"  error: {error}")
+
+    # With --error-rate 1 every letter is meant to fail
+    failed = bool(errors) and not latencies and (args.error_rate or 0) < 1
+    if args.max_p95_ms is not None and latencies and results["latency_ms"]["p95"] > args.max_p95_ms:
+        print(f"p95 latency {results['latency_ms']['p95']:.0f} ms exceeds {args.max_p95_ms} ms", file=sys.stderr)
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
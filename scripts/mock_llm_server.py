@@ -0,0 +1,229 @@
+"""Mock chat-completions server for offline load tests.
+
+Speaks enough of the OpenAI chat-completions protocol for the app (plain and
+streamed replies with usage, /v1/models), with configurable latency, token
+rate and injected failures; /v1/stats counts requests and injected failures.
+Point the app at it by choosing the "Local" backend on the settings page
+(LLM_BASE_URL defaults to this server).
+
+    python scripts/mock_llm_server.py                          # http://127.0.0.1:8765/v1
+    python scripts/mock_llm_server.py --latency-ms 800 --jitter-ms 300
+    python scripts/mock_llm_server.py --tokens-per-second 40   # slow streaming
+    python scripts/mock_llm_server.py --error-rate 0.05 --rate-limit-rate 0.05
+
+Replies are cover-letter shaped filler text, so pages, PDFs and the archive
+behave as they would with a real model. No API credits or network needed.
+"""
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "experience team product data systems built led improved customers design delivered scalable "
+    "reliable platform engineering results impact collaborate growth role mission passionate excited "
+    "skills projects performance quality users services analytics ownership learning"
+).split()
+
+
+def letter_text(rng, words, last_message):
+    body = []
+    for _ in range(max(words // 60, 1)):
+        sentences = []
+        for _ in range(4):
+            sentence = " ".join(rng.choice(WORDS) for _ in range(14))
+            sentences.append(sentence.capitalize() + ".")
+        body.append(" ".join(sentences))
+    # Shortening requests ("must fit on N page(s)") get a shorter reply
+    if "must fit on" in last_message:
+        body = body[:max(len(body) // 2, 1)]
+    return "Dear Hiring Manager,\n\n" + "\n\n".join(body) + "\n\nSincerely,\nMock Model"
+
+
+def tokenize(text):
+    # Whitespace-preserving pieces, roughly one per word like a real stream
+    pieces, start = [], 0
+    for i, char in enumerate(text):
+        if char == " " and i > start:
+            pieces.append(text[start:i + 1])
+            start = i + 1
+    pieces.append(text[start:])
+    return [p for p in pieces if p]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.options.verbose:
+            super().log_message(format, *args)
+
+    def _json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message, kind, headers=None):
+        self._json(status, {"error": {"message": message, "type": kind, "code": None}}, headers)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._json(200, {"object": "list", "data": [{"id": self.server.options.model, "object": "model", "owned_by": "mock"}]})
+        elif self.path.rstrip("/").endswith("/stats"):
+            self._json(200, self.server.counts)
+        else:
+            self._error(404, "Not found", "invalid_request_error")
+
+    def do_POST(self):
+        options = self.server.options
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._error(400, "Invalid JSON body", "invalid_request_error")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._error(404, "Not found", "invalid_request_error")
+
+        rng = self.server.next_rng()
+        self.server.count("requests")
+        delay = max(options.latency_ms + rng.uniform(-options.jitter_ms, options.jitter_ms), 0) / 1000
+        time.sleep(delay)
+
+        roll = rng.random()
+        if roll < options.rate_limit_rate:
+            self.server.count("rate_limited")
+            return self._error(429, "Rate limit reached (mock)", "rate_limit_error", {"Retry-After": str(options.retry_after)})
+        roll -= options.rate_limit_rate
+        if roll < options.error_rate:
+            self.server.count("errors")
+            return self._error(500, "Internal server error (mock)", "server_error")
+        roll -= options.error_rate
+        disconnect = roll < options.disconnect_rate
+
+        messages = request.get("messages") or []
+        last_message = str(messages[-1].get("content", "")) if messages else ""
+        text = letter_text(rng, options.words, last_message)
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(text) // 4, "total_tokens": prompt_tokens + len(text) // 4}
+        reply_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        model = request.get("model") or options.model
+
+        if request.get("stream"):
+            self._stream(reply_id, model, text, usage, disconnect)
+        elif disconnect:
+            self.server.count("disconnects")
+            self.close_connection = True
+        else:
+            self._json(200, {
+                "id": reply_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+    def _stream(self, reply_id, model, text, usage, disconnect):
+        options = self.server.options
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        # Chunked, so a dropped connection shows up as an incomplete body
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write(data):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+        def send(payload):
+            write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+
+        def chunk(delta, finish_reason=None, usage=None):
+            payload = {
+                "id": reply_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            if usage:
+                payload["usage"] = usage
+            return payload
+
+        pieces = tokenize(text)
+        pause = 1.0 / options.tokens_per_second if options.tokens_per_second else 0.0
+        # Disconnects happen part-way through, like a dropped connection
+        cut = len(pieces) // 2 if disconnect else None
+        try:
+            send(chunk({"role": "assistant", "content": ""}))
+            for i, piece in enumerate(pieces):
+                if cut is not None and i == cut:
+                    self.server.count("disconnects")
+                    self.close_connection = True
+                    return
+                send(chunk({"content": piece}))
+                if pause:
+                    time.sleep(pause)
+            send(chunk({}, "stop", usage))
+            write(b"data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, options):
+        super().__init__(address, Handler)
+        self.options = options
+        self.seed_rng = random.Random(options.seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "rate_limited": 0, "errors": 0, "disconnects": 0}
+
+    # Per-request generator, drawn under a lock so runs with --seed repeat
+    def next_rng(self):
+        with self.lock:
+            return random.Random(self.seed_rng.random())
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--model", default="mock-gpt", help="model name reported by /v1/models")
+    parser.add_argument("--latency-ms", type=float, default=300, help="time before the first byte of every reply")
+    parser.add_argument("--jitter-ms", type=float, default=100, help="latency varies uniformly by up to this much")
+    parser.add_argument("--tokens-per-second", type=float, default=0, help="streaming speed (0 = as fast as possible)")
+    parser.add_argument("--words", type=int, default=300, help="approximate length of each reply")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with HTTP 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0, help="share of requests dropped mid-reply")
+    parser.add_argument("--seed", type=int, default=None, help="make replies and injected failures repeatable")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    options = parser.parse_args()
+
+    server = MockServer((options.host, options.port), options)
+    host, port = server.server_address[:2]
+    print(f"Mock LLM server on http://{host}:{port}/v1 (Ctrl+C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n{json.dumps(server.counts)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
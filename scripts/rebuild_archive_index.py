@@ -0,0 +1,39 @@
+"""Rebuild or refresh the full-text search index over cover_letters/.
+
+Letters generated in the app are indexed as they are saved. Run this once
+for an archive that existed before the index, or after copying folders in
+by hand:
+
+    python scripts/rebuild_archive_index.py          # index new/changed folders
+    python scripts/rebuild_archive_index.py --full   # drop and rebuild everything
+    python scripts/rebuild_archive_index.py --tenant alice@example.com   # one user's archive
+
+Run it from the repository root.
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import archive_index, tenants
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--full", action="store_true", help="drop the index and re-read every folder")
+    parser.add_argument("--tenant", help="user id whose archive to index, when the server runs with TENANT_IDENTITY")
+    args = parser.parse_args()
+
+    with tenants.use_tenant(args.tenant):
+        start = time.perf_counter()
+        changed, removed = archive_index.sync_index(full=args.full)
+        elapsed = time.perf_counter() - start
+
+        print(f"Indexed {changed} folder(s), removed {removed}, {archive_index.count_letters()} letters total ({elapsed:.2f}s)")
+        print(f"Index: {archive_index.db_file()}")
+
+
+if __name__ == "__main__":
+    main()
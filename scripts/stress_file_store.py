@@ -0,0 +1,202 @@
+"""Stress test for utils/file_store.py: many concurrent writers on one file.
+
+Starts several processes with several threads each in a throwaway folder.
+Every writer repeatedly
+
+  increments its own counter and a shared total in one JSON file (update_json)
+  saves its own setting to one .env file (env_settings.save_env_value)
+
+while a reader thread in each process keeps parsing the JSON file. At the
+end every increment and every setting must be there, and no read may have
+seen a half-written file. --unsafe runs the same load with plain
+open("w") read-modify-write, which is what the locked writes replace.
+
+    python scripts/stress_file_store.py                      # 4 processes x 4 threads x 50 updates
+    python scripts/stress_file_store.py --processes 8 --iterations 200
+    python scripts/stress_file_store.py --unsafe             # show lost updates without locking
+
+Run it from the repository root.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import statistics
+import multiprocessing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+COUNTER_FILE = os.path.join("data", "counter.json")
+
+
+def _unsafe_increment(key):
+    try:
+        with open(COUNTER_FILE, "r", encoding="utf-8") as f:
+            counter = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        counter = {}
+    counter[key] = counter.get(key, 0) + 1
+    counter["total"] = counter.get("total", 0) + 1
+    with open(COUNTER_FILE, "w", encoding="utf-8") as f:
+        json.dump(counter, f, indent=2)
+
+
+def _unsafe_save_env(name, value):
+    lines = []
+    if os.path.exists(".env"):
+        with open(".env", "r") as f:
+            lines = [line for line in f.readlines() if not line.startswith(f"{name}=")]
+    lines.append(f"{name}={value}\n")
+    with open(".env", "w") as f:
+        f.writelines(lines)
+
+
+def _writer(process, thread, iterations, unsafe, waits, errors):
+    from utils import file_store
+    from utils.env_settings import save_env_value
+
+    key = f"w{process}_{thread}"
+
+    def increment(counter):
+        counter[key] = counter.get(key, 0) + 1
+        counter["total"] = counter.get("total", 0) + 1
+
+    for i in range(iterations):
+        start = time.perf_counter()
+        try:
+            if unsafe:
+                _unsafe_increment(key)
+                _unsafe_save_env(f"STRESS_{key.upper()}", i)
+            else:
+                file_store.update_json(COUNTER_FILE, increment, default={})
+                save_env_value(f"STRESS_{key.upper()}", i)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+        waits.append((time.perf_counter() - start) * 1000)
+
+
+# Parse the file with a plain open() the whole time writers are busy
+def _reader(stop, reads, bad_reads):
+    while not stop.is_set():
+        try:
+            with open(COUNTER_FILE, "r", encoding="utf-8") as f:
+                json.load(f)
+            reads[0] += 1
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            bad_reads[0] += 1
+
+
+def _process(process, threads, iterations, unsafe, queue):
+    waits, errors = [], []
+    reads, bad_reads = [0], [0]
+    stop = threading.Event()
+    reader = threading.Thread(target=_reader, args=(stop, reads, bad_reads))
+    reader.start()
+    workers = [
+        threading.Thread(target=_writer, args=(process, thread, iterations, unsafe, waits, errors))
+        for thread in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    stop.set()
+    reader.join()
+    queue.put({"waits": waits, "errors": errors, "reads": reads[0], "bad_reads": bad_reads[0]})
+
+
+def _check(processes, threads, iterations):
+    from utils import file_store
+    from utils.env_settings import load_env_value
+
+    counter = file_store.read_json(COUNTER_FILE, {})
+    expected_total = processes * threads * iterations
+    lost_increments = expected_total - counter.get("total", 0)
+    wrong_counters = sum(
+        1 for p in range(processes) for t in range(threads) if counter.get(f"w{p}_{t}") != iterations
+    )
+    missing_settings = sum(
+        1 for p in range(processes) for t in range(threads)
+        if load_env_value(f"STRESS_W{p}_{t}".upper(), None) != str(iterations - 1)
+    )
+    leftovers = [name for name in os.listdir("data") + os.listdir(".") if name.endswith(".tmp")]
+    return {
+        "expected_total": expected_total,
+        "total": counter.get("total", 0),
+        "lost_increments": lost_increments,
+        "wrong_counters": wrong_counters,
+        "missing_settings": missing_settings,
+        "temp_files_left": len(leftovers),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=4, help="writer processes")
+    parser.add_argument("--threads", type=int, default=4, help="writer threads per process")
+    parser.add_argument("--iterations", type=int, default=50, help="updates per writer")
+    parser.add_argument("--unsafe", action="store_true", help="use plain open('w') writes instead of utils/file_store.py")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            os.makedirs("data")
+            context = multiprocessing.get_context("spawn")
+            queue = context.Queue()
+            start = time.perf_counter()
+            processes = [
+                context.Process(target=_process, args=(p, args.threads, args.iterations, args.unsafe, queue))
+                for p in range(args.processes)
+            ]
+            for process in processes:
+                process.start()
+            reports = [queue.get() for _ in processes]
+            for process in processes:
+                process.join()
+            elapsed = time.perf_counter() - start
+            results = _check(args.processes, args.threads, args.iterations)
+        finally:
+            os.chdir(cwd)
+
+    waits = sorted(w for report in reports for w in report["waits"])
+    errors = [e for report in reports for e in report["errors"]]
+    results.update({
+        "mode": "unsafe" if args.unsafe else "file_store",
+        "writers": args.processes * args.threads,
+        "elapsed_s": elapsed,
+        "updates_per_s": len(waits) / elapsed,
+        "update_p50_ms": statistics.median(waits) if waits else 0.0,
+        "update_p95_ms": waits[int(len(waits) * 0.95) - 1] if waits else 0.0,
+        "update_max_ms": waits[-1] if waits else 0.0,
+        "reads": sum(report["reads"] for report in reports),
+        "bad_reads": sum(report["bad_reads"] for report in reports),
+        "errors": len(errors),
+    })
+    ok = not any(results[name] for name in ["lost_increments", "wrong_counters", "missing_settings", "bad_reads", "errors", "temp_files_left"])
+
+    if args.json:
+        print(json.dumps(dict(results, ok=ok), indent=2))
+    else:
+        print(f"{results['mode']}: {results['writers']} writers ({args.processes} processes x {args.threads} threads), "
+              f"{args.iterations} updates each, {elapsed:.1f} s ({results['updates_per_s']:.0f} updates/s)")
+        print(f"update (JSON + .env) p50 {results['update_p50_ms']:.1f} ms, p95 {results['update_p95_ms']:.1f} ms, max {results['update_max_ms']:.1f} ms")
+        print(f"increments  {results['total']:,} of {results['expected_total']:,} ({results['lost_increments']:,} lost)")
+        print(f"settings    {results['missing_settings']} missing or stale, counters wrong: {results['wrong_counters']}")
+        print(f"reads       {results['reads']:,} ({results['bad_reads']:,} saw a partial file)")
+        print(f"errors      {results['errors']}" + (f" (first: {errors[0]})" if errors else ""))
+        print(f"temp files  {results['temp_files_left']} left behind")
+        print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
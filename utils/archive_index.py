@@ -0,0 +1,255 @@
+import os
+import re
+import sqlite3
+import datetime
+from contextlib import contextmanager
+
+from utils.cover_letter import output_folder, extract_title_and_company, sanitize_filename
+from utils.tenants import tenant_path
+
+# Full-text index over the cover letter archive. Every folder under
+# cover_letters/ becomes one row with company, title and timestamp parsed from
+# the folder name, plus the job description and letter text in an FTS5 table.
+# Folders are indexed when a letter is saved; sync_index() picks up anything
+# added, edited or removed outside the app by comparing file mtimes. Job
+# descriptions are passed on to utils/near_duplicates.py as well.
+DATA_DIR = "data"
+DB_NAME = "archive_index.db"
+
+JOB_DESCRIPTION_FILE = "job_description.txt"
+COVER_LETTER_FILE = "cover_letter.txt"
+
+# <company>_<title>_<YYYYMMDD>_<HHMMSS>[_<n>] (see create_job_folder)
+FOLDER_PATTERN = re.compile(r'^(?P<name>.+)_(?P<date>\d{8})_(?P<time>\d{6})(?:_\d+)?$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS letters (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    folder TEXT NOT NULL UNIQUE,
+    company TEXT,
+    title TEXT,
+    created_at TEXT,
+    signature TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS letters_created ON letters (created_at);
+CREATE INDEX IF NOT EXISTS letters_company ON letters (company);
+CREATE VIRTUAL TABLE IF NOT EXISTS letters_fts USING fts5 (
+    company, title, job_description, cover_letter,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+"""
+
+_initialized = set()
+
+
+# Database of the current tenant (see utils/tenants.py)
+def db_file():
+    return tenant_path(DATA_DIR, DB_NAME)
+
+
+@contextmanager
+def _connect():
+    conn = sqlite3.connect(db_file(), timeout=10)
+    conn.row_factory = sqlite3.Row
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def init_index():
+    db = db_file()
+    if db in _initialized and os.path.exists(db):
+        return
+    os.makedirs(os.path.dirname(db), exist_ok=True)
+    conn = sqlite3.connect(db, timeout=10)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.executescript(SCHEMA)
+    finally:
+        conn.close()
+    _initialized.add(db)
+
+
+def _read(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return ""
+
+
+# mtimes of the folder and its text files; a change means re-index
+def _signature(folder):
+    parts = []
+    for path in (folder, os.path.join(folder, JOB_DESCRIPTION_FILE), os.path.join(folder, COVER_LETTER_FILE)):
+        try:
+            parts.append(str(os.stat(path).st_mtime_ns))
+        except FileNotFoundError:
+            parts.append("-")
+    return ":".join(parts)
+
+
+# Company, title and timestamp from the folder name. Company and title are
+# both sanitized with underscores, so the split between them is taken from
+# the job description when its parsed names match the folder name; otherwise
+# the first underscore separates them.
+def parse_folder_name(folder_name, job_description=""):
+    match = FOLDER_PATTERN.match(folder_name)
+    if not match:
+        return None, None, None
+    name = match.group("name")
+    created_at = datetime.datetime.strptime(match.group("date") + match.group("time"), "%Y%m%d%H%M%S")
+
+    if job_description:
+        title, company = extract_title_and_company(job_description)
+        if f"{sanitize_filename(company)}_{sanitize_filename(title)}" == name:
+            return company, title, created_at.strftime("%Y-%m-%d %H:%M:%S")
+
+    company, _, title = name.partition("_")
+    return (
+        company.replace("_", " ").title(),
+        title.replace("_", " ").title(),
+        created_at.strftime("%Y-%m-%d %H:%M:%S"),
+    )
+
+
+# Returns (folder, job_description, label) for the near-duplicate index
+def _index_folder(conn, folder, signature=None):
+    job_description = _read(os.path.join(folder, JOB_DESCRIPTION_FILE))
+    cover_letter = _read(os.path.join(folder, COVER_LETTER_FILE))
+    company, title, created_at = parse_folder_name(os.path.basename(folder), job_description)
+    signature = signature or _signature(folder)
+
+    row = conn.execute("SELECT id FROM letters WHERE folder = ?", (folder,)).fetchone()
+    if row:
+        letter_id = row["id"]
+        conn.execute(
+            "UPDATE letters SET company = ?, title = ?, created_at = ?, signature = ? WHERE id = ?",
+            (company, title, created_at, signature, letter_id),
+        )
+        conn.execute("DELETE FROM letters_fts WHERE rowid = ?", (letter_id,))
+    else:
+        letter_id = conn.execute(
+            "INSERT INTO letters (folder, company, title, created_at, signature) VALUES (?, ?, ?, ?, ?)",
+            (folder, company, title, created_at, signature),
+        ).lastrowid
+    conn.execute(
+        "INSERT INTO letters_fts (rowid, company, title, job_description, cover_letter) VALUES (?, ?, ?, ?, ?)",
+        (letter_id, company, title, job_description, cover_letter),
+    )
+    return folder, job_description, f"{company} – {title} ({created_at})"
+
+
+def _remove(conn, letter_id):
+    conn.execute("DELETE FROM letters_fts WHERE rowid = ?", (letter_id,))
+    conn.execute("DELETE FROM letters WHERE id = ?", (letter_id,))
+
+
+# Add or refresh one archive folder (called whenever a letter is saved)
+def index_folder(folder):
+    from utils import near_duplicates
+
+    init_index()
+    with _connect() as conn:
+        indexed = _index_folder(conn, os.path.normpath(folder))
+    near_duplicates.index_folders([indexed])
+
+
+# Bring the index in line with the archive on disk. Only folders whose
+# mtimes changed are read again. Returns (added_or_updated, removed).
+def sync_index(full=False):
+    from utils import near_duplicates
+
+    init_index()
+    on_disk = {}
+    base_folder = output_folder()
+    if os.path.isdir(base_folder):
+        for entry in os.scandir(base_folder):
+            if entry.is_dir():
+                folder = os.path.normpath(entry.path)
+                on_disk[folder] = _signature(folder)
+
+    with _connect() as conn:
+        if full:
+            conn.execute("DELETE FROM letters_fts")
+            conn.execute("DELETE FROM letters")
+        indexed = {row["folder"]: (row["id"], row["signature"]) for row in conn.execute("SELECT id, folder, signature FROM letters")}
+
+        changed = []
+        for folder, signature in on_disk.items():
+            if folder not in indexed or indexed[folder][1] != signature:
+                changed.append(_index_folder(conn, folder, signature))
+
+        removed = []
+        for folder, (letter_id, _) in indexed.items():
+            if folder not in on_disk:
+                _remove(conn, letter_id)
+                removed.append(folder)
+
+        if full:
+            conn.execute("INSERT INTO letters_fts (letters_fts) VALUES ('optimize')")
+
+    if full:
+        near_duplicates.clear_archive()
+    if changed:
+        near_duplicates.index_folders(changed)
+    if removed:
+        near_duplicates.remove_folders(removed)
+    return len(changed), len(removed)
+
+
+# Turn free text into an FTS5 query: every word must match, the last one as a
+# prefix so results show up while typing
+def _match_expression(query):
+    words = re.findall(r'\w+', query)
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words[:-1]] + [f'"{words[-1]}"*']
+    return " ".join(terms)
+
+
+# Search the archive. An empty query lists the most recent letters.
+# Returns dicts with folder, company, title, created_at and snippet.
+def search(query, company=None, limit=50):
+    init_index()
+    match = _match_expression(query)
+    params = []
+    company_filter = ""
+    if company:
+        company_filter = "AND letters.company = ?"
+        params.append(company)
+
+    with _connect() as conn:
+        if match is None:
+            rows = conn.execute(
+                f"SELECT folder, company, title, created_at, '' AS snippet FROM letters "
+                f"WHERE 1 = 1 {company_filter} ORDER BY created_at DESC LIMIT ?",
+                params + [limit],
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT letters.folder, letters.company, letters.title, letters.created_at, "
+                "snippet(letters_fts, -1, '**', '**', ' … ', 16) AS snippet "
+                "FROM letters_fts JOIN letters ON letters.id = letters_fts.rowid "
+                f"WHERE letters_fts MATCH ? {company_filter} "
+                "ORDER BY bm25(letters_fts, 4.0, 4.0, 1.0, 1.0) LIMIT ?",
+                [match] + params + [limit],
+            ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def list_companies():
+    init_index()
+    with _connect() as conn:
+        rows = conn.execute("SELECT DISTINCT company FROM letters WHERE company IS NOT NULL ORDER BY company").fetchall()
+    return [row["company"] for row in rows]
+
+
+def count_letters():
+    init_index()
+    with _connect() as conn:
+        return conn.execute("SELECT COUNT(*) FROM letters").fetchone()[0]
@@ -0,0 +1,192 @@
+import io
+import os
+import re
+import csv
+import json
+import time
+import asyncio
+
+from utils import tenants, file_store
+from utils.llm_cache import get_cached_response, store_response
+from utils.llm_backend import get_backend
+from utils.pdf_renderer import load_template, render_many
+from utils.resume_digest import fit_prompt_budget
+from utils.metrics import span, record
+from utils.cover_letter import (
+    extract_title_and_company,
+    create_job_folder,
+    build_messages,
+    fit_to_page_limit,
+    save_cover_letter,
+)
+
+# Columns of the results table shown after a batch
+REPORT_COLUMNS = ["index", "company", "title", "folder", "cached", "pages", "api_calls", "render_passes", "error"]
+
+# Pasted postings are separated by a line of three or more dashes
+BLOCK_SEPARATOR = re.compile(r'^\s*-{3,}\s*$', re.MULTILINE)
+
+
+# Split pasted text into one job per block
+def parse_pasted_jobs(text):
+    jobs = []
+    for block in BLOCK_SEPARATOR.split(text):
+        if block.strip():
+            jobs.append({"job_description": block.strip(), "title": "", "company": ""})
+    return jobs
+
+
+# Read jobs from an uploaded CSV or JSONL file. Each row needs a
+# `job_description` and may set `title` and `company`.
+def parse_uploaded_jobs(file_name, data):
+    text = data.decode("utf-8-sig")
+    if file_name.lower().endswith(".jsonl"):
+        rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        rows = list(csv.DictReader(io.StringIO(text)))
+
+    jobs = []
+    for i, row in enumerate(rows, start=1):
+        job_description = (row.get("job_description") or "").strip()
+        if not job_description:
+            raise ValueError(f"Row {i} has no `job_description`.")
+        jobs.append({
+            "job_description": job_description,
+            "title": (row.get("title") or "").strip(),
+            "company": (row.get("company") or "").strip(),
+        })
+    return jobs
+
+
+# Spaces out request starts so at most `per_minute` requests begin per minute
+class RateLimiter:
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def _request(session, semaphore, limiter, messages):
+    async with semaphore:
+        await limiter.wait()
+        return await session.complete(messages)
+
+
+async def _generate_one(session, cache_model, semaphore, limiter, template, job, resume_text, force_regenerate):
+    title = job["title"]
+    company = job["company"]
+    if not title or not company:
+        parsed_title, parsed_company = extract_title_and_company(job["job_description"])
+        title = title or parsed_title
+        company = company or parsed_company
+
+    session_folder = create_job_folder(company, title, job["job_description"])
+    with span("prompt.build", batch=True) as fields:
+        job_resume_text, job_description = fit_prompt_budget(resume_text, job["job_description"])
+        messages = build_messages(title, company, job_description, job_resume_text)
+        fields["chars"] = sum(len(m["content"]) for m in messages)
+    cover_letter = None if force_regenerate else get_cached_response(messages, cache_model)
+    cached = cover_letter is not None
+    stats = {"api_calls": 0, "render_passes": 0}
+
+    if not cached:
+        cover_letter = await _request(session, semaphore, limiter, messages)
+        stats["api_calls"] += 1
+
+    # Page measurement runs off the event loop; shortening requests are sent
+    # back to it so they share the concurrency and rate limits
+    loop = asyncio.get_running_loop()
+
+    def complete(request):
+        return asyncio.run_coroutine_threadsafe(_request(session, semaphore, limiter, request), loop).result()
+
+    fitted, line_height, pages = await asyncio.to_thread(
+        fit_to_page_limit, template, messages, cover_letter, company, None if cached else complete, stats
+    )
+    if fitted != cover_letter or not cached:
+        store_response(messages, cache_model, fitted)
+
+    return {
+        "title": title, "company": company, "folder": session_folder, "cover_letter": fitted, "cached": cached,
+        "line_height": line_height, "pages": pages, **stats,
+    }
+
+
+# Generate a letter for every job with at most `concurrency` requests in flight
+# and at most `per_minute` request starts per minute. `on_result(done, total, result)`
+# is called as each letter comes back; failures are returned instead of raised.
+# Successful results carry the rendered `pdf_bytes`.
+async def run_batch(jobs, resume_text, concurrency=5, per_minute=60, force_regenerate=False, on_result=None):
+    # The worker threads below have no session, so they get the tenant from here
+    with tenants.use_tenant(tenants.current_tenant()):
+        limit = tenants.max_concurrency()
+        if limit is not None:
+            concurrency = min(concurrency, limit)
+        return await _run_batch(jobs, resume_text, concurrency, per_minute, force_regenerate, on_result)
+
+
+async def _run_batch(jobs, resume_text, concurrency, per_minute, force_regenerate, on_result):
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(per_minute)
+    start = time.perf_counter()
+    results = [None] * len(jobs)
+    template = load_template()
+    backend = get_backend()
+
+    async with backend.async_session() as session:
+        async def run(index, job):
+            try:
+                result = await _generate_one(session, backend.cache_model(), semaphore, limiter, template, job, resume_text, force_regenerate)
+                result["error"] = None
+            except Exception as e:
+                result = {
+                    "title": job["title"], "company": job["company"], "folder": None, "cover_letter": None, "cached": False,
+                    "line_height": None, "pages": None, "api_calls": 0, "render_passes": 0, "error": str(e),
+                }
+            result["index"] = index + 1
+            results[index] = result
+            return result
+
+        tasks = [asyncio.create_task(run(i, job)) for i, job in enumerate(jobs)]
+        for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+            result = await task
+            if on_result:
+                on_result(done, len(jobs), result)
+
+    # Render every PDF in one pass (across processes for big batches), off
+    # the event loop, then save them. A letter that fails to render or save
+    # is reported on its own row; its text is still saved when possible.
+    finished = [r for r in results if not r["error"]]
+    letters = [(r["cover_letter"], r["company"], r["line_height"]) for r in finished]
+    with span("pdf.render_batch", letters=len(letters)):
+        pdfs = await asyncio.to_thread(render_many, letters, template)
+    for result, (pdf_bytes, render_error) in zip(finished, pdfs):
+        try:
+            if render_error:
+                file_store.write_text(os.path.join(result["folder"], "cover_letter.txt"), result["cover_letter"])
+                result["error"] = f"PDF rendering failed ({render_error}); the text was saved"
+                continue
+            result["pdf_bytes"] = pdf_bytes
+            result["render_passes"] += 1
+            result["pdf_path"] = save_cover_letter(result["folder"], result["cover_letter"], result["company"], pdf_bytes)
+        except Exception as e:
+            result.pop("pdf_bytes", None)
+            result["error"] = f"Saving failed: {e}"
+    failed = sum(1 for r in results if r["error"])
+    record("batch.run", (time.perf_counter() - start) * 1000, letters=len(jobs), failed=failed)
+    return results
+
+
+# Results table for run_batch's results (missing columns are left empty)
+def batch_report(results):
+    import pandas as pd
+
+    return pd.DataFrame(results).reindex(columns=REPORT_COLUMNS)
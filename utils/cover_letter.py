@@ -0,0 +1,293 @@
+import os
+import re
+import time
+import datetime
+
+from utils import file_store
+from utils.tenants import tenant_path
+
+# Shared pieces of the cover letter pipeline, used by the single and batch
+# generator pages and the background generation job.
+COMMON_INFO_FILE = "data/common_info.json"
+BASE_OUTPUT_FOLDER = "cover_letters"
+
+# How many times a letter that runs over the page limit is sent back to the
+# model before the layout is compacted instead
+MAX_SHORTEN_ATTEMPTS = 2
+
+
+# common_info.json and the letter archive of the current tenant
+def common_info_file():
+    return tenant_path(COMMON_INFO_FILE)
+
+
+def output_folder():
+    return tenant_path(BASE_OUTPUT_FOLDER)
+
+
+# Load name/email/website from common_info.json
+def load_user_info():
+    common_info = file_store.read_json(common_info_file(), {})
+
+    first_name = common_info.get("first_name", "").strip()
+    last_name = common_info.get("last_name", "").strip()
+    return {
+        "name": f"{first_name} {last_name}".strip(),
+        "email": common_info.get("email", "").strip(),
+        "website": common_info.get("link", "").strip(),
+    }
+
+
+# Extract title and company from job description text (see utils/jd_parser.py),
+# with placeholder names when they can't be found
+def extract_title_and_company(job_description):
+    from utils.jd_parser import parse_job_description, title_and_company
+
+    return title_and_company(parse_job_description(job_description))
+
+
+# Sanitize strings for folder/file names
+def sanitize_filename(s):
+    s = s.lower()
+    s = re.sub(r'\s+', '_', s)
+    s = re.sub(r'[^\w\-]', '', s)  # remove everything except letters, digits, underscore, hyphen
+    return s
+
+
+# Create cover_letters/<company>_<title>_<timestamp> and save the job description in it.
+# A numeric suffix is added when several letters for the same job land in the same second.
+def create_job_folder(company, title, job_description_text):
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    folder_name = f"{sanitize_filename(company)}_{sanitize_filename(title)}_{timestamp}"
+    base_folder = output_folder()
+    session_folder = os.path.join(base_folder, folder_name)
+
+    suffix = 1
+    while True:
+        try:
+            os.makedirs(session_folder)
+            break
+        except FileExistsError:
+            suffix += 1
+            session_folder = os.path.join(base_folder, f"{folder_name}_{suffix}")
+
+    file_store.write_text(os.path.join(session_folder, "job_description.txt"), job_description_text)
+    return session_folder
+
+
+# Prepare prompt
+def build_messages(title, company, job_description_text, resume_text):
+    role_description = (
+        f"You are a cover letter generator with 20 years of experience. "
+        f"Your task is to create a professional and concise cover letter body only, starting with the salutation (e.g., 'Dear Hiring Committee,') and ending before the signature or any closing formalities. "
+        f"Do NOT include your name, contact information, date, enclosure lines, or signature. "
+        f"Focus only on the core letter content tailored for the position of '{title}' at '{company}'."
+    )
+
+    structure = (
+        "To compose a compelling cover letter, scrutinize the job description for key qualifications. "
+        "Begin with a succinct introduction about the candidate's identity and career goals. "
+        "Highlight skills aligned with the job, underpinned by tangible examples. "
+        "Incorporate details about the company, emphasizing its mission or unique aspects that align with the candidate's values. "
+        "Conclude by reaffirming the candidate's suitability, inviting further discussion. "
+        "Do not make anything up, but feel free to use neighboring examples based on my resume. "
+        "Use job-specific terminology and maintain a professional style suitable for the job role. "
+        "Please provide your response in under 250 words."
+    )
+
+    content = f"{role_description}\n\n{structure}\n\nJob Description:\n{job_description_text}\n\nResume:\n{resume_text}"
+
+    return [
+        {"role": "system", "content": role_description},
+        {"role": "user", "content": content + "\n\nPlease do NOT include any placeholders like '[Your Name]' or signature lines."}
+    ]
+
+
+# PDFs are rendered in memory; copies go into the job folder only when
+# archiving is on (settings page, ARCHIVE_PDFS in .env)
+def archive_enabled():
+    from utils.env_settings import load_env_value
+
+    return load_env_value("ARCHIVE_PDFS", "1") == "1"
+
+
+# Page limit for a letter (MAX_LETTER_PAGES in .env, settings page)
+def max_letter_pages():
+    from utils.env_settings import load_int
+
+    return max(1, load_int("MAX_LETTER_PAGES", 2))
+
+
+# Messages asking the model to shorten a letter that ran over the page limit
+def shorten_messages(messages, cover_letter, pages, max_pages):
+    words = len(cover_letter.split())
+    target_words = max(80, int(words * max_pages / pages * 0.85))
+    return messages + [
+        {"role": "assistant", "content": cover_letter},
+        {"role": "user", "content": (
+            f"This letter fills {pages} pages but must fit on {max_pages}. "
+            f"Rewrite it in at most {target_words} words, keeping the same structure and facts. "
+            "Return only the letter body."
+        )}
+    ]
+
+
+# Measure the letter and, while it is over the page limit, ask complete(messages)
+# for a shorter version (at most MAX_SHORTEN_ATTEMPTS times), then fall back
+# to tighter line spacing (also used when a shortening call fails). With
+# complete=None (a cached letter, already shortened when it was generated)
+# no request is made and only the spacing is tightened. Updates
+# stats["api_calls"] (successful calls only) / stats["render_passes"] and
+# returns (cover_letter, line_height, pages).
+def fit_to_page_limit(template, messages, cover_letter, company, complete, stats):
+    from utils.pdf_renderer import LINE_HEIGHT
+    from utils.metrics import record
+
+    start = time.perf_counter()
+    max_pages = max_letter_pages()
+    pages = template.page_count(cover_letter, company)
+    stats["render_passes"] += 1
+
+    attempts = 0
+    while complete is not None and pages > max_pages and attempts < MAX_SHORTEN_ATTEMPTS:
+        attempts += 1
+        try:
+            cover_letter = complete(shorten_messages(messages, cover_letter, pages, max_pages))
+        except Exception:
+            break  # keep the long letter and compact it below
+        stats["api_calls"] += 1
+        pages = template.page_count(cover_letter, company)
+        stats["render_passes"] += 1
+
+    line_height = LINE_HEIGHT
+    if pages > max_pages:
+        line_height, pages, passes = template.compact_to_fit(cover_letter, company, max_pages)
+        stats["render_passes"] += passes
+    # Includes the shortening requests, which are also timed as llm.request
+    record("letter.fit_pages", (time.perf_counter() - start) * 1000, pages=pages, shorten_attempts=attempts)
+    return cover_letter, line_height, pages
+
+
+# Save cover_letter.txt into the job folder, plus the PDF when archiving is
+# on, and update the archive search index. Returns the PDF path, or None when
+# it wasn't written.
+def save_cover_letter(session_folder, cover_letter, company, pdf_bytes=None, line_height=None):
+    from utils.pdf_renderer import load_template, LINE_HEIGHT
+    from utils.archive_index import index_folder
+    from utils.metrics import span
+
+    cover_letter_path = os.path.join(session_folder, "cover_letter.txt")
+    with span("letter.write", file="txt"):
+        file_store.write_text(cover_letter_path, cover_letter)
+
+    partial_path = os.path.join(session_folder, "cover_letter.partial.txt")
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+
+    pdf_path = None
+    if archive_enabled():
+        template = load_template()
+        if pdf_bytes is None:
+            with span("pdf.render"):
+                pdf_bytes = template.render(cover_letter, company, line_height=line_height or LINE_HEIGHT)
+        pdf_path = os.path.join(session_folder, template.pdf_filename(company))
+        with span("letter.write", file="pdf"):
+            file_store.write_bytes(pdf_path, pdf_bytes)
+
+    with span("archive.index"):
+        index_folder(session_folder)
+    return pdf_path
+
+
+# Messages asking the model to finish a letter that was cut off
+def continuation_messages(messages, partial_text):
+    return messages + [
+        {"role": "assistant", "content": partial_text},
+        {"role": "user", "content": "Continue the cover letter exactly where it stopped. Do not repeat any text that was already written."}
+    ]
+
+
+# Call the model, streaming into `received` when asked so a failed stream
+# still leaves the text received so far. report(text) is called as tokens
+# arrive (a few times per second at most).
+def _complete(backend, messages, stream_output, received, report):
+    if not stream_output:
+        received.append(backend.complete(messages))
+        return
+
+    last_report = 0.0
+    try:
+        for delta in backend.stream(messages):
+            received.append(delta)
+            if time.monotonic() - last_report > 0.25:
+                report("".join(received))
+                last_report = time.monotonic()
+    finally:
+        report("".join(received))
+
+
+# Background job (see utils/jobs.py): generate, fit to the page limit, cache
+# and save one letter.
+# payload: folder, resume_path, job_description, title, company, stream,
+# force_regenerate and optionally prefix (partial letter to continue).
+def run_cover_letter_job(payload, report):
+    from utils.resume_digest import resume_for_prompt, fit_prompt_budget
+    from utils.llm_cache import get_cached_response, store_response
+    from utils.pdf_renderer import load_template
+    from utils.llm_backend import get_backend
+    from utils.metrics import span
+
+    backend = get_backend()
+    folder = payload["folder"]
+    company = payload["company"]
+    with span("resume.load"):
+        resume_text = resume_for_prompt(payload["resume_path"])
+    with span("prompt.build") as fields:
+        resume_text, job_description = fit_prompt_budget(resume_text, payload["job_description"])
+        messages = build_messages(payload["title"], company, job_description, resume_text)
+        fields["chars"] = sum(len(m["content"]) for m in messages)
+    prefix = payload.get("prefix", "")
+
+    cover_letter = None
+    if not prefix and not payload.get("force_regenerate"):
+        cover_letter = get_cached_response(messages, backend.cache_model())
+    cached = cover_letter is not None
+    stats = {"api_calls": 0, "render_passes": 0}
+
+    if not cached:
+        request = continuation_messages(messages, prefix) if prefix else messages
+        received = [prefix]
+        try:
+            _complete(backend, request, payload.get("stream", True), received, report)
+        except Exception:
+            # Keep what was received so the letter can be continued or used as-is
+            if "".join(received):
+                file_store.write_text(os.path.join(folder, "cover_letter.partial.txt"), "".join(received))
+            raise
+        cover_letter = "".join(received)
+        stats["api_calls"] += 1
+
+    # Shortened versions replace the previous text in the live preview
+    def complete(request):
+        received = []
+        _complete(backend, request, payload.get("stream", True), received, report)
+        return "".join(received)
+
+    template = load_template()
+    fitted, line_height, pages = fit_to_page_limit(template, messages, cover_letter, company, None if cached else complete, stats)
+    if fitted != cover_letter or not cached:
+        store_response(messages, backend.cache_model(), fitted)
+    cover_letter = fitted
+
+    pdf_path = save_cover_letter(folder, cover_letter, company, line_height=line_height)
+    if pdf_path:
+        stats["render_passes"] += 1
+    return {
+        "folder": folder, "pdf_path": pdf_path, "cover_letter": cover_letter, "cached": cached,
+        "line_height": line_height, "pages": pages, **stats,
+    }
+
+
+# Save a partial letter as the final one (no API call)
+def finalize_partial(folder, company, partial_text):
+    return save_cover_letter(folder, partial_text, company)
@@ -0,0 +1,167 @@
+import pandas as pd
+import streamlit as st
+
+from utils import tracker_store
+from utils.tracker_cache import load_tracker_summaries
+from utils.metrics import span
+from utils.tenants import current_tenant
+
+# Plotly figures for the Home and Analytics dashboards, built once per tracker
+# data_version and chart options and shared by every session. A rerun with
+# unchanged data skips both the aggregation and the figure construction;
+# Streamlit only serializes the cached figure. Old versions fall out of the
+# bounded cache. Cached figures are shared: callers must not modify them.
+
+# Seven charts, so two data versions of several active tenants fit
+MAX_CACHED_FIGURES = 64
+
+WEEKDAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+# SQLite numbers weekdays from Sunday = 0
+SQLITE_WEEKDAYS = ["Sunday"] + WEEKDAY_ORDER[:-1]
+
+
+# Donut of applications per status with the total in the middle. With
+# dated_only, applications without a valid date are left out (Analytics).
+def _status_pie(summaries, dated_only=False):
+    import plotly.express as px
+
+    if dated_only:
+        status_counts = (
+            summaries["month_status"].groupby("Status")["Count"].sum()
+            .sort_values(ascending=False)
+            .reset_index()
+        )
+    else:
+        status_counts = summaries["status"]
+    fig = px.pie(
+        status_counts,
+        names="Status",
+        values="Count",
+        hole=0.4,
+        title="Applications by Status"
+    )
+    fig.update_traces(textinfo='label+value')
+    fig.add_annotation(
+        dict(
+            text=f"<b>{status_counts['Count'].sum()}</b><br>Total",
+            x=0.5,
+            y=0.5,
+            font_size=20,
+            showarrow=False,
+            font=dict(color="black"),
+            bgcolor="white"
+        )
+    )
+    return fig
+
+
+def _monthly_line(summaries):
+    import plotly.graph_objects as go
+
+    monthly_counts = summaries["monthly"].assign(Date=lambda d: pd.to_datetime(d["Date"], format="%Y-%m"))
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=monthly_counts["Date"],
+        y=monthly_counts["Applications"],
+        mode='lines+markers',
+        line=dict(color='royalblue', width=2),
+        marker=dict(size=6)
+    ))
+    fig.update_layout(
+        xaxis=dict(
+            tickformat="%b %Y",
+            tickangle=-45,
+            dtick="M1"
+        ),
+        yaxis_title="Number of Applications",
+        template="plotly_white",
+        hovermode="x unified"
+    )
+    return fig
+
+
+# Horizontal bar chart of the top 20 companies or positions
+def _top_bar(summaries, column):
+    import plotly.express as px
+
+    counts = summaries[column.lower()]
+    plural = "Companies Applied To" if column == "Company" else "Positions Applied For"
+    fig = px.bar(
+        counts,
+        x="Count",
+        y=column,
+        orientation='h',
+        title=f"Top 20 {plural}",
+        labels={"Count": "Applications", column: column},
+        text="Count"
+    )
+    fig.update_traces(textposition='outside')
+    fig.update_layout(yaxis={'categoryorder': 'total ascending'}, template="plotly_white")
+    return fig
+
+
+def _weekday_bar(summaries):
+    import plotly.express as px
+
+    weekday_counts = summaries["weekday"].assign(Weekday=lambda d: d["Weekday"].map(lambda day: SQLITE_WEEKDAYS[day]))
+    weekday_counts = weekday_counts.set_index("Weekday")["Count"].reindex(WEEKDAY_ORDER).reset_index()
+    fig = px.bar(
+        weekday_counts,
+        x="Weekday",
+        y="Count",
+        title="Applications by Weekday",
+        labels={"Count": "Applications"},
+        text="Count"
+    )
+    fig.update_traces(textposition='outside')
+    fig.update_layout(template="plotly_white")
+    return fig
+
+
+# Stacked area of applications per status and month
+def _status_trend(summaries):
+    import plotly.graph_objects as go
+
+    month_status = summaries["month_status"]
+    status_trend = month_status.assign(Month=pd.to_datetime(month_status["Month"], format="%Y-%m"))
+    status_pivot = status_trend.pivot(index="Month", columns="Status", values="Count").fillna(0)
+
+    fig = go.Figure()
+    for status in status_pivot.columns:
+        fig.add_trace(go.Scatter(
+            x=status_pivot.index,
+            y=status_pivot[status],
+            stackgroup='one',
+            mode='none',
+            name=status
+        ))
+    fig.update_layout(
+        title="Application Status Over Time (Monthly)",
+        xaxis_title="Month",
+        yaxis_title="Number of Applications",
+        template="plotly_white",
+        hovermode="x unified"
+    )
+    return fig
+
+
+# Chart name -> builder(summaries, **options)
+BUILDERS = {
+    "status_pie": _status_pie,
+    "monthly_line": _monthly_line,
+    "top_bar": _top_bar,
+    "weekday_bar": _weekday_bar,
+    "status_trend": _status_trend,
+}
+
+
+@st.cache_resource(max_entries=MAX_CACHED_FIGURES, show_spinner=False)
+def _figure(name, tenant, version, options):
+    with span("dashboard.figure", chart=name):
+        return BUILDERS[name](load_tracker_summaries(version), **dict(options))
+
+
+# The figure for chart `name` with the given options (see BUILDERS) for the
+# tracker's current data
+def dashboard_figure(name, **options):
+    return _figure(name, current_tenant(), tracker_store.data_version(), tuple(sorted(options.items())))
@@ -0,0 +1,66 @@
+import os
+
+from utils import file_store
+
+
+# Small text cache on disk: one file per key, least recently used entries are
+# evicted once the folder grows past max_bytes. File mtimes track recency.
+# `folder` may be a function returning the folder, for per-tenant caches.
+class DiskCache:
+    def __init__(self, folder, max_bytes, suffix=".txt"):
+        self._folder = folder
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+
+    @property
+    def folder(self):
+        return self._folder() if callable(self._folder) else self._folder
+
+    def path(self, key):
+        return os.path.join(self.folder, f"{key}{self.suffix}")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # mark as recently used
+        return value
+
+    def put(self, key, value):
+        file_store.write_text(self.path(key), value)
+        self.evict()
+
+    def delete(self, key):
+        path = self.path(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+    # Drop the oldest entries until the cache fits in max_bytes
+    def evict(self):
+        if not os.path.isdir(self.folder):
+            return
+        entries = []
+        total = 0
+        for name in os.listdir(self.folder):
+            if not name.endswith(self.suffix):
+                continue
+            path = os.path.join(self.folder, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue  # evicted by another session meanwhile
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,96 @@
+import io
+import os
+import threading
+from pathlib import Path
+
+from dotenv import dotenv_values
+
+from utils import file_store
+from utils.tenants import tenant_path, tenants_enabled
+
+# App settings live in the same .env file as the OpenAI key, one NAME=value
+# per line, so the settings page can edit them and `.env` keeps working
+# with python-dotenv. Each tenant has its own .env (see utils/tenants.py).
+ENV_FILE = ".env"
+
+# With tenants, these must come from the tenant's own .env: the server's
+# keys are never lent to a tenant through the process environment
+TENANT_PRIVATE_SETTINGS = {"OPENAI_API_KEY", "LLM_API_KEY"}
+
+# With tenants, these come from the process environment only: a tenant's
+# .env must not point the server's model requests at another host
+SERVER_SETTINGS = {"LLM_BACKEND", "LLM_BASE_URL"}
+
+
+def env_path():
+    return Path(tenant_path(ENV_FILE))
+
+
+_parsed_lock = threading.Lock()
+# text of the last .env parsed -> its values
+_parsed = {}
+
+
+# .env values parsed the way python-dotenv does (quotes, inline comments,
+# export prefixes), reusing the last result while the text is unchanged
+def _env_values(text):
+    with _parsed_lock:
+        values = _parsed.get(text)
+    if values is None:
+        values = dotenv_values(stream=io.StringIO(text))
+        with _parsed_lock:
+            _parsed.clear()
+            _parsed[text] = values
+    return values
+
+
+# Function to load a value from .env, falling back to the process environment.
+# The file is only read again after it changed (see utils/file_store.py).
+def load_env_value(name, default=""):
+    if name in SERVER_SETTINGS and tenants_enabled():
+        return os.getenv(name, default)
+    text = file_store.read_text(str(env_path()))
+    if text is not None:
+        value = _env_values(text).get(name)
+        if value is not None:
+            return value
+    if name in TENANT_PRIVATE_SETTINGS and tenants_enabled():
+        return default
+    return os.getenv(name, default)
+
+
+# Function to save a value to .env (overwrite or add). The file is locked
+# while it is changed, so concurrent saves of different settings all land.
+def save_env_value(name, value):
+    def change(text):
+        lines = (text or "").splitlines(keepends=True)
+        if lines and not lines[-1].endswith("\n"):
+            lines[-1] += "\n"
+
+        new_line = f"{name}={value}\n"
+        written = False
+        for i, line in enumerate(lines):
+            if line.startswith(f"{name}="):
+                lines[i] = new_line
+                written = True
+                break
+
+        if not written:
+            lines.append(new_line)
+        return "".join(lines)
+
+    file_store.update_text(str(env_path()), change)
+
+
+def load_float(name, default):
+    try:
+        return float(load_env_value(name, default))
+    except ValueError:
+        return float(default)
+
+
+def load_int(name, default):
+    try:
+        return int(load_env_value(name, default))
+    except ValueError:
+        return int(default)
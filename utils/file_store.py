@@ -0,0 +1,195 @@
+import os
+import json
+import time
+import tempfile
+import threading
+from contextlib import contextmanager
+
+# Safe reads and writes for the app's small local files (.env,
+# common_info.json, the resume index, cache entries, saved letters).
+#
+# - Writes go to a temporary file in the same folder that is then renamed
+#   over the target, so readers see the old or the new file, never half of
+#   one, and a crash mid-write leaves the old file in place.
+# - Read-modify-write updates (update_text, update_json) hold an advisory
+#   lock on "<file>.lock", so two sessions or processes saving at once can't
+#   lose each other's changes. Waiting for the lock gives up after
+#   LOCK_TIMEOUT seconds with FileLockTimeout.
+# - Reads are cached per file and reused while the file is unchanged. Every
+#   write replaces the file (new inode), so the cache never serves a stale
+#   copy, and a process always reads back what it just wrote.
+
+LOCK_TIMEOUT = 10.0
+LOCK_POLL_INTERVAL = 0.01
+
+# Windows can refuse to rename over a file another process has open for a moment
+REPLACE_ATTEMPTS = 20
+
+MAX_CACHED_FILES = 256
+
+
+class FileLockTimeout(TimeoutError):
+    pass
+
+
+def _try_lock(f):
+    if os.name == "nt":
+        import msvcrt
+
+        f.seek(0)
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+    import fcntl
+
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+
+def _unlock(f):
+    if os.name == "nt":
+        import msvcrt
+
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+# Exclusive advisory lock for `path`, shared by threads and processes. Only
+# code that takes the same lock is kept out; plain reads don't need it.
+@contextmanager
+def file_lock(path, timeout=LOCK_TIMEOUT):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    with open(f"{path}.lock", "a+b") as f:
+        while not _try_lock(f):
+            if time.monotonic() >= deadline:
+                raise FileLockTimeout(f"Timed out after {timeout:g}s waiting for the lock on {path}")
+            time.sleep(LOCK_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            _unlock(f)
+
+
+_cache_lock = threading.Lock()
+# path -> ((inode, mtime, size), bytes)
+_cache = {}
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _remember(path, key, data):
+    with _cache_lock:
+        _cache.pop(path, None)
+        _cache[path] = (key, data)
+        while len(_cache) > MAX_CACHED_FILES:
+            del _cache[next(iter(_cache))]
+
+
+def _replace(tmp_path, path):
+    for attempt in range(REPLACE_ATTEMPTS):
+        try:
+            os.replace(tmp_path, path)
+            return
+        except PermissionError:
+            if os.name != "nt" or attempt == REPLACE_ATTEMPTS - 1:
+                raise
+            time.sleep(LOCK_POLL_INTERVAL)
+
+
+# Replace the file's content with `data` (bytes) in one step
+def write_bytes(path, data):
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        _replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    try:
+        _remember(path, _stat_key(path), data)
+    except FileNotFoundError:
+        pass  # already replaced or removed by someone else
+
+
+def write_text(path, text):
+    write_bytes(path, text.encode("utf-8"))
+
+
+def write_json(path, value):
+    write_text(path, json.dumps(value, indent=2))
+
+
+# File content, or `default` when the file doesn't exist
+def read_bytes(path, default=None):
+    try:
+        key = _stat_key(path)
+    except FileNotFoundError:
+        return default
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return default
+    _remember(path, key, data)
+    return data
+
+
+def read_text(path, default=None):
+    data = read_bytes(path)
+    return default if data is None else data.decode("utf-8")
+
+
+# Parsed JSON, or `default` when the file is missing or not valid JSON
+def read_json(path, default=None):
+    text = read_text(path)
+    if text is None:
+        return default
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return default
+
+
+# Read, change and write back under the file's lock. fn(old_text or None)
+# returns the new text, or None to leave the file as it is.
+def update_text(path, fn, timeout=LOCK_TIMEOUT):
+    with file_lock(path, timeout):
+        new_text = fn(read_text(path))
+        if new_text is not None:
+            write_text(path, new_text)
+        return new_text
+
+
+# update_text for JSON files: fn(value) changes the value in place or
+# returns a new one
+def update_json(path, fn, default=None, timeout=LOCK_TIMEOUT):
+    with file_lock(path, timeout):
+        value = read_json(path, default)
+        result = fn(value)
+        value = value if result is None else result
+        write_json(path, value)
+        return value
@@ -0,0 +1,264 @@
+import re
+
+# Structured job description parser. All patterns are compiled once into a
+# single alternation and the posting is scanned with one finditer pass; each
+# match is dispatched on its group name. Every field gets a confidence
+# between 0 and 1 depending on how it was found (an explicit "Title:" label
+# beats "Acme is hiring a ..." which beats the first-line guess).
+#
+# parse_job_description(text) -> {
+#     "title", "company", "location", "seniority", "salary", "skills",
+#     "confidence": {field: score},
+# }
+# Missing fields are None (skills: []) with confidence 0.
+
+UNKNOWN_TITLE = "Unknown_Position"
+UNKNOWN_COMPANY = "Unknown_Company"
+
+# Confidence per way a field can be found
+LABELED = 0.95
+HIRING_SENTENCE = 0.75
+BOARD_LINE = 0.7
+FROM_TITLE = 0.9
+CITY_STATE = 0.7
+SALARY_TEXT = 0.8
+WORK_MODE = 0.6
+FIRST_LINE = 0.6
+IN_TEXT = 0.6
+AT_COMPANY = 0.5
+
+# Label words (lower case) -> field
+LABELS = {
+    "job title": "title", "title": "title", "position": "title", "role": "title", "job": "title",
+    "company": "company", "company name": "company", "organization": "company", "organisation": "company", "employer": "company",
+    "location": "location", "job location": "location", "work location": "location", "office": "location",
+    "salary": "salary", "salary range": "salary", "compensation": "salary", "pay": "salary", "pay range": "salary",
+    "seniority": "seniority", "level": "seniority", "experience level": "seniority",
+}
+
+# Canonical seniority for each keyword
+SENIORITY_WORDS = {
+    "intern": "Intern", "internship": "Intern",
+    "junior": "Junior", "jr": "Junior", "entry level": "Junior", "entry-level": "Junior", "graduate": "Junior",
+    "mid level": "Mid", "mid-level": "Mid", "intermediate": "Mid",
+    "senior": "Senior", "sr": "Senior",
+    "staff": "Staff", "principal": "Principal",
+    "lead": "Lead", "head of": "Head", "director": "Director", "vp": "VP", "vice president": "VP",
+}
+
+# Skills matched as whole words, reported with this spelling
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Golang", "Rust", "C++", "C#", "Ruby", "PHP", "Scala",
+    "Kotlin", "Swift", "R", "SQL", "NoSQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch",
+    "React", "Angular", "Vue", "Node.js", "Django", "Flask", "FastAPI", "Spring", ".NET", "GraphQL", "REST",
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Ansible", "Linux", "Git", "CI/CD", "Jenkins",
+    "Kafka", "Spark", "Hadoop", "Airflow", "dbt", "Snowflake", "BigQuery", "Databricks", "Tableau", "Power BI",
+    "Excel", "Pandas", "NumPy", "TensorFlow", "PyTorch", "scikit-learn", "Machine Learning", "Deep Learning",
+    "NLP", "Computer Vision", "LLM", "Statistics", "Data Analysis", "Data Modeling", "ETL", "Microservices",
+    "Agile", "Scrum", "Jira", "Figma", "Product Management", "SEO", "Salesforce", "SAP", "Communication",
+    "Leadership", "Project Management",
+]
+SKILL_LOOKUP = {skill.lower(): skill for skill in SKILLS}
+
+# Skills that are also ordinary words ("go", "the rest") only count when
+# written exactly like this
+EXACT_CASE_SKILLS = {"Go", "R", "Spring", "Excel", "REST", "Swift", "Communication", "Leadership", "Statistics"}
+
+# Words that make a short line look like a job title
+ROLE_WORDS = (
+    "engineer", "developer", "manager", "analyst", "designer", "scientist", "specialist", "consultant",
+    "coordinator", "administrator", "architect", "intern", "assistant", "associate", "director", "lead",
+    "officer", "representative", "technician", "writer", "accountant", "recruiter", "programmer", "head of",
+)
+
+
+def _alternation(words):
+    # Longest first so "senior" wins over "sr" and "entry level" over "entry"
+    return "|".join(re.escape(w).replace(r"\ ", r"\s+") for w in sorted(words, key=len, reverse=True))
+
+
+# Company names are runs of at most MAX_NAME_WORDS capitalised words. The
+# bound keeps matching linear: an unbounded run is retried from every word
+# of a long capitalised passage.
+MAX_NAME_WORDS = 8
+_NAME = rf"(?<![\w&'.\-])[A-Z][\w&'.\-]*(?:[ \t]+(?:[A-Z][\w&'.\-]*|&|of|and)){{0,{MAX_NAME_WORDS - 1}}}"
+_AMOUNT = r"\d{1,3}(?:[,.]\d{3})*(?:\.\d+)?[ \t]?[kK]?"
+_PER = r"(?:/|per|a|an)[ \t]*"
+_PERIODS = r"year|yr|annum|hour|hr|month|mo"
+# "$120,000 - $150,000 per year", "£45k–£55k", "$60/hour", "$150,000/yr - $200,000/yr"
+_SALARY = (
+    rf"(?P<salary>(?P<currency>[$€£])[ \t]?(?P<salary_min>{_AMOUNT})(?:[ \t]*{_PER}(?P<min_period>{_PERIODS}))?"
+    rf"(?:[ \t]*(?:-|–|to)[ \t]*[$€£]?[ \t]?(?P<salary_max>{_AMOUNT}))?"
+    rf"(?:[ \t]*{_PER}(?P<period>{_PERIODS}))?)"
+)
+
+PATTERN = re.compile(
+    "|".join([
+        # "Title: Senior Data Engineer" (label at the start of a line)
+        rf"^[ \t*#\-•]*(?P<label>{_alternation(LABELS)})(?:[ \t*]*[:|][ \t]*|[ \t]+[–\-][ \t]+)(?P<value>[^\n]+)",
+        # "Acme Corp is hiring a Senior Data Engineer"
+        rf"(?-i:(?P<hiring_company>{_NAME}))[ \t]+(?:is|are)[ \t]+(?:hiring|looking[ \t]+for|seeking)[ \t]+(?:an?[ \t]+)?"
+        r"(?P<hiring_title>(?:\b(?:sr|jr)\.|[^\n.,;!(])+?)(?=[ \t]+(?:to|in|who|for|with|on|at|that|based|remote)\b|[ \t]*[\n.,;!(]|$)",
+        # "Globex · London, UK" (company and location line of many job boards)
+        rf"^[ \t]*(?-i:(?P<dot_company>{_NAME}))[ \t]*[·•][ \t]*(?P<dot_location>[^\n·•(]+)",
+        _SALARY,
+        # "Austin, TX"
+        r"(?-i:\b(?P<city_state>[A-Z][a-z]+(?:[ \t][A-Z][a-z]+)?,[ \t][A-Z]{2})\b)",
+        r"\b(?P<work_mode>remote|hybrid|on[- ]?site)\b",
+        # Seniority in the text only counts right before a role ("senior backend engineer")
+        rf"\b(?P<seniority>{_alternation(SENIORITY_WORDS)})\b\.?(?=[ \t]+(?:[\w/-]+[ \t]+){{0,2}}(?:{_alternation(ROLE_WORDS)}))",
+        rf"(?<![\w+#.])(?P<skill>{_alternation(s.lower() for s in SKILLS if s not in EXACT_CASE_SKILLS)})(?![\w+#])",
+        rf"(?<![\w+#.])(?-i:(?P<exact_skill>{_alternation(EXACT_CASE_SKILLS)}))(?![\w+#])",
+        # "... at Acme Corp", "join Acme"
+        rf"\b(?:at|join)[ \t]+(?-i:(?P<at_company>{_NAME}))",
+    ]),
+    re.IGNORECASE | re.MULTILINE,
+)
+SALARY_PATTERN = re.compile(_SALARY, re.IGNORECASE)
+SENIORITY_PATTERN = re.compile(rf"\b({_alternation(SENIORITY_WORDS)})\b", re.IGNORECASE)
+
+# Capitalised words that can start a company candidate but aren't companies
+# ("at Least", "We are looking for", "Our team is hiring")
+NOT_COMPANIES = {
+    "The", "This", "Our", "We", "Least", "Home", "Work", "Us", "Scale", "Times", "All", "Your", "A", "An",
+    "I", "You", "They", "It", "He", "She", "Who", "My", "Their", "Its", "Here", "There",
+}
+
+
+def _seniority_of(text):
+    match = SENIORITY_PATTERN.search(text)
+    if match:
+        return SENIORITY_WORDS[re.sub(r"\s+", " ", match.group(1).lower())]
+    return None
+
+
+def _clean(value):
+    return re.sub(r"\s+", " ", value).strip(" \t*|-–:,.")
+
+
+# Company name from a candidate match, or None for pronouns and the like.
+# Names end at a sentence break ("at Stripe. You will ...").
+def _company(value):
+    name = _clean(re.split(r"\.[ \t]+", value)[0])
+    if not name or name.split()[0] in NOT_COMPANIES:
+        return None
+    return name
+
+
+def _amount(text):
+    number = float(re.sub(r"[^\d.]", "", text.replace(",", "")) or 0)
+    return number * 1000 if text.strip().lower().endswith("k") else number
+
+
+def _salary(match):
+    period = (match.group("period") or match.group("min_period") or "").lower()
+    period = {"yr": "year", "annum": "year", "hr": "hour", "mo": "month"}.get(period, period)
+    salary_max = match.group("salary_max")
+    return {
+        "min": _amount(match.group("salary_min")),
+        "max": _amount(salary_max) if salary_max else None,
+        "currency": match.group("currency"),
+        "period": period or None,
+        "text": _clean(match.group("salary")),
+    }
+
+
+def _first_line_title(text):
+    for line in text.splitlines():
+        line = _clean(line)
+        if not line:
+            continue
+        lowered = line.lower()
+        if len(line.split()) <= 8 and any(word in lowered for word in ROLE_WORDS) and ":" not in line:
+            return line
+        return None
+    return None
+
+
+# Parse a posting in one scan over the text (see the top of this file)
+def parse_job_description(text):
+    found = {}  # field -> (value, confidence); the most confident find wins
+    skills = {}
+    work_mode = None
+
+    def offer(field, value, confidence):
+        if value and (field not in found or confidence > found[field][1]):
+            found[field] = (value, confidence)
+
+    for match in PATTERN.finditer(text):
+        kind = match.lastgroup
+        if match.group("label"):
+            field = LABELS[re.sub(r"\s+", " ", match.group("label").lower())]
+            value = _clean(match.group("value"))
+            if field == "salary":
+                salary = SALARY_PATTERN.search(value)
+                if salary:
+                    offer("salary", _salary(salary), LABELED)
+                elif value:
+                    offer("salary", {"min": None, "max": None, "currency": None, "period": None, "text": value}, LABELED)
+            elif field == "seniority":
+                offer("seniority", _seniority_of(value) or value.title(), LABELED)
+            else:
+                offer(field, value, LABELED)
+        elif match.group("hiring_company"):
+            offer("company", _company(match.group("hiring_company")), HIRING_SENTENCE)
+            offer("title", _clean(match.group("hiring_title")), HIRING_SENTENCE)
+        elif match.group("dot_company"):
+            offer("company", _company(match.group("dot_company")), BOARD_LINE)
+            offer("location", _clean(match.group("dot_location")), BOARD_LINE)
+        elif match.group("salary"):
+            salary = _salary(match)
+            # "$5 million in funding" is not a salary
+            if salary["max"] or salary["period"] or salary["min"] >= 1000:
+                offer("salary", salary, SALARY_TEXT)
+        elif kind == "city_state":
+            offer("location", match.group("city_state"), CITY_STATE)
+        elif kind == "work_mode":
+            work_mode = work_mode or match.group("work_mode").title().replace(" ", "-")
+        elif kind == "seniority":
+            offer("seniority", SENIORITY_WORDS[re.sub(r"\s+", " ", match.group("seniority").lower())], IN_TEXT)
+        elif kind in ("skill", "exact_skill"):
+            skill = SKILL_LOOKUP[re.sub(r"\s+", " ", match.group(kind).lower())]
+            skills[skill] = skills.get(skill, 0) + 1
+        elif kind == "at_company":
+            offer("company", _company(match.group("at_company")), AT_COMPANY)
+
+    # "Austin, TX (Hybrid)", or just "Remote" when no place is given
+    if work_mode:
+        if "location" in found and work_mode.lower() not in found["location"][0].lower():
+            found["location"] = (f"{found['location'][0]} ({work_mode})", found["location"][1])
+        offer("location", work_mode, WORK_MODE)
+
+    # A first line like "Data Scientist, Pricing" is kept when it is the same
+    # role as the one found in the text, only more specific
+    first_line = _first_line_title(text)
+    if first_line and "title" in found and found["title"][1] < LABELED:
+        if first_line.lower().startswith(found["title"][0].lower()):
+            found["title"] = (first_line, found["title"][1])
+    offer("title", first_line, FIRST_LINE)
+    if "title" in found:
+        offer("seniority", _seniority_of(found["title"][0]), FROM_TITLE)
+
+    result = {field: found.get(field, (None, 0.0))[0] for field in ("title", "company", "location", "seniority", "salary")}
+    # Most mentioned skills first
+    result["skills"] = sorted(skills, key=lambda s: (-skills[s], SKILLS.index(s)))
+    result["confidence"] = {field: found.get(field, (None, 0.0))[1] for field in ("title", "company", "location", "seniority", "salary")}
+    result["confidence"]["skills"] = min(1.0, 0.5 + 0.1 * len(skills)) if skills else 0.0
+    return result
+
+
+# Title and company with the placeholder names used for folder names
+def title_and_company(parsed):
+    return parsed["title"] or UNKNOWN_TITLE, parsed["company"] or UNKNOWN_COMPANY
+
+
+# One-line summary of the extra fields (tracker notes)
+def summary_line(parsed):
+    parts = []
+    if parsed["seniority"]:
+        parts.append(f"Seniority: {parsed['seniority']}")
+    if parsed["salary"]:
+        parts.append(f"Salary: {parsed['salary']['text']}")
+    if parsed["skills"]:
+        parts.append(f"Skills: {', '.join(parsed['skills'][:8])}")
+    return " · ".join(parts)
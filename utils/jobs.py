@@ -0,0 +1,242 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import importlib
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import tenants
+from utils.env_settings import load_int
+from utils.metrics import span
+
+# Background job queue. Jobs are stored in SQLite so their state survives
+# Streamlit reruns, page switches and server restarts, and they run on a
+# process-wide thread pool so the page that submitted them never blocks.
+# One queue serves every tenant (see utils/tenants.py): each job records the
+# tenant that submitted it, runs bound to that tenant's files and settings,
+# and is only visible to it. Queued jobs are handed to the pool oldest first,
+# but never more at once per tenant than tenants.max_concurrency().
+#
+# States: queued -> running -> done | failed
+
+DATA_DIR = "data"
+DB_FILE = os.path.join(DATA_DIR, "jobs.db")
+
+DEFAULT_WORKERS = 3
+KEEP_FINISHED_JOBS = 200
+
+# Job kind -> "module:function". The function is called as
+# fn(payload, report) where report(text) stores progress/partial output,
+# and returns a JSON-serialisable result.
+HANDLERS = {
+    "cover_letter": "utils.cover_letter:run_cover_letter_job",
+    "resume_text": "utils.resume_store:run_resume_job",
+    "tracker_duplicates": "utils.near_duplicates:run_sync_job",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    tenant TEXT,
+    partial TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_created ON jobs (created_at);
+"""
+
+_lock = threading.Lock()
+_executor = None
+
+# Tenant -> jobs handed to the pool and not finished yet
+_dispatch_lock = threading.Lock()
+_running = {}
+_dispatched = set()
+
+
+@contextmanager
+def _connect():
+    conn = sqlite3.connect(DB_FILE, timeout=10)
+    conn.row_factory = sqlite3.Row
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _set(job_id, **fields):
+    fields["updated_at"] = time.time()
+    assignments = ", ".join(f"{k} = ?" for k in fields)
+    with _connect() as conn:
+        conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", list(fields.values()) + [job_id])
+
+
+def _resolve(kind):
+    module_name, function_name = HANDLERS[kind].split(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def _run(job_id, tenant):
+    try:
+        with tenants.use_tenant(tenant):
+            _execute(job_id)
+    finally:
+        with _dispatch_lock:
+            _running[tenant] -= 1
+            _dispatched.discard(job_id)
+        _dispatch()
+
+
+# Claim the job and run it. Only a queued job is claimed: _dispatch reads the
+# queue before taking its lock, so a job that finished in between can be
+# handed to the pool a second time.
+def _execute(job_id):
+    with _connect() as conn:
+        claimed = conn.execute(
+            "UPDATE jobs SET status = 'running', updated_at = ? WHERE id = ? AND status = 'queued'", (time.time(), job_id)
+        ).rowcount
+        row = conn.execute("SELECT kind, payload, created_at FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if not claimed or row is None:
+        return
+
+    def report(text):
+        _set(job_id, partial=text)
+
+    try:
+        # Time spent waiting for a worker is kept with the run time
+        with span(f"job.{row['kind']}", queued_ms=round((time.time() - row["created_at"]) * 1000, 3)):
+            result = _resolve(row["kind"])(json.loads(row["payload"]), report)
+    except Exception as e:
+        _set(job_id, status="failed", error=str(e) or type(e).__name__)
+    else:
+        _set(job_id, status="done", result=json.dumps(result))
+
+
+# Hand queued jobs to the pool, oldest first, skipping tenants that are at
+# their limit. Runs on submit and whenever a job finishes.
+def _dispatch():
+    executor = _pool()
+    limit = tenants.max_concurrency()
+    with _connect() as conn:
+        queued = conn.execute("SELECT id, tenant FROM jobs WHERE status = 'queued' ORDER BY created_at").fetchall()
+    with _dispatch_lock:
+        for row in queued:
+            tenant = row["tenant"]
+            if row["id"] in _dispatched or (limit is not None and _running.get(tenant, 0) >= limit):
+                continue
+            _running[tenant] = _running.get(tenant, 0) + 1
+            _dispatched.add(row["id"])
+            executor.submit(_run, row["id"], tenant)
+
+
+def _upgrade_schema(conn):
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+    if "tenant" not in columns:
+        conn.execute("ALTER TABLE jobs ADD COLUMN tenant TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS jobs_tenant ON jobs (tenant, created_at)")
+
+
+# Start the worker pool on first use. Jobs left queued or running by a
+# previous server process are picked up again.
+def _pool():
+    global _executor
+    with _lock:
+        if _executor is not None:
+            return _executor
+        os.makedirs(DATA_DIR, exist_ok=True)
+        conn = sqlite3.connect(DB_FILE, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.executescript(SCHEMA)
+                _upgrade_schema(conn)
+                conn.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+        finally:
+            conn.close()
+
+        # A server-wide setting: read from the app folder's .env, not a tenant's
+        with tenants.use_tenant(None):
+            workers = max(1, load_int("JOB_WORKERS", DEFAULT_WORKERS))
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+    _dispatch()
+    return _executor
+
+
+# Queue a job and return its id right away
+def submit(kind, payload):
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    _pool()
+    tenant = tenants.current_tenant()
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    with _connect() as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, kind, status, payload, tenant, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(payload), tenant, now, now),
+        )
+        # Keep the table small: drop the tenant's oldest finished jobs
+        conn.execute(
+            "DELETE FROM jobs WHERE tenant IS ? AND status IN ('done', 'failed') AND id NOT IN "
+            "(SELECT id FROM jobs WHERE tenant IS ? ORDER BY created_at DESC LIMIT ?)",
+            (tenant, tenant, KEEP_FINISHED_JOBS),
+        )
+    _dispatch()
+    return job_id
+
+
+def _to_dict(row):
+    job = dict(row)
+    job["payload"] = json.loads(job["payload"])
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+def get_job(job_id):
+    _pool()
+    with _connect() as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ? AND tenant IS ?", (job_id, tenants.current_tenant())).fetchone()
+    return _to_dict(row) if row else None
+
+
+# Most recent jobs first, optionally limited to some ids
+def list_jobs(kind=None, job_ids=None, limit=10):
+    _pool()
+    query = "SELECT * FROM jobs WHERE tenant IS ?"
+    params = [tenants.current_tenant()]
+    if kind:
+        query += " AND kind = ?"
+        params.append(kind)
+    if job_ids is not None:
+        if not job_ids:
+            return []
+        query += f" AND id IN ({', '.join('?' for _ in job_ids)})"
+        params.extend(job_ids)
+    query += " ORDER BY created_at DESC LIMIT ?"
+    params.append(limit)
+    with _connect() as conn:
+        return [_to_dict(row) for row in conn.execute(query, params)]
+
+
+# Mark a failed job as done with a result produced outside the worker
+# (e.g. when the user accepts a partial result)
+def resolve_failed_job(job_id, result):
+    with _connect() as conn:
+        conn.execute(
+            "UPDATE jobs SET status = 'done', result = ?, updated_at = ? WHERE id = ? AND tenant IS ? AND status = 'failed'",
+            (json.dumps(result), time.time(), job_id, tenants.current_tenant()),
+        )
+
+
+def delete_job(job_id):
+    with _connect() as conn:
+        conn.execute("DELETE FROM jobs WHERE id = ? AND tenant IS ? AND status IN ('done', 'failed')", (job_id, tenants.current_tenant()))
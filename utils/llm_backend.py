@@ -0,0 +1,167 @@
+import time
+import asyncio
+
+from utils import tenants
+from utils.env_settings import load_env_value
+from utils.metrics import span, usage_fields
+from utils.openai_client import (
+    client_config,
+    get_client,
+    new_async_client,
+    call_with_retry,
+    async_call_with_retry,
+)
+
+# Language model backends. The generator only talks to a ChatBackend, and
+# which one is used is picked on the settings page (LLM_BACKEND in .env):
+#
+#   openai - the OpenAI API (needs OPENAI_API_KEY)
+#   local  - any server speaking the chat-completions protocol at
+#            LLM_BASE_URL, e.g. scripts/mock_llm_server.py for offline
+#            load tests, or a local model server
+#
+# To add a backend, write a factory returning a ChatBackend and register it
+# in BACKENDS. Request starts are spaced per tenant when
+# TENANT_REQUESTS_PER_MINUTE is set (see utils/tenants.py).
+
+DEFAULT_BACKEND = "openai"
+OPENAI_MODEL = "gpt-3.5-turbo"
+DEFAULT_LOCAL_URL = "http://127.0.0.1:8765/v1"
+DEFAULT_LOCAL_MODEL = "mock-gpt"
+
+
+# Interface every backend implements
+class ChatBackend:
+    name = ""
+    model = ""
+
+    # (ok, message) telling the pages whether generation can run
+    def check(self):
+        return True, ""
+
+    # Short description for the pages
+    def describe(self):
+        return f"{self.name} (model `{self.model}`)"
+
+    # Identifies the backend + model in the response cache, so letters from
+    # one backend are never served for another
+    def cache_model(self):
+        return self.model
+
+    # Full reply text
+    def complete(self, messages):
+        raise NotImplementedError
+
+    # Reply text in pieces as they arrive
+    def stream(self, messages):
+        raise NotImplementedError
+
+    # Async context manager with an awaitable complete(messages), for batches
+    def async_session(self):
+        raise NotImplementedError
+
+
+# Backend for the OpenAI API and every server compatible with it
+class OpenAICompatibleBackend(ChatBackend):
+    def __init__(self, name, model, base_url=None, api_key=None):
+        self.name = name
+        self.model = model
+        self.base_url = base_url
+        self.api_key = api_key
+
+    def config(self):
+        return client_config(base_url=self.base_url, api_key=self.api_key)
+
+    def check(self):
+        if not self.config()["api_key"]:
+            return False, "No API key configured."
+        return True, ""
+
+    def describe(self):
+        return f"the server at `{self.base_url}` (model `{self.model}`)" if self.base_url else f"OpenAI (model `{self.model}`)"
+
+    def cache_model(self):
+        return self.model if self.base_url is None else f"{self.base_url}|{self.model}"
+
+    def complete(self, messages):
+        client = get_client(self.config())
+        tenants.wait_for_request_slot()
+        with span("llm.request", backend=self.name, model=self.model, stream=False) as fields:
+            response = call_with_retry(client.chat.completions.create, model=self.model, messages=messages)
+            fields.update(usage_fields(response.usage))
+        return response.choices[0].message.content
+
+    # Token usage arrives in the last chunk (include_usage)
+    def stream(self, messages):
+        client = get_client(self.config())
+        tenants.wait_for_request_slot()
+        with span("llm.request", backend=self.name, model=self.model, stream=True) as fields:
+            start = time.perf_counter()
+            chunks = call_with_retry(
+                client.chat.completions.create, model=self.model, messages=messages,
+                stream=True, stream_options={"include_usage": True},
+            )
+            for chunk in chunks:
+                if getattr(chunk, "usage", None):
+                    fields.update(usage_fields(chunk.usage))
+                if chunk.choices and chunk.choices[0].delta.content:
+                    if "first_token_ms" not in fields:
+                        fields["first_token_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                    yield chunk.choices[0].delta.content
+
+    def async_session(self):
+        return _AsyncSession(new_async_client(self.config()), self.name, self.model)
+
+
+class _AsyncSession:
+    def __init__(self, client, name, model):
+        self.client = client
+        self.name = name
+        self.model = model
+
+    async def __aenter__(self):
+        await self.client.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.__aexit__(*exc_info)
+
+    async def complete(self, messages):
+        delay = tenants.request_delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        with span("llm.request", backend=self.name, model=self.model, stream=False, batch=True) as fields:
+            response = await async_call_with_retry(self.client.chat.completions.create, model=self.model, messages=messages)
+            fields.update(usage_fields(response.usage))
+        return response.choices[0].message.content
+
+
+def _openai_backend():
+    return OpenAICompatibleBackend("openai", OPENAI_MODEL)
+
+
+def _local_backend():
+    return OpenAICompatibleBackend(
+        "local",
+        load_env_value("LLM_MODEL", DEFAULT_LOCAL_MODEL) or DEFAULT_LOCAL_MODEL,
+        base_url=load_env_value("LLM_BASE_URL", DEFAULT_LOCAL_URL) or DEFAULT_LOCAL_URL,
+        # Local servers usually ignore the key, but the SDK needs one
+        api_key=load_env_value("LLM_API_KEY", "local") or "local",
+    )
+
+
+# Backend name -> (label for the settings page, factory)
+BACKENDS = {
+    "openai": ("OpenAI API", _openai_backend),
+    "local": ("Local / OpenAI-compatible server", _local_backend),
+}
+
+
+def backend_name():
+    name = load_env_value("LLM_BACKEND", DEFAULT_BACKEND)
+    return name if name in BACKENDS else DEFAULT_BACKEND
+
+
+# The backend selected in settings, built from the current .env values
+def get_backend():
+    return BACKENDS[backend_name()][1]()
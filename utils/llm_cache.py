@@ -0,0 +1,26 @@
+import json
+import hashlib
+
+from utils.disk_cache import DiskCache
+from utils.tenants import tenant_path
+
+# Generated letters are cached by a fingerprint of the exact request (model
+# plus full message list), so regenerating an identical prompt costs nothing.
+CACHE_FOLDER = "data/llm_cache"
+MAX_CACHE_BYTES = 10 * 1024 * 1024
+
+cache = DiskCache(lambda: tenant_path(CACHE_FOLDER), MAX_CACHE_BYTES)
+
+
+def prompt_fingerprint(messages, model):
+    payload = json.dumps({"model": model, "messages": messages}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Return the cached response for this prompt, or None
+def get_cached_response(messages, model):
+    return cache.get(prompt_fingerprint(messages, model))
+
+
+def store_response(messages, model, text):
+    cache.put(prompt_fingerprint(messages, model), text)
@@ -0,0 +1,151 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+from utils import file_store
+from utils.env_settings import load_env_value
+from utils.tenants import tenant_path, TenantError
+
+# Performance metrics. Each timed stage (resume extraction, prompt building,
+# model requests, page fitting, PDF rendering, saving, tracker reads/writes,
+# analytics) appends one JSON line with its duration and a few fields such as
+# token usage. The file rotates by size like a log file, so the store never
+# grows past (BACKUP_COUNT + 1) * MAX_FILE_BYTES. The Performance Metrics page
+# reads it back. METRICS=0 in .env turns recording off.
+DATA_DIR = "data"
+METRICS_FILE = "metrics.jsonl"
+
+MAX_FILE_BYTES = 2 * 1024 * 1024
+BACKUP_COUNT = 3
+
+_lock = threading.Lock()
+
+
+def metrics_enabled():
+    return load_env_value("METRICS", "1") == "1"
+
+
+# metrics.jsonl, metrics.jsonl.1, ... oldest last
+def metrics_files():
+    path = tenant_path(DATA_DIR, METRICS_FILE)
+    return [path] + [f"{path}.{i}" for i in range(1, BACKUP_COUNT + 1)]
+
+
+def _rotate():
+    files = metrics_files()
+    for older, newer in zip(reversed(files[1:]), reversed(files[:-1])):
+        try:
+            os.replace(newer, older)
+        except FileNotFoundError:
+            pass
+
+
+# Append one measurement. Failures to write are ignored, including code
+# running without a tenant (see utils/tenants.py): metrics must never break
+# generation or the tracker.
+def record(stage, ms, **fields):
+    try:
+        if not metrics_enabled():
+            return
+        entry = {"ts": round(time.time(), 3), "stage": stage, "ms": round(ms, 3)}
+        entry.update(fields)
+        line = json.dumps(entry, default=str) + "\n"
+        path = metrics_files()[0]
+        # Rotation must not interleave with other processes' appends
+        with _lock, file_store.file_lock(path, timeout=1.0):
+            try:
+                if os.path.getsize(path) + len(line) > MAX_FILE_BYTES:
+                    _rotate()
+            except FileNotFoundError:
+                pass
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+    except (OSError, TenantError):
+        pass
+
+
+# Time the block as `stage`. The yielded dict holds extra fields; the block
+# can add to it (e.g. token counts) before the span is recorded. ok is False
+# when the block raised.
+@contextmanager
+def span(stage, **fields):
+    start = time.perf_counter()
+    fields["ok"] = True
+    try:
+        yield fields
+    except Exception:
+        fields["ok"] = False
+        raise
+    finally:
+        record(stage, (time.perf_counter() - start) * 1000, **fields)
+
+
+# Token counts from a chat-completions `usage` object (or None)
+def usage_fields(usage):
+    if usage is None:
+        return {}
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", None),
+        "completion_tokens": getattr(usage, "completion_tokens", None),
+    }
+
+
+# Changes whenever a metrics file is written or rotated (cache key for readers)
+def metrics_signature():
+    signature = []
+    for path in metrics_files():
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+# Every stored measurement as a DataFrame (ts as datetime), oldest first
+def load_metrics():
+    import pandas as pd
+
+    entries = []
+    for path in reversed(metrics_files()):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue  # a line cut short by a crash or rotation
+        except FileNotFoundError:
+            continue
+
+    df = pd.DataFrame(entries, columns=None if entries else ["ts", "stage", "ms", "ok"])
+    df["ts"] = pd.to_datetime(df["ts"], unit="s")
+    return df
+
+
+# count, p50, p95, max and failures per stage
+def stage_summary(df):
+    import pandas as pd
+
+    if df.empty:
+        return pd.DataFrame(columns=["Stage", "Count", "p50 ms", "p95 ms", "Max ms", "Failed"])
+    grouped = df.groupby("stage")
+    summary = pd.DataFrame({
+        "Count": grouped["ms"].count(),
+        "p50 ms": grouped["ms"].quantile(0.50),
+        "p95 ms": grouped["ms"].quantile(0.95),
+        "Max ms": grouped["ms"].max(),
+        "Failed": grouped["ok"].apply(lambda ok: int(ok.eq(False).sum())),
+    })
+    return summary.rename_axis("Stage").reset_index().sort_values("p95 ms", ascending=False)
+
+
+def clear_metrics():
+    with _lock:
+        for path in metrics_files():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,306 @@
+import os
+import re
+import zlib
+import sqlite3
+import hashlib
+from contextlib import contextmanager
+
+import numpy as np
+
+from utils.tenants import tenant_path
+
+# Near-duplicate detection for job postings. Every stored job description
+# (cover_letters/*/job_description.txt) and every tracker row gets a MinHash
+# signature; signatures are split into LSH bands and each band is stored as a
+# bucket key, so a lookup only compares against postings that share at least
+# one bucket instead of scanning the whole archive.
+#
+# Two kinds of documents:
+#   "text" - word shingles of a job description (reposted / lightly edited postings)
+#   "role" - character shingles of "company title" (tracker rows)
+DATA_DIR = "data"
+DB_NAME = "near_duplicates.db"
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS  # with 16 bands of 8, pairs above ~0.7 similarity collide
+WORD_SHINGLE = 5
+CHAR_SHINGLE = 3
+
+# Estimated Jaccard similarity needed to report a match
+TEXT_THRESHOLD = 0.8
+ROLE_THRESHOLD = 0.8
+
+# Matches reported per lookup
+MAX_MATCHES = 5
+
+# Tracker changes indexed per transaction, and the most a lookup indexes
+# itself before searching. A bigger backlog (first run on a large tracker,
+# bulk imports) is indexed by a background job while lookups go ahead with
+# what is indexed so far.
+SYNC_BATCH = 1000
+INLINE_SYNC_LIMIT = 500
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(7)  # fixed seed: stored signatures must stay comparable
+PERM_A = _rng.randint(1, (1 << 61) - 1, NUM_PERM, dtype=np.uint64)
+PERM_B = _rng.randint(0, (1 << 61) - 1, NUM_PERM, dtype=np.uint64)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    stamp TEXT,
+    label TEXT,
+    minhash BLOB NOT NULL,
+    UNIQUE (source, key, kind)
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    kind TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    doc_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (kind, band, bucket);
+CREATE INDEX IF NOT EXISTS buckets_doc ON buckets (doc_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_initialized = set()
+
+
+# Database of the current tenant (see utils/tenants.py)
+def db_file():
+    return tenant_path(DATA_DIR, DB_NAME)
+
+
+@contextmanager
+def _connect():
+    conn = sqlite3.connect(db_file(), timeout=10)
+    conn.row_factory = sqlite3.Row
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def init_index():
+    db = db_file()
+    if db in _initialized and os.path.exists(db):
+        return
+    os.makedirs(os.path.dirname(db), exist_ok=True)
+    conn = sqlite3.connect(db, timeout=10)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.executescript(SCHEMA)
+    finally:
+        conn.close()
+    _initialized.add(db)
+
+
+def word_shingles(text):
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < WORD_SHINGLE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + WORD_SHINGLE]) for i in range(len(words) - WORD_SHINGLE + 1)}
+
+
+def char_shingles(text):
+    text = " ".join(re.findall(r'\w+', text.lower()))
+    if len(text) < CHAR_SHINGLE:
+        return {text} if text else set()
+    return {text[i:i + CHAR_SHINGLE] for i in range(len(text) - CHAR_SHINGLE + 1)}
+
+
+# MinHash signature of a set of shingles (None for an empty set). The
+# multiply wraps around in uint64 like the usual numpy implementations; the
+# permutations stay fixed and well mixed, which is all MinHash needs.
+def minhash(shingles):
+    if not shingles:
+        return None
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+    with np.errstate(over="ignore"):
+        permuted = (np.outer(hashes, PERM_A) + PERM_B) % MERSENNE_PRIME & MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def _band_keys(signature):
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        keys.append(int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "little", signed=True))
+    return keys
+
+
+def _signature_for(kind, text):
+    return minhash(word_shingles(text) if kind == "text" else char_shingles(text))
+
+
+def _remove(conn, doc_id):
+    conn.execute("DELETE FROM buckets WHERE doc_id = ?", (doc_id,))
+    conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+
+
+def _add(conn, source, key, kind, text, label, stamp):
+    row = conn.execute(
+        "SELECT id FROM documents WHERE source = ? AND key = ? AND kind = ?", (source, key, kind)
+    ).fetchone()
+    if row:
+        _remove(conn, row["id"])
+
+    signature = _signature_for(kind, text)
+    if signature is None:
+        return
+    doc_id = conn.execute(
+        "INSERT INTO documents (source, key, kind, stamp, label, minhash) VALUES (?, ?, ?, ?, ?, ?)",
+        (source, key, kind, stamp, label, signature.tobytes()),
+    ).lastrowid
+    conn.executemany(
+        "INSERT INTO buckets (kind, band, bucket, doc_id) VALUES (?, ?, ?, ?)",
+        [(kind, band, bucket, doc_id) for band, bucket in enumerate(_band_keys(signature))],
+    )
+
+
+# Index the job descriptions of archive folders, given as
+# (folder, job_description, label) (kept in step by utils/archive_index.py)
+def index_folders(folders):
+    init_index()
+    with _connect() as conn:
+        for folder, job_description, label in folders:
+            _add(conn, "archive", folder, "text", job_description, label, None)
+
+
+def remove_folders(folders):
+    init_index()
+    with _connect() as conn:
+        for folder in folders:
+            row = conn.execute("SELECT id FROM documents WHERE source = 'archive' AND key = ?", (folder,)).fetchone()
+            if row:
+                _remove(conn, row["id"])
+
+
+def clear_archive():
+    init_index()
+    with _connect() as conn:
+        conn.execute("DELETE FROM buckets WHERE doc_id IN (SELECT id FROM documents WHERE source = 'archive')")
+        conn.execute("DELETE FROM documents WHERE source = 'archive'")
+
+
+# Last tracker change (see tracker_store.changes_since) already indexed
+def _tracker_seq():
+    init_index()
+    with _connect() as conn:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'tracker_seq'").fetchone()
+    return int(row["value"]) if row else 0
+
+
+def _text(value):
+    return value if isinstance(value, str) else ""
+
+
+# Re-index the tracker rows added, edited or deleted since the last call.
+# Only the changed rows are read, SYNC_BATCH at a time, each batch in its own
+# transaction, so an interrupted sync resumes where it stopped. Returns the
+# number of changes indexed.
+def sync_tracker(report=None):
+    import pandas as pd
+    from utils import tracker_store
+
+    indexed = 0
+    while True:
+        changes = tracker_store.changes_since(_tracker_seq(), SYNC_BATCH)
+        if changes.empty:
+            return indexed
+        with _connect() as conn:
+            for row in changes.to_dict("records"):
+                key = str(row["id"])
+                doc = conn.execute(
+                    "SELECT id, stamp FROM documents WHERE source = 'tracker' AND key = ?", (key,)
+                ).fetchone()
+                if pd.isna(row["version"]):
+                    if doc:
+                        _remove(conn, doc["id"])  # deleted from the tracker
+                    continue
+                stamp = str(int(row["version"]))
+                if doc and doc["stamp"] == stamp:
+                    continue
+                company, position = _text(row["Company"]), _text(row["Position"])
+                status, date = _text(row["Status"]), _text(row["Date"])
+                label = f"{company} – {position}" + (f" ({status}, {date})" if status or date else "")
+                _add(conn, "tracker", key, "role", f"{company} {position}", label, stamp)
+
+            # A concurrent sync may have got further already
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('tracker_seq', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = MAX(CAST(value AS INTEGER), excluded.value)",
+                (int(changes["seq"].max()),),
+            )
+        indexed += len(changes)
+        if report:
+            report(f"{indexed} tracker changes indexed")
+
+
+# Background job (see utils/jobs.py) indexing a large tracker backlog
+def run_sync_job(payload, report):
+    return {"indexed": sync_tracker(report)}
+
+
+# Index the tracker changes before a lookup: inline when there are few,
+# otherwise in one background job (not queued again while it is pending)
+def _catch_up_tracker():
+    from utils import jobs, tracker_store
+
+    pending = tracker_store.count_changes_since(_tracker_seq())
+    if not pending:
+        return
+    if pending <= INLINE_SYNC_LIMIT:
+        sync_tracker()
+        return
+    if not any(job["status"] in ("queued", "running") for job in jobs.list_jobs("tracker_duplicates", limit=1)):
+        jobs.submit("tracker_duplicates", {})
+
+
+def _lookup(conn, kind, text, threshold):
+    signature = _signature_for(kind, text)
+    if signature is None:
+        return []
+
+    conditions = " OR ".join("(band = ? AND bucket = ?)" for _ in range(BANDS))
+    params = [kind]
+    for band, bucket in enumerate(_band_keys(signature)):
+        params += [band, bucket]
+    rows = conn.execute(
+        "SELECT source, key, label, minhash FROM documents WHERE id IN ("
+        f"SELECT doc_id FROM buckets WHERE kind = ? AND ({conditions}))",
+        params,
+    ).fetchall()
+
+    matches = []
+    for row in rows:
+        similarity = float(np.mean(np.frombuffer(row["minhash"], dtype=np.uint32) == signature))
+        if similarity >= threshold:
+            matches.append({"source": row["source"], "key": row["key"], "label": row["label"], "similarity": similarity})
+    return matches
+
+
+# Earlier postings that look like this one: archive folders whose job
+# description is nearly the same, and tracker rows for (nearly) the same
+# company and title. Returns up to MAX_MATCHES dicts with source ("archive" /
+# "tracker"), key (folder / application id), label and similarity, best match
+# first.
+def find_duplicates(job_description, company="", title=""):
+    init_index()
+    _catch_up_tracker()
+    with _connect() as conn:
+        matches = _lookup(conn, "text", job_description, TEXT_THRESHOLD)
+        if company and title and not company.startswith("Unknown_") and not title.startswith("Unknown_"):
+            matches += _lookup(conn, "role", f"{company} {title}", ROLE_THRESHOLD)
+    return sorted(matches, key=lambda m: m["similarity"], reverse=True)[:MAX_MATCHES]
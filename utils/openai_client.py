@@ -0,0 +1,126 @@
+import time
+import random
+import asyncio
+import threading
+from collections import OrderedDict
+
+from utils.env_settings import load_env_value, load_float, load_int
+
+# One OpenAI client per set of settings, shared by the whole process. Reusing
+# it keeps the SDK's pooled keep-alive connections, so repeated generations
+# skip the TCP/TLS handshake. A new client is made when the API key, server
+# or timeouts change (e.g. after saving a new key on the settings page, or
+# for another tenant's key); the least recently used ones are dropped past
+# MAX_CLIENTS. The same client talks to any chat-completions server, see
+# utils/llm_backend.py.
+
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 60.0
+DEFAULT_MAX_RETRIES = 4
+
+# Backoff: full jitter over base * 2^attempt, capped
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+
+MAX_CLIENTS = 32
+
+_lock = threading.Lock()
+_clients = OrderedDict()
+
+
+# Current client settings from .env (or the environment). base_url None
+# means the SDK default (api.openai.com, or OPENAI_BASE_URL if set).
+def client_config(base_url=None, api_key=None):
+    return {
+        "api_key": api_key if api_key is not None else load_env_value("OPENAI_API_KEY"),
+        "base_url": base_url,
+        "connect_timeout": load_float("OPENAI_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+        "read_timeout": load_float("OPENAI_READ_TIMEOUT", DEFAULT_READ_TIMEOUT),
+    }
+
+
+def max_retries():
+    return load_int("OPENAI_MAX_RETRIES", DEFAULT_MAX_RETRIES)
+
+
+def _client_kwargs(config):
+    import openai
+
+    return {
+        "api_key": config["api_key"],
+        "base_url": config["base_url"],
+        "timeout": openai.Timeout(config["read_timeout"], connect=config["connect_timeout"]),
+        # Retries are handled by call_with_retry so the policy is the same
+        # for sync, async and streaming calls
+        "max_retries": 0,
+    }
+
+
+# Shared client for these settings
+def get_client(config=None):
+    config = config or client_config()
+    key = tuple(sorted(config.items()))
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            from openai import OpenAI
+
+            client = _clients[key] = OpenAI(**_client_kwargs(config))
+            while len(_clients) > MAX_CLIENTS:
+                _clients.popitem(last=False)
+        else:
+            _clients.move_to_end(key)
+        return client
+
+
+# Async clients are bound to the event loop they are used in, so batch runs
+# get a fresh one with the same settings
+def new_async_client(config=None):
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(**_client_kwargs(config or client_config()))
+
+
+def _is_transient(error):
+    import openai
+
+    if isinstance(error, (openai.APIConnectionError, openai.RateLimitError)):
+        return True  # includes timeouts
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+# Seconds to wait before the next attempt, honouring Retry-After when sent
+def _backoff_delay(error, attempt):
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_CAP)
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+# Call fn(*args, **kwargs), retrying 429/5xx/connection errors with jittered
+# exponential backoff
+def call_with_retry(fn, *args, **kwargs):
+    retries = max_retries()
+    for attempt in range(retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == retries or not _is_transient(e):
+                raise
+            time.sleep(_backoff_delay(e, attempt))
+
+
+# Async variant of call_with_retry for coroutine functions
+async def async_call_with_retry(fn, *args, **kwargs):
+    retries = max_retries()
+    for attempt in range(retries + 1):
+        try:
+            return await fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == retries or not _is_transient(e):
+                raise
+            await asyncio.sleep(_backoff_delay(e, attempt))
@@ -0,0 +1,151 @@
+import os
+import datetime
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.cover_letter import common_info_file, load_user_info, sanitize_filename
+
+# Cover letter PDFs are rendered into memory. The header/signature layout
+# from common_info.json is prepared once as a template and reused for every
+# letter until the file changes.
+
+FONT = "Times"
+FONT_SIZE = 12
+LINE_HEIGHT = 10
+
+# Tighter line spacings tried, in order, when a letter runs over the page limit
+COMPACT_LINE_HEIGHTS = [8, 7, 6]
+
+# The built-in PDF fonts only cover latin-1, and model output is full of
+# typographic punctuation. These are swapped for plain equivalents; anything
+# else outside latin-1 becomes "?".
+PUNCTUATION = str.maketrans({
+    "\u2010": "-", "\u2011": "-", "\u2012": "-", "\u2013": "-", "\u2014": "-", "\u2212": "-",
+    "\u2018": "'", "\u2019": "'", "\u201a": "'", "\u2032": "'",
+    "\u201c": '"', "\u201d": '"', "\u201e": '"', "\u2033": '"',
+    "\u2026": "...", "\u2022": "-", "\u00a0": " ", "\u2009": " ", "\u202f": " ", "\u200b": "",
+})
+
+# Batches at least this large are rendered across a process pool (a letter
+# takes a few ms, so smaller batches don't pay for the pool start-up)
+PROCESS_POOL_MIN_BATCH = 64
+
+
+# Text as the built-in fonts can draw it
+def pdf_text(text):
+    return text.translate(PUNCTUATION).encode("latin-1", "replace").decode("latin-1")
+
+
+class CoverLetterTemplate:
+    def __init__(self, user):
+        self.user = user
+        self.signature = user["name"]
+        self.file_prefix = sanitize_filename(user["name"])
+
+        # Header lines in order: (kind, text)
+        self.header = []
+        if user["email"]:
+            self.header.append(("text", user["name"]))
+            self.header.append(("text", user["email"]))
+        if user["website"]:
+            self.header.append(("link", user["website"]))
+
+    def pdf_filename(self, company):
+        return f"{self.file_prefix}_{sanitize_filename(company)}_cover_letter.pdf"
+
+    # Lay the letter out on a fresh FPDF document (nothing is written)
+    def layout(self, body, company, date=None, line_height=LINE_HEIGHT):
+        from fpdf import FPDF  # only needed once a letter is ready
+
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_auto_page_break(auto=True, margin=15)
+
+        # Header
+        pdf.set_font(FONT, size=FONT_SIZE)
+        for kind, text in self.header:
+            if kind == "link":
+                pdf.set_text_color(0, 0, 255)
+                pdf.set_font(FONT, size=FONT_SIZE, style='U')
+                pdf.write(line_height, pdf_text(text), text)  # clickable link
+                pdf.set_text_color(0, 0, 0)
+                pdf.set_font(FONT, size=FONT_SIZE, style='')
+                pdf.ln(line_height)
+            else:
+                pdf.cell(0, line_height, pdf_text(text), ln=True)
+        today = (date or datetime.date.today()).strftime("%B %d, %Y")
+        pdf.cell(0, line_height, today, ln=True)
+        pdf.cell(0, line_height, pdf_text(company), ln=True)
+        pdf.ln(line_height)
+
+        # Body
+        pdf.set_font(FONT, size=FONT_SIZE)
+        for paragraph in body.split('\n'):
+            if paragraph.strip() != "":
+                pdf.multi_cell(0, line_height, pdf_text(paragraph.strip()))
+                pdf.ln(1)
+
+        # Footer / Signature
+        pdf.cell(0, line_height, pdf_text(self.signature), ln=True)
+        return pdf
+
+    # Number of pages the letter would take, measured from the layout alone
+    def page_count(self, body, company, line_height=LINE_HEIGHT):
+        return self.layout(body, company, line_height=line_height).page_no()
+
+    # Try tighter line spacings until the letter fits on max_pages.
+    # Returns (line_height, pages, layout passes); the tightest spacing is
+    # kept if nothing fits.
+    def compact_to_fit(self, body, company, max_pages):
+        passes = 0
+        for line_height in COMPACT_LINE_HEIGHTS:
+            pages = self.page_count(body, company, line_height)
+            passes += 1
+            if pages <= max_pages:
+                break
+        return line_height, pages, passes
+
+    # PDF bytes for one letter
+    def render(self, body, company, date=None, line_height=LINE_HEIGHT):
+        data = self.layout(body, company, date, line_height).output(dest="S")
+        # fpdf 1.x returns a latin-1 str, fpdf2 returns bytes
+        return data.encode("latin-1") if isinstance(data, str) else bytes(data)
+
+
+# common_info.json path -> (mtime/size key, template), one per tenant
+_templates = {}
+
+
+# Template for the current common_info.json, rebuilt only when it changes
+def load_template():
+    path = common_info_file()
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _templates.get(path)
+    if cached is None or cached[0] != key:
+        cached = (key, CoverLetterTemplate(load_user_info()))
+        _templates[path] = cached
+    return cached[1]
+
+
+# (pdf_bytes, None), or (None, error message) when the letter can't be rendered
+def _render_item(args):
+    template, body, company, line_height = args
+    try:
+        return template.render(body, company, line_height=line_height), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+# Render many (body, company, line_height) letters; large batches use a
+# process pool. Returns (pdf_bytes, error) per letter, so one bad letter
+# doesn't take the others down. Pool workers are spawned, not forked: the
+# server process has other threads (tornado, job workers) that may hold
+# locks a forked child would inherit.
+def render_many(letters, template=None, processes=None):
+    template = template or load_template()
+    work = [(template, body, company, line_height) for body, company, line_height in letters]
+    if len(work) < PROCESS_POOL_MIN_BATCH:
+        return [_render_item(item) for item in work]
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(_render_item, work, chunksize=4))
@@ -0,0 +1,80 @@
+import os
+import hashlib
+
+from utils.disk_cache import DiskCache
+from utils.metrics import span
+from utils.tenants import tenant_path
+
+# Extracted resume text is cached next to the resumes folder, keyed by the
+# SHA-256 of the PDF bytes, so the same file is only parsed by PyPDF2 once.
+RESUME_FOLDER = "resumes"
+CACHE_FOLDER = "resume_cache"
+# Compact resume digests (utils/resume_digest.py) get a folder of their own,
+# so neither cache counts or evicts the other's files
+DIGEST_FOLDER = os.path.join(CACHE_FOLDER, "digests")
+
+# Upper bound for the cache folder; least recently used entries go first
+MAX_CACHE_BYTES = 20 * 1024 * 1024
+
+CHUNK_SIZE = 1024 * 1024
+
+
+
+# Resumes and their cache for the current tenant (see utils/tenants.py)
+def resume_folder():
+    return tenant_path(RESUME_FOLDER)
+
+
+def cache_folder():
+    return tenant_path(CACHE_FOLDER)
+
+
+def digest_folder():
+    return tenant_path(DIGEST_FOLDER)
+
+
+cache = DiskCache(cache_folder, MAX_CACHE_BYTES)
+digest_cache = DiskCache(digest_folder, MAX_CACHE_BYTES)
+
+
+# Hash a file on disk without loading it fully into memory
+def file_hash(file_path):
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+# Function to extract PDF text (uncached)
+def extract_text_from_pdf(file_path):
+    import PyPDF2  # only needed on a cache miss
+
+    with open(file_path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+# Return the resume text, extracting and caching it on a miss
+def get_resume_text(file_path):
+    digest = file_hash(file_path)
+    text = cache.get(digest)
+    if text is None:
+        with span("resume.extract_pdf"):
+            text = extract_text_from_pdf(file_path)
+        cache.put(digest, text)
+    return text
+
+
+# Remove the cached text and digests for a resume that is about to be
+# replaced or deleted
+def invalidate(file_path):
+    if not os.path.exists(file_path):
+        return
+    digest = file_hash(file_path)
+    cache.delete(digest)
+    folder = digest_folder()
+    if os.path.isdir(folder):
+        for name in os.listdir(folder):
+            if name.startswith(f"{digest}_") and name.endswith(digest_cache.suffix):
+                os.remove(os.path.join(folder, name))
@@ -0,0 +1,197 @@
+import re
+
+from utils.resume_cache import file_hash, get_resume_text, digest_cache
+
+# Optional compact resume for prompts (RESUME_DIGEST=1 in .env). The digest is
+# built once per resume from the extracted text, without an API call: lines
+# are grouped under canonical section headings, wrapped lines are joined,
+# bullets normalized and contact details, duplicates and low-value sections
+# dropped. It is cached next to the extracted text, keyed by the PDF hash.
+# Bump DIGEST_VERSION when the format changes so old digests are rebuilt.
+DIGEST_VERSION = "1"
+
+# Canonical section name for each heading we recognize
+SECTION_ALIASES = {
+    "Summary": ["summary", "profile", "professional summary", "objective", "about me", "career objective"],
+    "Skills": ["skills", "technical skills", "core competencies", "competencies", "technologies", "tools", "key skills"],
+    "Experience": ["experience", "work experience", "professional experience", "employment", "employment history", "work history", "relevant experience"],
+    "Projects": ["projects", "personal projects", "selected projects", "key projects"],
+    "Certifications": ["certifications", "certificates", "licenses", "licenses and certifications"],
+    "Education": ["education", "academic background", "qualifications"],
+    "Awards": ["awards", "honors", "achievements", "accomplishments"],
+    "Publications": ["publications", "research"],
+    "Volunteering": ["volunteering", "volunteer experience", "leadership", "activities"],
+    "Languages": ["languages"],
+    "Interests": ["interests", "hobbies", "hobbies and interests"],
+    "References": ["references"],
+}
+HEADING_LOOKUP = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+# Sections left out of the digest entirely
+DROPPED_SECTIONS = {"Interests", "References"}
+
+# Order in which sections are kept when the prompt is over budget (the last
+# ones are trimmed first). Unknown sections rank after the listed ones.
+SECTION_PRIORITY = ["Summary", "Skills", "Experience", "Projects", "Certifications", "Education", "Awards", "Publications", "Volunteering", "Languages"]
+
+# Text before the first heading (usually name and contact details)
+HEADER_SECTION = "Header"
+
+BULLET = re.compile(r'^\s*[•▪●◦■\-\*–·]\s*')
+CONTACT = re.compile(r'(@\S+\.\w+|https?://|www\.|linkedin\.com|github\.com|\+\d[\d\s().-]{7,}\d|\(?\b\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}\b)', re.IGNORECASE)
+
+# Prompt tokens used by the instructions around the resume and job description
+PROMPT_OVERHEAD_TOKENS = 350
+
+# The resume is never trimmed below this; the job description is cut instead
+MIN_RESUME_TOKENS = 300
+
+# ...but never below this, so the model always sees the start of the posting
+MIN_JOB_DESCRIPTION_TOKENS = 250
+
+# Smallest budget that leaves room for both; lower budgets are raised to it
+MIN_PROMPT_BUDGET = PROMPT_OVERHEAD_TOKENS + MIN_RESUME_TOKENS + MIN_JOB_DESCRIPTION_TOKENS
+
+
+# Rough token count (about four characters per token for English text)
+def estimate_tokens(text):
+    return (len(text) + 3) // 4
+
+
+def digest_enabled():
+    from utils.env_settings import load_env_value
+
+    return load_env_value("RESUME_DIGEST", "0") == "1"
+
+
+# Prompt token budget (PROMPT_TOKEN_BUDGET in .env). Off (0) unless set on
+# the settings page, so prompts are only trimmed for users who opted in.
+def token_budget():
+    from utils.env_settings import load_int
+
+    budget = load_int("PROMPT_TOKEN_BUDGET", 0)
+    return max(MIN_PROMPT_BUDGET, budget) if budget > 0 else 0
+
+
+def _heading(line, allow_unknown):
+    key = re.sub(r'[^a-z ]', '', line.lower().replace("&", "and")).strip()
+    key = re.sub(r'\s+', ' ', key)
+    if key in HEADING_LOOKUP:
+        return HEADING_LOOKUP[key]
+    # Unknown short all-caps lines are headings too, once a known heading was
+    # seen (before that they are usually the candidate's name)
+    if allow_unknown and line.isupper() and len(line) <= 40 and len(line.split()) <= 4 and re.search(r'[A-Z]{3}', line):
+        return line.title()
+    return None
+
+
+# Split resume text into [(section, [lines])], joining lines that PDF
+# extraction wrapped mid-sentence
+def parse_sections(text):
+    sections = [(HEADER_SECTION, [])]
+    for raw in text.splitlines():
+        line = re.sub(r'\s+', ' ', raw).strip()
+        if not line:
+            continue
+        is_bullet = bool(BULLET.match(line))
+        heading = None if is_bullet else _heading(line.strip("#: ").strip(), len(sections) > 1)
+        if heading:
+            sections.append((heading, []))
+            continue
+
+        name, lines = sections[-1]
+        line = BULLET.sub("- ", line) if is_bullet else line
+        wrapped = name != HEADER_SECTION and not is_bullet and line[0].islower() and not CONTACT.search(line)
+        if lines and wrapped and not lines[-1].endswith((".", ":", ";")):
+            lines[-1] = f"{lines[-1]} {line}"
+        else:
+            lines.append(line)
+    return [(name, lines) for name, lines in sections if lines]
+
+
+def format_sections(sections):
+    blocks = []
+    for name, lines in sections:
+        blocks.append("\n".join([f"{name.upper()}:"] + lines) if name != HEADER_SECTION else "\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+# Build the digest text from extracted resume text (uncached)
+def build_digest(text):
+    sections = []
+    seen = set()
+    for name, lines in parse_sections(text):
+        if name in DROPPED_SECTIONS:
+            continue
+        kept = []
+        for line in lines:
+            if CONTACT.search(line) and len(line) < 120:
+                continue  # contact details never go into the letter body
+            key = line.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            kept.append(line)
+        if name == HEADER_SECTION:
+            kept = kept[:1]  # just the name / headline
+        if kept:
+            sections.append((name, kept))
+    return format_sections(sections)
+
+
+# Return the digest for a resume PDF, building and caching it on a miss
+def get_resume_digest(file_path):
+    key = f"{file_hash(file_path)}_v{DIGEST_VERSION}"
+    digest = digest_cache.get(key)
+    if digest is None:
+        digest = build_digest(get_resume_text(file_path))
+        digest_cache.put(key, digest)
+    return digest
+
+
+# Resume text to put into prompts: the digest when that mode is on
+def resume_for_prompt(file_path):
+    if digest_enabled():
+        return get_resume_digest(file_path)
+    return get_resume_text(file_path)
+
+
+# Keep resume plus job description within the prompt token budget. Lines are
+# dropped from the end of the lowest-priority sections first (oldest roles in
+# Experience go before Skills or Summary). If the job description alone
+# leaves less than MIN_RESUME_TOKENS, its tail is cut too, down to
+# MIN_JOB_DESCRIPTION_TOKENS at most.
+# Returns (resume_text, job_description_text).
+def fit_prompt_budget(resume_text, job_description_text, budget=None):
+    budget = token_budget() if budget is None else budget
+    if not budget:
+        return resume_text, job_description_text
+    budget = max(MIN_PROMPT_BUDGET, budget)
+
+    available = budget - PROMPT_OVERHEAD_TOKENS
+    if estimate_tokens(resume_text) + estimate_tokens(job_description_text) <= available:
+        return resume_text, job_description_text
+
+    resume_allowance = max(MIN_RESUME_TOKENS, available - estimate_tokens(job_description_text))
+    if estimate_tokens(job_description_text) > available - resume_allowance:
+        job_description_text = job_description_text[:max(MIN_JOB_DESCRIPTION_TOKENS, available - resume_allowance) * 4].rstrip()
+
+    if estimate_tokens(resume_text) <= resume_allowance:
+        return resume_text, job_description_text
+
+    sections = [(name, list(lines)) for name, lines in parse_sections(resume_text)]
+
+    def rank(section):
+        name = section[0]
+        if name == HEADER_SECTION:
+            return -1
+        return SECTION_PRIORITY.index(name) if name in SECTION_PRIORITY else len(SECTION_PRIORITY)
+
+    trim_order = sorted(sections, key=rank, reverse=True)
+    used = estimate_tokens(format_sections(sections))
+    for _, lines in trim_order:
+        while lines and used > resume_allowance:
+            used -= estimate_tokens(lines.pop()) + 1
+        if used <= resume_allowance:
+            break
+    return format_sections([s for s in sections if s[1]]), job_description_text
@@ -0,0 +1,198 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+from utils import resume_cache, file_store
+from utils.tenants import tenant_path
+
+# Uploaded resumes and their metadata index. Uploads are streamed to disk in
+# chunks and hashed on the way, so a file whose content is already stored is
+# not written twice, and a different file with a taken name gets a new name
+# instead of replacing it. The index keeps size, page count, hash and upload
+# time per resume so the listing never opens the PDFs; page count and text
+# extraction run as a background job (kind "resume_text") right after upload.
+# Index changes hold the index's file lock, so sessions, jobs and other
+# server processes don't overwrite each other's entries.
+DATA_DIR = "data"
+INDEX_FILE = "resume_index.json"
+
+CHUNK_SIZE = resume_cache.CHUNK_SIZE
+
+
+def resume_path(name):
+    return os.path.join(resume_cache.resume_folder(), name)
+
+
+def _index_file():
+    return tenant_path(DATA_DIR, INDEX_FILE)
+
+
+def _load_index():
+    return file_store.read_json(_index_file(), {})
+
+
+def _save_index(index):
+    file_store.write_json(_index_file(), index)
+
+
+def _update(name, **fields):
+    with file_store.file_lock(_index_file()):
+        index = _load_index()
+        if name in index:
+            index[name].update(fields)
+            _save_index(index)
+
+
+# Entry status: processing -> ready | failed
+def _new_entry(name, sha256, uploaded_at):
+    path = resume_path(name)
+    return {
+        "name": name,
+        "sha256": sha256,
+        "size": os.path.getsize(path),
+        "mtime": os.path.getmtime(path),
+        "uploaded_at": uploaded_at,
+        "pages": None,
+        "status": "processing",
+        "error": None,
+    }
+
+
+# "resume.pdf" -> "resume (2).pdf", "resume (3).pdf", ... until one is free
+def _free_name(name, index):
+    stem, ext = os.path.splitext(name)
+    candidate, n = name, 1
+    while candidate in index or os.path.exists(resume_path(candidate)):
+        n += 1
+        candidate = f"{stem} ({n}){ext}"
+    return candidate
+
+
+def _queue_processing(name):
+    from utils import jobs
+
+    jobs.submit("resume_text", {"name": name})
+
+
+# Store an uploaded file object. Returns (entry, duplicate) where duplicate
+# is True when identical content was already stored (entry is that resume).
+def save_upload(uploaded_file):
+    folder = resume_cache.resume_folder()
+    os.makedirs(folder, exist_ok=True)
+    name = os.path.basename(uploaded_file.name) or "resume.pdf"
+    tmp_path = os.path.join(folder, f".upload.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    sha = hashlib.sha256()
+    uploaded_file.seek(0)
+    try:
+        with open(tmp_path, "wb") as f:
+            for chunk in iter(lambda: uploaded_file.read(CHUNK_SIZE), b""):
+                sha.update(chunk)
+                f.write(chunk)
+        digest = sha.hexdigest()
+
+        with file_store.file_lock(_index_file()):
+            index, added = _reconcile(_load_index())
+            duplicate = next((entry for entry in index.values() if entry["sha256"] == digest), None)
+            if duplicate is None:
+                name = _free_name(name, index)
+                os.replace(tmp_path, resume_path(name))
+                index[name] = _new_entry(name, digest, time.time())
+                added.append(name)
+            _save_index(index)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    for added_name in added:
+        _queue_processing(added_name)
+    if duplicate is not None:
+        return duplicate, True
+    return index[name], False
+
+
+# Bring the index in line with the folder: resumes copied in by hand (or
+# changed on disk) are hashed and queued for processing, deleted ones dropped
+def _reconcile(index):
+    folder = resume_cache.resume_folder()
+    on_disk = {
+        name for name in os.listdir(folder)
+        if name.lower().endswith(".pdf")
+    } if os.path.isdir(folder) else set()
+
+    for name in list(index):
+        if name not in on_disk:
+            del index[name]
+    added = []
+    for name in on_disk:
+        entry = index.get(name)
+        path = resume_path(name)
+        if entry and entry["size"] == os.path.getsize(path) and entry["mtime"] == os.path.getmtime(path):
+            continue
+        index[name] = _new_entry(name, resume_cache.file_hash(path), os.path.getmtime(path))
+        added.append(name)
+    return index, added
+
+
+# Index entries for every stored resume, newest upload first
+def list_resumes():
+    with file_store.file_lock(_index_file()):
+        index = _load_index()
+        before = json.dumps(index, sort_keys=True)
+        index, added = _reconcile(index)
+        if json.dumps(index, sort_keys=True) != before:
+            _save_index(index)
+    for name in added:
+        _queue_processing(name)
+    return sorted(index.values(), key=lambda entry: entry["uploaded_at"], reverse=True)
+
+
+# Callable for st.download_button: the PDF is only read when the button is
+# clicked, not on every rerun of the page. The path is resolved now, since
+# the click is served outside the session.
+def reader(name):
+    path = resume_path(name)
+
+    def read():
+        with open(path, "rb") as f:
+            return f.read()
+    return read
+
+
+def delete_resume(name):
+    path = resume_path(name)
+    with file_store.file_lock(_index_file()):
+        index = _load_index()
+        entry = index.pop(name, None)
+        # Cached text is keyed by content, so keep it while a copy remains
+        if entry is None or not any(e["sha256"] == entry["sha256"] for e in index.values()):
+            resume_cache.invalidate(path)
+        if os.path.exists(path):
+            os.remove(path)
+        _save_index(index)
+
+
+# Job handler (kind "resume_text"): count pages and warm the text cache, and
+# the digest cache when digests are enabled, so the generator doesn't parse
+# the PDF on click
+def run_resume_job(payload, report):
+    import PyPDF2
+    from utils import resume_digest
+
+    name = payload["name"]
+    path = resume_path(name)
+    try:
+        with open(path, "rb") as f:
+            pages = len(PyPDF2.PdfReader(f).pages)
+        report(f"Extracting text from {pages} page(s)")
+        text = resume_cache.get_resume_text(path)
+        result = {"name": name, "pages": pages, "text_tokens": resume_digest.estimate_tokens(text)}
+        if resume_digest.digest_enabled():
+            result["digest_tokens"] = resume_digest.estimate_tokens(resume_digest.get_resume_digest(path))
+    except Exception as e:
+        _update(name, status="failed", error=str(e) or type(e).__name__)
+        raise
+    _update(name, status="ready", error=None, **{k: v for k, v in result.items() if k != "name"})
+    return result
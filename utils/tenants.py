@@ -0,0 +1,189 @@
+import os
+import re
+import time
+import hashlib
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# Data namespaces, so one server process can serve many users. Every file the
+# app reads or writes (tracker, personal info, resumes, cover letters, caches,
+# .env with the API key) lives under the current tenant's folder:
+#
+#   single user (default)   the app folder itself, as before
+#   tenant "alice@x.com"    tenants/alice_x.com-<hash>/
+#
+# The tenant is resolved from the Streamlit session by the identity source set
+# in the server's environment (TENANT_IDENTITY, see IDENTITY_SOURCES). Code
+# running outside a script run (background jobs, batch worker threads) is
+# bound to a tenant with use_tenant(). Tenant settings are read from the
+# process environment only, so a tenant cannot change them through its .env:
+#
+#   TENANT_IDENTITY               none | header | login
+#   TENANT_HEADER                 header set by the auth proxy (default X-Forwarded-User)
+#   TENANTS_DIR                   root of the tenant folders (default tenants)
+#   TENANT_MAX_CONCURRENCY        background jobs running at once, and model
+#                                 requests in flight in a batch, per tenant
+#   TENANT_REQUESTS_PER_MINUTE    model requests started per minute per tenant (0 = no limit)
+#
+# LLM_BACKEND and LLM_BASE_URL are also read from the process environment
+# only (see utils/env_settings.py), so a tenant cannot send the server's
+# requests to another host.
+
+DEFAULT_IDENTITY = "none"
+DEFAULT_HEADER = "X-Forwarded-User"
+DEFAULT_TENANTS_DIR = "tenants"
+# Per-tenant limit when tenants are enabled; a single user keeps every worker
+DEFAULT_MAX_CONCURRENCY = 2
+
+
+class TenantError(RuntimeError):
+    pass
+
+
+_UNSET = object()
+_bound = contextvars.ContextVar("tenant", default=_UNSET)
+
+
+def _session_ready():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    return get_script_run_ctx(suppress_warning=True) is not None
+
+
+# User id from a header set by an authenticating reverse proxy
+def _header_identity():
+    import streamlit as st
+
+    return st.context.headers.get(os.getenv("TENANT_HEADER", DEFAULT_HEADER)) or None
+
+
+# User id from Streamlit's built-in login (st.login, configured in secrets.toml)
+def _login_identity():
+    import streamlit as st
+
+    if not st.user.is_logged_in:
+        return None
+    return st.user.get("email") or st.user.get("sub")
+
+
+# Identity source name -> function returning the session's user id, or None
+# when the session is not signed in. To add one (e.g. a cookie), register it here.
+IDENTITY_SOURCES = {
+    "none": lambda: None,
+    "header": _header_identity,
+    "login": _login_identity,
+}
+
+
+def identity_source():
+    name = os.getenv("TENANT_IDENTITY", DEFAULT_IDENTITY)
+    if name not in IDENTITY_SOURCES:
+        raise TenantError(f"Unknown TENANT_IDENTITY: {name}")
+    return name
+
+
+def tenants_enabled():
+    return identity_source() != DEFAULT_IDENTITY
+
+
+# The current tenant id, or None for the single-user namespace
+def current_tenant():
+    tenant = _bound.get()
+    if tenant is not _UNSET:
+        return tenant
+    if not tenants_enabled():
+        return None
+    if not _session_ready():
+        raise TenantError("No tenant: call this from a page or inside use_tenant().")
+    tenant = IDENTITY_SOURCES[identity_source()]()
+    if tenant is None:
+        raise TenantError("You are not signed in.")
+    return str(tenant)
+
+
+# Run the block (and the threads and tasks it starts) as `tenant`
+@contextmanager
+def use_tenant(tenant):
+    token = _bound.set(tenant)
+    try:
+        yield
+    finally:
+        _bound.reset(token)
+
+
+# Folder name for a tenant: readable, safe on every filesystem and unique
+# even when two ids only differ in characters that get replaced
+def tenant_folder(tenant):
+    slug = re.sub(r'[^A-Za-z0-9._@-]+', '_', tenant).strip("._")[:40] or "user"
+    return f"{slug}-{hashlib.sha256(tenant.encode('utf-8')).hexdigest()[:10]}"
+
+
+# Path inside the current tenant's namespace
+def tenant_path(*parts):
+    tenant = current_tenant()
+    if tenant is None:
+        return os.path.join(*parts)
+    return os.path.join(os.getenv("TENANTS_DIR", DEFAULT_TENANTS_DIR), tenant_folder(tenant), *parts)
+
+
+# Stop the page with a message when the session has no tenant (not signed in,
+# or the proxy did not send the identity header)
+def require_tenant():
+    import streamlit as st
+
+    try:
+        current_tenant()
+    except TenantError as e:
+        st.error(f"🔒 {e}")
+        if identity_source() == "login":
+            st.button("Sign in", on_click=st.login)
+        st.stop()
+
+
+def _int_setting(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return int(default)
+
+
+# Jobs (or batch requests) one tenant may run at once (None = no limit)
+def max_concurrency():
+    if not tenants_enabled():
+        return None
+    return max(1, _int_setting("TENANT_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+
+
+# Spaces out model request starts per tenant so that at most
+# TENANT_REQUESTS_PER_MINUTE begin per minute, across all of a tenant's
+# pages, jobs and batches
+class TenantRateLimiter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next_start = {}
+
+    # Seconds the caller must wait before starting its request
+    def reserve(self, tenant):
+        per_minute = _int_setting("TENANT_REQUESTS_PER_MINUTE", 0)
+        if per_minute <= 0:
+            return 0.0
+        interval = 60.0 / per_minute
+        with self.lock:
+            now = time.monotonic()
+            next_start = max(now, self.next_start.get(tenant, 0.0))
+            self.next_start[tenant] = next_start + interval
+        return next_start - now
+
+
+rate_limiter = TenantRateLimiter()
+
+
+def request_delay():
+    return rate_limiter.reserve(current_tenant())
+
+
+def wait_for_request_slot():
+    delay = request_delay()
+    if delay > 0:
+        time.sleep(delay)
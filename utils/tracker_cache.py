@@ -0,0 +1,26 @@
+import streamlit as st
+
+from utils import tracker_store
+from utils.tenants import current_tenant
+
+# Process-wide cache of the dashboard summaries shared by every page and
+# session. Entries are keyed by the store's write counter, so any write (ours
+# or another process's) moves readers to a fresh entry on their next rerun.
+# Cached frames are shared: callers must not modify them in place. Entries
+# are per tenant: the tenant argument is only part of the key, the store
+# reads the current tenant's database itself.
+
+# Two data versions for several active tenants
+MAX_CACHED_FRAMES = 16
+
+
+@st.cache_resource(max_entries=MAX_CACHED_FRAMES, show_spinner=False)
+def _summaries(tenant, version):
+    return tracker_store.load_summaries()
+
+
+# Dashboard summaries (see tracker_store.load_summaries), for the current
+# data or an already read data_version
+def load_tracker_summaries(version=None):
+    version = tracker_store.data_version() if version is None else version
+    return _summaries(current_tenant(), version)
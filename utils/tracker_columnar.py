@@ -0,0 +1,144 @@
+import os
+import threading
+import importlib.util
+
+import pandas as pd
+
+from utils import tracker_store, file_store
+from utils.env_settings import load_env_value
+from utils.metrics import span
+from utils.tenants import tenant_path
+
+# Optional columnar copy of the tracker for reading many rows at once
+# (TRACKER_BACKEND=parquet in .env, needs pyarrow), such as exports. SQLite
+# stays the source of truth for every write and for the dashboard summaries,
+# which its materialized tables answer faster than any scan. The snapshot is
+# a Parquet file with dictionary-encoded Status/Company/Position/Location, a
+# native date column and rows ordered by date. Row reads load only the
+# columns they need and push filters down to the file, so row groups outside
+# a date range are never decoded. The snapshot records the data_version it was
+# built from and is rebuilt by the first row read after the tracker changed,
+# so writes never wait for it.
+DATA_DIR = "data"
+SNAPSHOT_NAME = "application_tracker.parquet"
+
+CATEGORICAL_COLUMNS = ["Position", "Company", "Location", "Status"]
+ROW_GROUP_SIZE = 64 * 1024
+VERSION_KEY = b"tracker_data_version"
+
+def columnar_available():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+# "parquet" when selected in settings and pyarrow is installed, else "sqlite"
+def backend_name():
+    if load_env_value("TRACKER_BACKEND", "sqlite") == "parquet" and columnar_available():
+        return "parquet"
+    return "sqlite"
+
+
+# Snapshot of the current tenant's tracker (see utils/tenants.py)
+def snapshot_file():
+    return tenant_path(DATA_DIR, SNAPSHOT_NAME)
+
+
+def snapshot_version():
+    import pyarrow.parquet as pq
+
+    try:
+        metadata = pq.read_schema(snapshot_file()).metadata or {}
+    except (FileNotFoundError, OSError):
+        return None
+    value = metadata.get(VERSION_KEY)
+    return int(value) if value is not None else None
+
+
+def _export(version):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    with span("tracker.snapshot") as fields:
+        df = tracker_store.load_applications().reset_index()
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce", format="%Y-%m-%d")
+        for column in CATEGORICAL_COLUMNS:
+            df[column] = df[column].astype("category")
+        # Date order gives each row group a narrow min/max, so date filters skip most of the file
+        df = df.sort_values(["Date", "id"], kind="stable", na_position="first")
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        date_index = table.schema.get_field_index("Date")
+        table = table.set_column(date_index, "Date", pc.cast(table["Date"], pa.date32()))
+        metadata = dict(table.schema.metadata or {})
+        metadata[VERSION_KEY] = str(version).encode()
+        table = table.replace_schema_metadata(metadata)
+
+        path = snapshot_file()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        pq.write_table(table, temp_path, row_group_size=ROW_GROUP_SIZE)
+        os.replace(temp_path, path)
+        fields["rows"] = len(df)
+
+
+# Rebuild the snapshot if the tracker changed since it was written
+def ensure_snapshot(version=None):
+    version = tracker_store.data_version() if version is None else version
+    if snapshot_version() == version:
+        return
+    # One export at a time, also across server processes
+    with file_store.file_lock(snapshot_file()):
+        if snapshot_version() != version:
+            _export(version)
+
+
+def _read(columns, filters=None):
+    import pyarrow.parquet as pq
+
+    return pq.read_table(snapshot_file(), columns=columns, filters=filters)
+
+
+# pyarrow filter expression for tracker_store's filter dict (see
+# tracker_store._filter_clause), or None when nothing is filtered
+def _expression(filters):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    filters = filters or {}
+    conditions = []
+    if filters.get("statuses"):
+        conditions.append(pc.field("Status").isin(list(filters["statuses"])))
+    if filters.get("company"):
+        # Substring matching has no kernel for dictionary-encoded columns
+        company = pc.field("Company").cast(pa.string())
+        conditions.append(pc.match_substring(company, filters["company"], ignore_case=True))
+    if filters.get("date_from"):
+        conditions.append(pc.field("Date") >= pd.Timestamp(filters["date_from"]).date())
+    if filters.get("date_to"):
+        conditions.append(pc.field("Date") <= pd.Timestamp(filters["date_to"]).date())
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+# Applications as a DataFrame indexed by row id, like
+# tracker_store.load_applications but with categorical text columns and a
+# datetime Date column. `columns` limits what is read; `filters` is
+# tracker_store's filter dict, applied inside the Parquet reader.
+def load_applications(version=None, columns=None, filters=None):
+    ensure_snapshot(version)
+    wanted = None if columns is None else ["id"] + [c for c in columns if c != "id"]
+    with span("tracker.load", backend="parquet") as fields:
+        table = _read(wanted, _expression(filters))
+        df = table.to_pandas(date_as_object=False)
+        fields["rows"] = len(df)
+    return df.set_index("id").sort_index()
+
+
+# Applications matching `filters`, from the snapshot when that backend is
+# selected and from SQLite otherwise (same rows either way)
+def read_applications(filters=None, columns=None):
+    if backend_name() == "parquet":
+        return load_applications(columns=columns, filters=filters)
+    return tracker_store.load_applications(filters=filters, columns=columns)
@@ -0,0 +1,436 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+import pandas as pd
+
+from utils.metrics import span
+from utils.tenants import tenant_path
+
+# Application tracker storage. Rows live in a SQLite database in WAL mode so
+# adding or editing an application touches only that row and concurrent
+# sessions don't overwrite each other's changes.
+DATA_DIR = "data"
+DB_NAME = "application_tracker.db"
+
+# Tracker used to be a CSV that was rewritten on every change. It is imported
+# once into the database and then left in place as a backup.
+LEGACY_CSV_NAME = "application_tracker.csv"
+
+_initialized = set()
+
+
+# Database of the current tenant (see utils/tenants.py)
+def db_file():
+    return tenant_path(DATA_DIR, DB_NAME)
+
+COLUMNS = ["Date", "Position", "Company", "Location", "Status", "Notes"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    Date TEXT,
+    Position TEXT,
+    Company TEXT,
+    Location TEXT,
+    Status TEXT,
+    Notes TEXT,
+    version INTEGER NOT NULL DEFAULT 1
+);
+-- Sorting and filtering for paged views (see query_applications)
+CREATE INDEX IF NOT EXISTS applications_date ON applications (Date, id);
+CREATE INDEX IF NOT EXISTS applications_status ON applications (Status, Date, id);
+CREATE INDEX IF NOT EXISTS applications_company ON applications (Company, id);
+CREATE INDEX IF NOT EXISTS applications_position ON applications (Position, id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- Write counter, bumped on every change so readers can cache by version
+INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0);
+CREATE TRIGGER IF NOT EXISTS version_insert AFTER INSERT ON applications BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'data_version';
+END;
+CREATE TRIGGER IF NOT EXISTS version_update AFTER UPDATE ON applications BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'data_version';
+END;
+CREATE TRIGGER IF NOT EXISTS version_delete AFTER DELETE ON applications BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'data_version';
+END;
+
+-- Last change of each row (deleted rows included), numbered in order, so
+-- derived indexes can read just the rows changed since they last looked
+-- (see changes_since)
+CREATE TABLE IF NOT EXISTS row_changes (
+    row_id INTEGER PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS row_changes_seq ON row_changes (seq);
+CREATE TRIGGER IF NOT EXISTS changes_insert AFTER INSERT ON applications BEGIN
+    INSERT OR REPLACE INTO row_changes (row_id, seq) VALUES (NEW.id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM row_changes));
+END;
+CREATE TRIGGER IF NOT EXISTS changes_update AFTER UPDATE ON applications BEGIN
+    INSERT OR REPLACE INTO row_changes (row_id, seq) VALUES (NEW.id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM row_changes));
+END;
+CREATE TRIGGER IF NOT EXISTS changes_delete AFTER DELETE ON applications BEGIN
+    INSERT OR REPLACE INTO row_changes (row_id, seq) VALUES (OLD.id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM row_changes));
+END;
+"""
+
+# Materialized summaries for the dashboards, kept up to date by triggers so
+# reading them costs the same no matter how many applications there are.
+# Each entry is: table -> (key columns, expressions over a row, row filter).
+# Status counts cover every application (Home); all other summaries only
+# count applications with a valid date, like the analytics page always did.
+HAS_DATE = "date({r}.Date) IS NOT NULL"
+AGGREGATES = {
+    "agg_status": (["status"], ["{r}.Status"], "COALESCE({r}.Status, '') <> ''"),
+    "agg_month": (["month"], ["strftime('%Y-%m', {r}.Date)"], HAS_DATE),
+    "agg_weekday": (["weekday"], ["CAST(strftime('%w', {r}.Date) AS INTEGER)"], HAS_DATE),
+    "agg_company": (["company"], ["{r}.Company"], HAS_DATE + " AND COALESCE({r}.Company, '') <> ''"),
+    "agg_position": (["position"], ["{r}.Position"], HAS_DATE + " AND COALESCE({r}.Position, '') <> ''"),
+    "agg_month_status": (
+        ["month", "status"],
+        ["strftime('%Y-%m', {r}.Date)", "{r}.Status"],
+        HAS_DATE + " AND COALESCE({r}.Status, '') <> ''",
+    ),
+}
+
+# Bump this when AGGREGATES changes so existing databases rebuild them
+AGGREGATES_VERSION = "1"
+
+
+def _aggregate_schema():
+    statements = []
+    add_steps, remove_steps = [], []
+    for table, (keys, exprs, condition) in AGGREGATES.items():
+        key_list = ", ".join(keys)
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {table} ({key_list}, count INTEGER NOT NULL, PRIMARY KEY ({key_list}));"
+        )
+
+        new_values = ", ".join(e.format(r="NEW") for e in exprs)
+        add_steps.append(
+            f"INSERT INTO {table} ({key_list}, count) SELECT {new_values}, 1 "
+            f"WHERE {condition.format(r='NEW')} "
+            f"ON CONFLICT ({key_list}) DO UPDATE SET count = count + 1;"
+        )
+
+        old_match = " AND ".join(f"{k} = {e.format(r='OLD')}" for k, e in zip(keys, exprs))
+        remove_steps.append(
+            f"UPDATE {table} SET count = count - 1 WHERE {condition.format(r='OLD')} AND {old_match};"
+        )
+        remove_steps.append(f"DELETE FROM {table} WHERE count <= 0;")
+
+    add, remove = "\n    ".join(add_steps), "\n    ".join(remove_steps)
+    statements.append(f"CREATE TRIGGER IF NOT EXISTS agg_insert AFTER INSERT ON applications BEGIN\n    {add}\nEND;")
+    statements.append(f"CREATE TRIGGER IF NOT EXISTS agg_delete AFTER DELETE ON applications BEGIN\n    {remove}\nEND;")
+    statements.append(
+        "CREATE TRIGGER IF NOT EXISTS agg_update AFTER UPDATE OF Date, Position, Company, Status ON applications BEGIN\n"
+        f"    {remove}\n    {add}\nEND;"
+    )
+    return "\n".join(statements)
+
+
+# Recompute every summary from scratch (one-time, for existing databases)
+def _rebuild_aggregates(conn):
+    for table, (keys, exprs, condition) in AGGREGATES.items():
+        values = ", ".join(e.format(r="applications") for e in exprs)
+        conn.execute(f"DELETE FROM {table}")
+        conn.execute(
+            f"INSERT INTO {table} ({', '.join(keys)}, count) "
+            f"SELECT {values}, COUNT(*) FROM applications "
+            f"WHERE {condition.format(r='applications')} GROUP BY {values}"
+        )
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES ('aggregates_version', ?) "
+        "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+        (AGGREGATES_VERSION,),
+    )
+
+
+# Raised when a save touches rows that another session changed or deleted
+# since they were loaded
+class TrackerConflictError(Exception):
+    def __init__(self, row_ids):
+        self.row_ids = sorted(row_ids)
+        super().__init__(f"Applications changed by someone else since they were loaded: {self.row_ids}")
+
+
+@contextmanager
+def _connect():
+    conn = sqlite3.connect(db_file(), timeout=10)
+    try:
+        with conn:  # commits on success, rolls back on error
+            yield conn
+    finally:
+        conn.close()
+
+
+# Store dates as YYYY-MM-DD so they sort and group correctly in SQL
+def _normalize_date(value):
+    if value is None or pd.isna(value) or str(value).strip() == "":
+        return None
+    parsed = pd.to_datetime(value, errors="coerce")
+    if pd.isna(parsed):
+        return str(value)
+    return parsed.strftime("%Y-%m-%d")
+
+
+def _normalize_row(row):
+    values = {}
+    for column in COLUMNS:
+        value = row.get(column)
+        if column == "Date":
+            value = _normalize_date(value)
+        elif value is None or pd.isna(value):
+            value = None
+        else:
+            value = str(value)
+        values[column] = value
+    return values
+
+
+def _insert(conn, row, row_id=None):
+    values = _normalize_row(row)
+    columns = ", ".join(COLUMNS)
+    placeholders = ", ".join("?" for _ in COLUMNS)
+    params = [values[c] for c in COLUMNS]
+    if row_id is None:
+        cursor = conn.execute(f"INSERT INTO applications ({columns}) VALUES ({placeholders})", params)
+    else:
+        cursor = conn.execute(
+            f"INSERT INTO applications (id, {columns}) VALUES (?, {placeholders})",
+            [int(row_id)] + params,
+        )
+    return cursor.lastrowid
+
+
+# Databases created before row versions existed get the column added, and
+# rows from before the change log count as changed once
+def _upgrade_schema(conn):
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(applications)")]
+    if "version" not in columns:
+        conn.execute("ALTER TABLE applications ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+    if not conn.execute("SELECT 1 FROM row_changes LIMIT 1").fetchone():
+        conn.execute("INSERT INTO row_changes (row_id, seq) SELECT id, id FROM applications")
+
+
+# Import the old CSV tracker the first time the database is created
+def _migrate_legacy_csv(conn):
+    done = conn.execute("SELECT value FROM meta WHERE key = 'csv_migrated'").fetchone()
+    if done:
+        return
+    legacy_csv = tenant_path(DATA_DIR, LEGACY_CSV_NAME)
+    if os.path.exists(legacy_csv):
+        legacy = pd.read_csv(legacy_csv)
+        for row in legacy.to_dict("records"):
+            _insert(conn, row)
+    conn.execute("INSERT INTO meta (key, value) VALUES ('csv_migrated', '1')")
+
+
+# Create the database (and run the one-time CSV migration) if needed
+def init_store():
+    db = db_file()
+    if db in _initialized and os.path.exists(db):
+        return
+    os.makedirs(os.path.dirname(db), exist_ok=True)
+    conn = sqlite3.connect(db, timeout=10)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.executescript(SCHEMA)
+            _upgrade_schema(conn)
+            conn.executescript(_aggregate_schema())
+            _migrate_legacy_csv(conn)
+            built = conn.execute("SELECT value FROM meta WHERE key = 'aggregates_version'").fetchone()
+            if not built or built[0] != AGGREGATES_VERSION:
+                _rebuild_aggregates(conn)
+    finally:
+        conn.close()
+    _initialized.add(db)
+
+
+# Current value of the write counter. Any insert, update or delete (from
+# this process or another one) changes it.
+def data_version():
+    init_store()
+    with _connect() as conn:
+        return int(conn.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()[0])
+
+
+# All applications as a DataFrame indexed by row id. With versions=True the
+# frame also has the `version` column needed for apply_changes. `filters`
+# (see _filter_clause) and `columns` narrow what is read.
+def load_applications(versions=False, filters=None, columns=None):
+    init_store()
+    columns = list(columns or COLUMNS) + (["version"] if versions else [])
+    unknown = set(columns) - set(COLUMNS + ["version"])
+    if unknown:
+        raise ValueError(f"Unknown columns: {sorted(unknown)}")
+    where, params = _filter_clause(filters)
+    with span("tracker.load") as fields, _connect() as conn:
+        df = pd.read_sql_query(f"SELECT id, {', '.join(columns)} FROM applications {where} ORDER BY id", conn, params=params)
+        fields["rows"] = len(df)
+    return df.set_index("id")
+
+
+# Rows changed since change number `seq`, oldest change first, at most
+# `limit` of them: a DataFrame with the change number (`seq`), row id, the
+# columns and `version`. Deleted rows come back with every column empty.
+def changes_since(seq, limit=None):
+    init_store()
+    columns = ", ".join(f"a.{c}" for c in COLUMNS + ["version"])
+    with _connect() as conn:
+        return pd.read_sql_query(
+            f"SELECT c.seq, c.row_id AS id, {columns} FROM row_changes c "
+            "LEFT JOIN applications a ON a.id = c.row_id WHERE c.seq > ? ORDER BY c.seq LIMIT ?",
+            conn,
+            params=(int(seq), -1 if limit is None else int(limit)),
+        )
+
+
+def count_changes_since(seq):
+    init_store()
+    with _connect() as conn:
+        return conn.execute("SELECT COUNT(*) FROM row_changes WHERE seq > ?", (int(seq),)).fetchone()[0]
+
+
+# WHERE clause and parameters for the paged-view filters:
+#   statuses: list of statuses to keep (empty/None = all)
+#   company: case-insensitive substring of the company name
+#   date_from / date_to: inclusive bounds (date or YYYY-MM-DD)
+def _filter_clause(filters):
+    filters = filters or {}
+    conditions, params = [], []
+    if filters.get("statuses"):
+        conditions.append(f"Status IN ({', '.join('?' for _ in filters['statuses'])})")
+        params.extend(filters["statuses"])
+    if filters.get("company"):
+        conditions.append("Company LIKE ? ESCAPE '\\'")
+        escaped = filters["company"].replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params.append(f"%{escaped}%")
+    for key, operator in (("date_from", ">="), ("date_to", "<=")):
+        if filters.get(key):
+            conditions.append(f"Date {operator} ?")
+            params.append(str(filters[key]))
+    return ("WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+
+# Number of applications matching the filters
+def count_applications(filters=None):
+    init_store()
+    where, params = _filter_clause(filters)
+    with _connect() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM applications {where}", params).fetchone()[0]
+
+
+# One page of applications matching the filters, indexed by row id. Rows are
+# ordered by sort_column and then id, so every row has one fixed place and
+# pages never overlap or skip rows.
+def query_applications(filters=None, sort_column="Date", descending=True, offset=0, limit=50, versions=False):
+    init_store()
+    if sort_column not in COLUMNS:
+        raise ValueError(f"Unknown column: {sort_column}")
+    where, params = _filter_clause(filters)
+    direction = "DESC" if descending else "ASC"
+    columns = COLUMNS + (["version"] if versions else [])
+    with span("tracker.page") as fields, _connect() as conn:
+        df = pd.read_sql_query(
+            f"SELECT id, {', '.join(columns)} FROM applications {where} "
+            f"ORDER BY {sort_column} {direction}, id {direction} LIMIT ? OFFSET ?",
+            conn,
+            params=params + [int(limit), int(offset)],
+        )
+        fields["rows"] = len(df)
+    return df.set_index("id")
+
+
+# Every status in use, most common first (from the materialized counts)
+def list_statuses():
+    init_store()
+    with _connect() as conn:
+        return [row[0] for row in conn.execute("SELECT status FROM agg_status ORDER BY count DESC")]
+
+
+# The dashboard summaries, read straight from the materialized tables
+def load_summaries():
+    init_store()
+    with span("tracker.summaries"), _connect() as conn:
+        def read(query):
+            return pd.read_sql_query(query, conn)
+
+        return {
+            "status": read("SELECT status AS Status, count AS Count FROM agg_status ORDER BY count DESC"),
+            "monthly": read("SELECT month AS Date, count AS Applications FROM agg_month ORDER BY month"),
+            "weekday": read("SELECT weekday AS Weekday, count AS Count FROM agg_weekday"),
+            "company": read("SELECT company AS Company, count AS Count FROM agg_company ORDER BY count DESC LIMIT 20"),
+            "position": read("SELECT position AS Position, count AS Count FROM agg_position ORDER BY count DESC LIMIT 20"),
+            "month_status": read("SELECT month AS Month, status AS Status, count AS Count FROM agg_month_status ORDER BY month"),
+        }
+
+
+def add_application(row):
+    init_store()
+    with span("tracker.save", inserts=1), _connect() as conn:
+        return _insert(conn, row)
+
+
+def update_application(row_id, changes):
+    init_store()
+    values = _normalize_row(changes)
+    columns = [c for c in COLUMNS if c in changes]
+    if not columns:
+        return
+    assignments = ", ".join(f"{c} = ?" for c in columns)
+    with span("tracker.save", updates=1), _connect() as conn:
+        conn.execute(
+            f"UPDATE applications SET {assignments}, version = version + 1 WHERE id = ?",
+            [values[c] for c in columns] + [int(row_id)],
+        )
+
+
+def delete_application(row_id):
+    init_store()
+    with span("tracker.save", deletes=1), _connect() as conn:
+        conn.execute("DELETE FROM applications WHERE id = ?", (int(row_id),))
+
+
+# Save a set of edits in one transaction, touching only the affected rows.
+#   updates: {row_id: (loaded_version, {column: value})}
+#   inserts: [row dict, ...]
+#   deletes: {row_id: loaded_version}
+# Updates and deletes only apply if the row still has the version it was
+# loaded with. Otherwise nothing is saved and TrackerConflictError is raised.
+def apply_changes(updates=None, inserts=None, deletes=None):
+    init_store()
+    conflicts = []
+    counts = {"updates": len(updates or {}), "inserts": len(inserts or []), "deletes": len(deletes or {})}
+    with span("tracker.save", **counts), _connect() as conn:
+        for row_id, (version, changes) in (updates or {}).items():
+            columns = [c for c in COLUMNS if c in changes]
+            if not columns:
+                continue
+            values = _normalize_row(changes)
+            assignments = ", ".join(f"{c} = ?" for c in columns)
+            cursor = conn.execute(
+                f"UPDATE applications SET {assignments}, version = version + 1 WHERE id = ? AND version = ?",
+                [values[c] for c in columns] + [int(row_id), int(version)],
+            )
+            if cursor.rowcount == 0:
+                conflicts.append(row_id)
+
+        for row_id, version in (deletes or {}).items():
+            cursor = conn.execute(
+                "DELETE FROM applications WHERE id = ? AND version = ?",
+                (int(row_id), int(version)),
+            )
+            if cursor.rowcount == 0:
+                conflicts.append(row_id)
+
+        if conflicts:
+            raise TrackerConflictError(conflicts)  # rolls the transaction back
+
+        for row in inserts or []:
+            _insert(conn, row)
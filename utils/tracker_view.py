@@ -0,0 +1,64 @@
+import math
+
+import streamlit as st
+
+from utils import tracker_store
+
+# Filter, sort and paging controls shared by the Home and tracker pages. Only
+# the visible page is queried from the store and sent to the browser; the
+# widgets keep their state under `prefix` so each page has its own view.
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+# Label -> (column, descending)
+SORT_OPTIONS = {
+    "Date (newest first)": ("Date", True),
+    "Date (oldest first)": ("Date", False),
+    "Company (A–Z)": ("Company", False),
+    "Position (A–Z)": ("Position", False),
+    "Status (A–Z)": ("Status", False),
+}
+
+
+# Filters and sort order from the controls. Returns (filters, sort_column,
+# descending, page_size) and a signature that changes with any of them.
+def view_controls(prefix):
+    c1, c2, c3, c4, c5 = st.columns([3, 2, 2, 2, 1])
+    with c1:
+        statuses = st.multiselect("Status", tracker_store.list_statuses(), key=f"{prefix}_statuses")
+    with c2:
+        company = st.text_input("Company contains", key=f"{prefix}_company")
+    with c3:
+        dates = st.date_input("Date range", value=(), key=f"{prefix}_dates")
+    with c4:
+        sort_label = st.selectbox("Sort by", list(SORT_OPTIONS), key=f"{prefix}_sort")
+    with c5:
+        page_size = st.selectbox("Rows", PAGE_SIZES, index=1, key=f"{prefix}_page_size")
+
+    filters = {"statuses": statuses, "company": company.strip()}
+    if len(dates) >= 1:
+        filters["date_from"] = dates[0].isoformat()
+    if len(dates) == 2:
+        filters["date_to"] = dates[1].isoformat()
+    sort_column, descending = SORT_OPTIONS[sort_label]
+    signature = (tuple(statuses), filters["company"], filters.get("date_from"), filters.get("date_to"), sort_label, page_size)
+    return filters, sort_column, descending, page_size, signature
+
+
+# Page picker for `total` rows. Returns the row offset of the chosen page.
+def pager(prefix, total, page_size, disabled=False):
+    pages = max(1, math.ceil(total / page_size))
+    key = f"{prefix}_page"
+    # Filters may have shrunk the result since the page was picked
+    if st.session_state.get(key, 1) > pages:
+        st.session_state[key] = pages
+    c1, c2 = st.columns([1, 5])
+    with c1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=key, disabled=disabled)
+    offset = (page - 1) * page_size
+    with c2:
+        if total:
+            st.caption(f"Showing {offset + 1:,}–{min(offset + page_size, total):,} of {total:,} applications")
+        else:
+            st.caption("No applications match these filters.")
+    return offset